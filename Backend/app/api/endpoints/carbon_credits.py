@@ -2,18 +2,34 @@
 Carbon credit calculation and estimation endpoint
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+import asyncio
 import random
 
+import numpy as np
+
+from app.core.config import settings
 from app.models.schemas import (
     CarbonCreditRequest, 
     CarbonCreditResponse,
     MarketInfo
 )
+from app.services.emission_factors import VERSION_HEADER, get_factor_set
+from app.services.ml.recommendation_system import encode_column, round_cents
 
 router = APIRouter()
 
+class CarbonCreditBatchRequest(BaseModel):
+    """Projects as columns; every list must have one entry per project"""
+    co2_saved: List[float]  # tons CO₂e
+    waste_types: List[str]
+    processing_methods: List[str]  # "biogas" or anything else for compost
+
 # Carbon credit market rates (INR per credit)
 CARBON_CREDIT_RATES = {
     "voluntary_market": {
@@ -39,6 +55,18 @@ CARBON_CREDIT_RATES = {
     }
 }
 
+# The rates as arrays (one entry per market, in CARBON_CREDIT_RATES order)
+# so every market is valued at once
+MARKET_TYPES = list(CARBON_CREDIT_RATES)
+CURRENT_RATE_ARRAY = np.array([CARBON_CREDIT_RATES[market]["current_rate"] for market in MARKET_TYPES], dtype=float)
+RATE_RANGE_ARRAY = np.array([CARBON_CREDIT_RATES[market]["rate_range"] for market in MARKET_TYPES], dtype=float)
+TRANSACTION_COST_RATE = 0.15  # Transaction costs (typically 10-20%)
+
+# Crediting rate and methodology: biogas projects, otherwise composting
+BIOGAS_CREDITING = (0.95, "AMS-I.C: Thermal energy production with or without electricity")
+COMPOST_CREDITING = (0.85, "AMS-III.F: Avoidance of methane emissions through composting")
+UNCERTAIN_WASTE_TYPES = ("mixed waste", "unknown")
+
 # Credit eligibility criteria
 ELIGIBILITY_CRITERIA = {
     "minimum_co2_saved": 0.1,  # tons CO2e minimum
@@ -71,13 +99,11 @@ def calculate_credit_eligibility(co2_saved: float, waste_type: str, processing_m
     methodology_factor = 1.0
     
     if processing_method.lower() == "biogas":
-        # Biogas projects typically have higher crediting rates
-        methodology_factor = 0.95  # 95% crediting rate
-        methodology = "AMS-I.C: Thermal energy production with or without electricity"
+        # Biogas projects typically have higher crediting rates (95%)
+        methodology_factor, methodology = BIOGAS_CREDITING
     else:  # compost
-        # Composting projects have good crediting rates for methane avoidance
-        methodology_factor = 0.85  # 85% crediting rate  
-        methodology = "AMS-III.F: Avoidance of methane emissions through composting"
+        # Composting projects have good crediting rates for methane avoidance (85%)
+        methodology_factor, methodology = COMPOST_CREDITING
     
     # Calculate final credits
     verified_credits = potential_credits * methodology_factor
@@ -90,7 +116,7 @@ def calculate_credit_eligibility(co2_saved: float, waste_type: str, processing_m
         risk_factors.append("Small project size may have higher verification costs")
         confidence_level -= 10
     
-    if waste_type.lower() in ["mixed waste", "unknown"]:
+    if waste_type.lower() in UNCERTAIN_WASTE_TYPES:
         risk_factors.append("Waste type uncertainty may affect verification")
         confidence_level -= 5
     
@@ -116,8 +142,7 @@ def estimate_market_value(credits: float, market_type: str = "voluntary_market")
     min_value = credits * market_info["rate_range"][0] 
     max_value = credits * market_info["rate_range"][1]
     
-    # Transaction costs (typically 10-20%)
-    transaction_cost_rate = 0.15
+    transaction_cost_rate = TRANSACTION_COST_RATE
     net_value = base_value * (1 - transaction_cost_rate)
     
     return {
@@ -132,45 +157,166 @@ def estimate_market_value(credits: float, market_type: str = "voluntary_market")
         "current_rate": market_info["current_rate"]
     }
 
-def generate_market_recommendations(credits: float, project_scale: str) -> list:
-    """Generate market-specific recommendations"""
+def estimate_market_values(credits: float) -> Dict[str, dict]:
+    """estimate_market_value in every market, keyed by market"""
+    return {market_type: estimate_market_value(credits, market_type) for market_type in CARBON_CREDIT_RATES}
+
+def market_value_arrays(credits: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    estimate_market_value for many credit amounts in every market at once
     
-    recommendations = []
-    
-    if credits < 1.0:
-        recommendations.append({
-            "market": "Voluntary Carbon Market",
-            "rationale": "Best suited for small-scale projects with lower verification costs",
-            "action": "Consider aggregating with other small projects to reduce costs",
-            "timeline": "6-12 months for registration and verification"
-        })
-    elif credits < 10.0:
-        recommendations.append({
-            "market": "Indian Carbon Market", 
-            "rationale": "Domestic market with streamlined processes for medium projects",
-            "action": "Apply through Bureau of Energy Efficiency (BEE) certification",
-            "timeline": "8-15 months for full certification"
-        })
-    else:
-        recommendations.append({
-            "market": "Compliance Carbon Market",
-            "rationale": "Higher prices available for large-scale verified projects",
-            "action": "Pursue international certification (CDM/Gold Standard)",
-            "timeline": "12-24 months for full international verification"
-        })
-    
-    # Additional recommendations
-    recommendations.append({
+    Each array is (credit amounts x MARKET_TYPES), rounded as
+    estimate_market_value rounds.
+    """
+    credits = np.asarray(credits, dtype=float)[:, None]
+    base_value = credits * CURRENT_RATE_ARRAY
+    return {
+        "gross_value": round_cents(base_value),
+        "net_value": round_cents(base_value * (1 - TRANSACTION_COST_RATE)),
+        "minimum": round_cents(credits * RATE_RANGE_ARRAY[:, 0] * (1 - TRANSACTION_COST_RATE)),
+        "maximum": round_cents(credits * RATE_RANGE_ARRAY[:, 1] * (1 - TRANSACTION_COST_RATE)),
+        "transaction_costs": round_cents(base_value * TRANSACTION_COST_RATE)
+    }
+
+# Market recommendations: one by credits (below each limit, else the large
+# project one), then the ones for every project
+SIZE_RECOMMENDATIONS = (
+    (1.0, {
+        "market": "Voluntary Carbon Market",
+        "rationale": "Best suited for small-scale projects with lower verification costs",
+        "action": "Consider aggregating with other small projects to reduce costs",
+        "timeline": "6-12 months for registration and verification"
+    }),
+    (10.0, {
+        "market": "Indian Carbon Market", 
+        "rationale": "Domestic market with streamlined processes for medium projects",
+        "action": "Apply through Bureau of Energy Efficiency (BEE) certification",
+        "timeline": "8-15 months for full certification"
+    })
+)
+LARGE_PROJECT_RECOMMENDATION = {
+    "market": "Compliance Carbon Market",
+    "rationale": "Higher prices available for large-scale verified projects",
+    "action": "Pursue international certification (CDM/Gold Standard)",
+    "timeline": "12-24 months for full international verification"
+}
+GENERAL_RECOMMENDATIONS = (
+    {
         "market": "Forward Contracting",
         "rationale": "Lock in current prices to avoid market volatility",
         "action": "Negotiate advance purchase agreements with buyers",
         "timeline": "3-6 months for contract negotiation"
-    })
+    },
+)
+
+def generate_market_recommendations(credits: float, project_scale: str) -> list:
+    """Generate market-specific recommendations"""
+    size_recommendation = next(
+        (recommendation for limit, recommendation in SIZE_RECOMMENDATIONS if credits < limit),
+        LARGE_PROJECT_RECOMMENDATION
+    )
+    return [dict(size_recommendation)] + [dict(recommendation) for recommendation in GENERAL_RECOMMENDATIONS]
+
+MITIGATION_STRATEGIES = [
+    "Maintain detailed documentation of all activities",
+    "Implement robust monitoring and verification systems",
+    "Consider third-party validation early in the process",
+    "Ensure compliance with relevant carbon standards"
+]
+
+NEXT_STEPS = [
+    "Document baseline emissions and project activities",
+    "Select appropriate carbon standard and methodology",
+    "Develop monitoring and verification plan",
+    "Engage qualified validation/verification body",
+    "Submit project for registration and crediting"
+]
+
+def get_project_scale(co2_saved: float) -> str:
+    if co2_saved < 1.0:
+        return "small"
+    elif co2_saved < 10.0:
+        return "medium"
+    else:
+        return "large"
+
+@lru_cache(maxsize=settings.CARBON_CREDIT_CACHE_SIZE)
+def value_credits(verified_credits: float, methodology: str, risk_factors: Tuple[str, ...],
+                  confidence_level: int, project_scale: str) -> dict:
+    """
+    The valuation part of a /carbon-credit response
+    
+    It depends only on the eligibility assessment, whose credits are the
+    CO₂ savings rounded to 0.01 t times the methodology's crediting rate,
+    so projects of about the same size share a cache entry.
+    """
+    # Calculate market values
+    market_values = estimate_market_values(verified_credits)
+    
+    # Select best market option
+    best_market = max(market_values.values(), key=lambda market: market["net_value"])
+    
+    return {
+        "credits_earned": verified_credits,
+        "market_value": best_market["net_value"],
+        "market_info": MarketInfo(
+            market_type=best_market["market_type"],
+            current_rate=best_market["current_rate"],
+            value_range=best_market["value_range"],
+            transaction_costs=best_market["transaction_costs"]
+        ),
+        "all_market_options": market_values,
+        "verification_methodology": methodology,
+        "risk_assessment": {
+            "confidence_level": confidence_level,
+            "risk_factors": list(risk_factors),
+            "mitigation_strategies": MITIGATION_STRATEGIES
+        },
+        "market_recommendations": generate_market_recommendations(verified_credits, project_scale)
+    }
+
+@lru_cache(maxsize=settings.CARBON_CREDIT_CACHE_SIZE)
+def build_carbon_credit_response(co2_saved: float, waste_type: str, processing_method: str) -> CarbonCreditResponse:
+    """
+    The /carbon-credit response for a request
+    
+    Responses are deterministic, so they are cached (LRU); the endpoint
+    stamps each one with the current time. Raises HTTPException (400) for
+    projects below the eligibility minimum.
+    """
+    # Calculate credit eligibility
+    eligibility_info = calculate_credit_eligibility(co2_saved, waste_type, processing_method)
+    
+    if not eligibility_info["eligible"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Project does not meet minimum eligibility criteria. Minimum {ELIGIBILITY_CRITERIA['minimum_co2_saved']} tons CO₂e required."
+        )
+    
+    valuation = value_credits(
+        eligibility_info["verified_credits"],
+        eligibility_info["methodology"],
+        tuple(eligibility_info["risk_factors"]),
+        eligibility_info["confidence_level"],
+        get_project_scale(co2_saved)
+    )
     
-    return recommendations
+    return CarbonCreditResponse(
+        co2_saved=co2_saved,
+        waste_type=waste_type,
+        processing_method=processing_method,
+        credits_unit="tCO₂e",
+        currency="INR",
+        eligibility_status="Eligible",
+        next_steps=NEXT_STEPS,
+        estimated_timeline="6-18 months depending on market and project scale",
+        message=f"Carbon credit analysis completed for {co2_saved} tons CO₂e savings",
+        timestamp=datetime.now(),
+        **valuation
+    )
 
 @router.post("/carbon-credit", response_model=CarbonCreditResponse)
-async def calculate_carbon_credits(request: CarbonCreditRequest):
+async def calculate_carbon_credits(request: CarbonCreditRequest, response: Response):
     """
     Calculate carbon credits and market value estimation
     
@@ -183,90 +329,99 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
     """
     
     try:
-        # Calculate credit eligibility
-        eligibility_info = calculate_credit_eligibility(
-            request.co2_saved,
-            request.waste_type,
-            request.processing_method
+        response_model = build_carbon_credit_response(request.co2_saved, request.waste_type, request.processing_method)
+        response.headers[VERSION_HEADER] = get_factor_set().version
+        return response_model.model_copy(update={"timestamp": datetime.now()})
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Carbon credit calculation failed: {str(e)}"
         )
-        
-        if not eligibility_info["eligible"]:
+
+def carbon_credit_batch_columns(co2_saved: Sequence, waste_types: Sequence, processing_methods: Sequence) -> Dict[str, list]:
+    """
+    Validated /carbon-credit figures for many projects, as JSON-ready columns
+    
+    Credits and confidence are computed as calculate_credit_eligibility
+    does, and every market is valued at once; projects below the
+    eligibility minimum get nulls.
+    """
+    rows = len(co2_saved)
+    if rows > settings.CARBON_CREDIT_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many projects. Maximum is {settings.CARBON_CREDIT_BATCH_MAX_ROWS} per request"
+        )
+    for name, column in (("waste_types", waste_types), ("processing_methods", processing_methods)):
+        if len(column) != rows:
             raise HTTPException(
                 status_code=400,
-                detail=f"Project does not meet minimum eligibility criteria. Minimum {ELIGIBILITY_CRITERIA['minimum_co2_saved']} tons CO₂e required."
+                detail=f"{name} has {len(column)} entries but co2_saved has {rows}"
             )
-        
-        # Calculate market values
-        market_values = {}
-        for market_type in CARBON_CREDIT_RATES.keys():
-            market_values[market_type] = estimate_market_value(
-                eligibility_info["verified_credits"], 
-                market_type
-            )
-        
-        # Determine project scale
-        if request.co2_saved < 1.0:
-            project_scale = "small"
-        elif request.co2_saved < 10.0:
-            project_scale = "medium"
-        else:
-            project_scale = "large"
-        
-        # Generate recommendations
-        market_recommendations = generate_market_recommendations(
-            eligibility_info["verified_credits"],
-            project_scale
-        )
-        
-        # Select best market option
-        best_market = max(market_values.items(), key=lambda x: x[1]["net_value"])
-        
-        return CarbonCreditResponse(
-            co2_saved=request.co2_saved,
-            waste_type=request.waste_type,
-            processing_method=request.processing_method,
-            credits_earned=eligibility_info["verified_credits"],
-            credits_unit="tCO₂e",
-            market_value=best_market[1]["net_value"],
-            currency="INR",
-            market_info=MarketInfo(
-                market_type=best_market[1]["market_type"],
-                current_rate=best_market[1]["current_rate"],
-                value_range=best_market[1]["value_range"],
-                transaction_costs=best_market[1]["transaction_costs"]
-            ),
-            all_market_options=market_values,
-            eligibility_status="Eligible" if eligibility_info["eligible"] else "Not Eligible",
-            verification_methodology=eligibility_info["methodology"],
-            risk_assessment={
-                "confidence_level": eligibility_info["confidence_level"],
-                "risk_factors": eligibility_info["risk_factors"],
-                "mitigation_strategies": [
-                    "Maintain detailed documentation of all activities",
-                    "Implement robust monitoring and verification systems",
-                    "Consider third-party validation early in the process",
-                    "Ensure compliance with relevant carbon standards"
-                ]
-            },
-            market_recommendations=market_recommendations,
-            next_steps=[
-                "Document baseline emissions and project activities",
-                "Select appropriate carbon standard and methodology",
-                "Develop monitoring and verification plan",
-                "Engage qualified validation/verification body",
-                "Submit project for registration and crediting"
-            ],
-            estimated_timeline="6-18 months depending on market and project scale",
-            message=f"Carbon credit analysis completed for {request.co2_saved} tons CO₂e savings",
-            timestamp=datetime.now()
+    co2 = np.asarray(co2_saved, dtype=float)
+    if not np.all(np.isfinite(co2)) or np.any(co2 < 0):
+        raise HTTPException(status_code=400, detail="CO₂ savings must be non-negative numbers")
+    
+    eligible = co2 >= ELIGIBILITY_CRITERIA["minimum_co2_saved"]
+    biogas = encode_column(processing_methods, lambda method: int(method.lower() == "biogas")).astype(bool)
+    uncertain = encode_column(waste_types, lambda waste_type: int(waste_type.lower() in UNCERTAIN_WASTE_TYPES)).astype(bool)
+    
+    verified_credits = round_cents(co2) * np.where(biogas, BIOGAS_CREDITING[0], COMPOST_CREDITING[0])
+    confidence_level = np.maximum(90 - 10 * (co2 < 1.0) - 5 * uncertain, 70)
+    values = market_value_arrays(verified_credits)
+    best = values["net_value"].argmax(axis=1)
+    best_values = {name: column[np.arange(rows), best] for name, column in values.items()}
+    
+    def eligible_only(column: np.ndarray) -> list:
+        return np.where(eligible, column, None).tolist()
+    
+    return {
+        "eligible": eligible.tolist(),
+        "credits_earned": eligible_only(verified_credits),
+        "verification_methodology": np.where(biogas, BIOGAS_CREDITING[1], COMPOST_CREDITING[1]).tolist(),
+        "confidence_level": eligible_only(confidence_level),
+        "best_market": eligible_only(np.array(MARKET_TYPES, dtype=object)[best]),
+        "market_value": eligible_only(best_values["net_value"]),
+        "value_range_minimum": eligible_only(best_values["minimum"]),
+        "value_range_maximum": eligible_only(best_values["maximum"]),
+        "transaction_costs": eligible_only(best_values["transaction_costs"])
+    }
+
+@router.post("/carbon-credit/batch")
+async def calculate_carbon_credits_batch(request: CarbonCreditBatchRequest):
+    """
+    Value many projects' carbon credits in one call
+    
+    Takes and returns columns rather than one object per project. Each
+    output column has one entry per project, with the credits, the best
+    market and its net value as /carbon-credit reports them; ineligible
+    projects (eligible false) have nulls.
+    """
+    try:
+        # Large portfolios take a while; keep them off the event loop
+        columns = await asyncio.get_running_loop().run_in_executor(
+            None, carbon_credit_batch_columns, request.co2_saved, request.waste_types, request.processing_methods
         )
         
+        factor_set_version = get_factor_set().version
+        return JSONResponse({
+            "rows": len(request.co2_saved),
+            "credits_unit": "tCO₂e",
+            "currency": "INR",
+            "factor_set_version": factor_set_version,
+            "columns": columns,
+            "timestamp": datetime.now().isoformat()
+        }, headers={VERSION_HEADER: factor_set_version})
+    
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Carbon credit calculation failed: {str(e)}"
+            detail=f"Batch carbon credit calculation failed: {str(e)}"
         )
 
 @router.get("/market-rates")
@@ -12,6 +12,7 @@ import json
 
 from app.models.schemas import CertificateRequest, CertificateResponse
 from app.core.config import settings
+from app.services.emission_factors import VERSION_HEADER, get_factor_set
 
 # Import PDF generation function
 import sys
@@ -184,7 +185,8 @@ async def generate_certificate(request: CertificateRequest):
             'carbon_credits': request.carbon_credits,
             'issue_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'verification_code': verification_code,
-            'analysis_id': request.analysis_id or 'N/A'
+            'analysis_id': request.analysis_id or 'N/A',
+            'factor_set_version': get_factor_set().version
         }
         
         # Generate PDF certificate
@@ -210,7 +212,8 @@ async def generate_certificate(request: CertificateRequest):
             content=pdf_content,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename=AgriWaste2Fuel_Team3A_Certificate_{cert_id}.pdf"
+                "Content-Disposition": f"attachment; filename=AgriWaste2Fuel_Team3A_Certificate_{cert_id}.pdf",
+                VERSION_HEADER: cert_data['factor_set_version']
             }
         )
         
@@ -281,6 +284,7 @@ async def verify_certificate(verification_code: str):
                         "co2_saved": cert_data["environmental_impact"]["co2_saved"],
                         "carbon_credits": cert_data["environmental_impact"]["carbon_credits"],
                         "verification_status": cert_data["verification"]["verification_status"],
+                        "factor_set_version": cert_data.get("factor_set_version"),
                         "message": "Certificate verified successfully" if is_valid else "Certificate has expired"
                     }
         
@@ -323,6 +327,7 @@ async def list_user_certificates(user_name: str):
                         "co2_saved": cert_data["environmental_impact"]["co2_saved"],
                         "carbon_credits": cert_data["environmental_impact"]["carbon_credits"],
                         "estimated_value": cert_data["environmental_impact"]["estimated_value"],
+                        "factor_set_version": cert_data.get("factor_set_version"),
                         "download_url": f"/api/v1/certificates/download/{cert_data['certificate_id']}"
                     })
         
@@ -2,10 +2,21 @@
 GHG (Greenhouse Gas) savings calculation endpoint
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response, UploadFile, File
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
 from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import asyncio
+import csv
+import io
 import random
 
+import numpy as np
+import orjson
+
+from app.core.config import settings
+
 from app.models.schemas import (
     GHGCalculationRequest, 
     GHGCalculationResponse,
@@ -14,97 +25,40 @@ from app.models.schemas import (
     CarbonCreditResponse,
     MarketInfo
 )
+from app.services.emission_factors import (
+    EMISSION_TABLES, METHANE_TABLE, VERSION_HEADER, FactorSet, emission_factors, get_factor_set
+)
+from app.services.ml.recommendation_system import encode_column
 
 router = APIRouter()
 
-# IPCC emission factors (kg CO2e per kg of waste)
-EMISSION_FACTORS = {
-    # Burning emission factors
-    "burning_factors": {
-        "rice straw": 0.0012,  # kg CO2e per kg
-        "wheat straw": 0.0011,
-        "corn husks": 0.0010,
-        "sugarcane bagasse": 0.0009,
-        "cotton stalks": 0.0013,
-        "banana leaves": 0.0008,
-        "cow dung": 0.0015,
-        "buffalo dung": 0.0014,
-        "chicken manure": 0.0016,
-        "vegetable scraps": 0.0007,
-        "food waste": 0.0006,
-        "default": 0.0012
-    },
-    # Processing emission factors  
-    "biogas_factors": {
-        "rice straw": 0.0002,
-        "wheat straw": 0.0003,
-        "corn husks": 0.0002,
-        "sugarcane bagasse": 0.0001,
-        "cotton stalks": 0.0003,
-        "banana leaves": 0.0001,
-        "cow dung": 0.0001,
-        "buffalo dung": 0.0001,
-        "chicken manure": 0.0002,
-        "vegetable scraps": 0.0001,
-        "food waste": 0.0001,
-        "default": 0.0002
-    },
-    "compost_factors": {
-        "rice straw": 0.0003,
-        "wheat straw": 0.0004,
-        "corn husks": 0.0003,
-        "sugarcane bagasse": 0.0002,
-        "cotton stalks": 0.0004,
-        "banana leaves": 0.0002,
-        "cow dung": 0.0003,
-        "buffalo dung": 0.0003,
-        "chicken manure": 0.0004,
-        "vegetable scraps": 0.0002,
-        "food waste": 0.0002,
-        "default": 0.0003
-    }
-}
+class GHGBatchRequest(BaseModel):
+    """Rows as columns; every list must have one entry per row"""
+    waste_types: List[str]
+    quantities: List[float]
+    processing_methods: List[str]  # "biogas" or anything else for compost
 
-# Methane emission factors for decomposition
-METHANE_FACTORS = {
-    "anaerobic_decomposition": {
-        "rice straw": 0.0025,  # kg CH4 per kg waste
-        "wheat straw": 0.0023,
-        "corn husks": 0.0020,
-        "sugarcane bagasse": 0.0018,
-        "cotton stalks": 0.0025,
-        "banana leaves": 0.0015,
-        "cow dung": 0.0030,
-        "buffalo dung": 0.0028,
-        "chicken manure": 0.0035,
-        "vegetable scraps": 0.0020,
-        "food waste": 0.0025,
-        "default": 0.0025
-    }
-}
+BATCH_COLUMNS = ("waste_type", "quantity", "processing_method")  # Uploaded file columns
 
-def get_emission_factor(waste_type: str, process_type: str) -> float:
+# Emission factors (IPCC-based) come from the versioned dataset in
+# app/data/emission_factors.json; see app/services/emission_factors.py
+
+def get_emission_factor(waste_type: str, process_type: str, factor_set: Optional[FactorSet] = None) -> float:
     """Get emission factor for specific waste type and process"""
-    waste_type_lower = waste_type.lower()
-    
-    # Find matching waste type (partial match)
-    for known_waste in EMISSION_FACTORS[f"{process_type}_factors"]:
-        if known_waste in waste_type_lower or waste_type_lower in known_waste:
-            return EMISSION_FACTORS[f"{process_type}_factors"][known_waste]
-    
-    # Return default if no match found
-    return EMISSION_FACTORS[f"{process_type}_factors"]["default"]
+    return (factor_set or get_factor_set()).factor(process_type, waste_type)
 
-def calculate_avoided_emissions(waste_type: str, quantity: float, processing_method: str) -> dict:
+def calculate_avoided_emissions(waste_type: str, quantity: float, processing_method: str,
+                                factor_set: Optional[FactorSet] = None) -> dict:
     """Calculate CO2 emissions avoided by processing instead of burning/decomposing"""
+    factor_set = factor_set or get_factor_set()
     
     # Get emission factors
-    burning_ef = get_emission_factor(waste_type, "burning")
+    burning_ef = get_emission_factor(waste_type, "burning", factor_set)
     
     if processing_method.lower() == "biogas":
-        processing_ef = get_emission_factor(waste_type, "biogas")
+        processing_ef = get_emission_factor(waste_type, "biogas", factor_set)
     else:
-        processing_ef = get_emission_factor(waste_type, "compost")
+        processing_ef = get_emission_factor(waste_type, "compost", factor_set)
     
     # Calculate emissions
     burning_emissions = quantity * burning_ef  # tons CO2e
@@ -114,13 +68,10 @@ def calculate_avoided_emissions(waste_type: str, quantity: float, processing_met
     co2_saved = burning_emissions - processing_emissions
     
     # Additional methane emission reduction (if waste would decompose anaerobically)
-    methane_ef = METHANE_FACTORS["anaerobic_decomposition"].get(
-        waste_type.lower(), 
-        METHANE_FACTORS["anaerobic_decomposition"]["default"]
-    )
+    methane_ef = factor_set.factor(METHANE_TABLE, waste_type)
     
     # Convert CH4 to CO2e (1 kg CH4 = 25 kg CO2e)
-    methane_emissions_avoided = quantity * methane_ef * 25
+    methane_emissions_avoided = quantity * methane_ef * factor_set.gwp_ch4
     
     total_co2_saved = co2_saved + methane_emissions_avoided
     
@@ -132,64 +83,109 @@ def calculate_avoided_emissions(waste_type: str, quantity: float, processing_met
         "total_co2_saved": total_co2_saved
     }
 
-def generate_environmental_benefits(processing_method: str, co2_saved: float) -> list:
-    """Generate list of environmental benefits"""
+def calculate_avoided_emissions_batch(
+    waste_types: Sequence[str],
+    quantities: Sequence[float],
+    processing_methods: Sequence[str],
+    factor_set: Optional[FactorSet] = None
+) -> Dict[str, np.ndarray]:
+    """
+    calculate_avoided_emissions for many rows at once
+    
+    Each distinct waste type and method is resolved once; the factors are
+    then gathered from the factor set's dense arrays, so the cost per row
+    is a handful of array operations. Returns the same keys as
+    calculate_avoided_emissions, one value per row.
+    """
+    factor_set = factor_set or get_factor_set()
+    quantity = np.asarray(quantities, dtype=float)
+    waste_codes = encode_column(waste_types, factor_set.code)
+    biogas = encode_column(processing_methods, lambda method: int(method.lower() == "biogas")).astype(bool)
+    
+    processing_factors = np.where(biogas, factor_set.arrays["biogas"][waste_codes], factor_set.arrays["compost"][waste_codes])
+    burning_emissions = quantity * factor_set.arrays["burning"][waste_codes]
+    processing_emissions = quantity * processing_factors
+    co2_saved = burning_emissions - processing_emissions
+    methane_emissions_avoided = quantity * factor_set.arrays[METHANE_TABLE][waste_codes] * factor_set.gwp_ch4
     
-    base_benefits = [
+    return {
+        "burning_emissions": burning_emissions,
+        "processing_emissions": processing_emissions,
+        "direct_co2_saved": co2_saved,
+        "methane_emissions_avoided": methane_emissions_avoided,
+        "total_co2_saved": co2_saved + methane_emissions_avoided
+    }
+
+# Environmental benefits per processing method. Only the GHG line depends
+# on the request; the others are built and serialized once at import and
+# shared by every response
+GHG_BENEFIT = EnvironmentalBenefit(
+    title="GHG Emission Reduction",
+    category="Greenhouse Gas Reduction",
+    description="",
+    impact_level="High"
+).model_dump(mode="json")
+
+SHARED_BENEFITS = [
+    EnvironmentalBenefit(
+        title="Air Quality Improvement",
+        category="Air Quality Improvement", 
+        description="Eliminates smoke and particulate matter from burning",
+        impact_level="High"
+    ),
+    EnvironmentalBenefit(
+        title="Resource Recovery",
+        category="Resource Recovery",
+        description="Converts waste into valuable resources instead of disposal",
+        impact_level="Medium"
+    )
+]
+
+BENEFIT_SETS = {
+    "biogas": SHARED_BENEFITS + [
         EnvironmentalBenefit(
-            title="GHG Emission Reduction",
-            category="Greenhouse Gas Reduction",
-            description=f"Prevents {co2_saved:.2f} tons of CO₂ equivalent emissions",
+            title="Renewable Energy Production",
+            category="Renewable Energy Production",
+            description="Generates clean biogas energy replacing fossil fuels",
             impact_level="High"
         ),
         EnvironmentalBenefit(
-            title="Air Quality Improvement",
-            category="Air Quality Improvement", 
-            description="Eliminates smoke and particulate matter from burning",
+            title="Liquid Fertilizer Production",
+            category="Liquid Fertilizer Production",
+            description="Creates nutrient-rich liquid fertilizer reducing chemical fertilizer need",
+            impact_level="Medium"
+        )
+    ],
+    "compost": SHARED_BENEFITS + [
+        EnvironmentalBenefit(
+            title="Soil Health Improvement",
+            category="Soil Health Improvement",
+            description="Produces organic compost enhancing soil structure and fertility",
             impact_level="High"
         ),
         EnvironmentalBenefit(
-            title="Resource Recovery",
-            category="Resource Recovery",
-            description="Converts waste into valuable resources instead of disposal",
+            title="Carbon Sequestration",
+            category="Carbon Sequestration",
+            description="Sequesters carbon in soil through organic matter addition",
             impact_level="Medium"
         )
     ]
-    
-    if processing_method.lower() == "biogas":
-        base_benefits.extend([
-            EnvironmentalBenefit(
-                title="Renewable Energy Production",
-                category="Renewable Energy Production",
-                description="Generates clean biogas energy replacing fossil fuels",
-                impact_level="High"
-            ),
-            EnvironmentalBenefit(
-                title="Liquid Fertilizer Production",
-                category="Liquid Fertilizer Production",
-                description="Creates nutrient-rich liquid fertilizer reducing chemical fertilizer need",
-                impact_level="Medium"
-            )
-        ])
-    else:  # compost
-        base_benefits.extend([
-            EnvironmentalBenefit(
-                title="Soil Health Improvement",
-                category="Soil Health Improvement",
-                description="Produces organic compost enhancing soil structure and fertility",
-                impact_level="High"
-            ),
-            EnvironmentalBenefit(
-                title="Carbon Sequestration",
-                category="Carbon Sequestration",
-                description="Sequesters carbon in soil through organic matter addition",
-                impact_level="Medium"
-            )
-        ])
-    
-    return base_benefits
+}
+
+# Pre-serialized JSON of each set, embedded as is by orjson
+BENEFIT_FRAGMENTS = {
+    method: [orjson.Fragment(benefit.model_dump_json()) for benefit in benefits]
+    for method, benefits in BENEFIT_SETS.items()
+}
+
+def benefit_set(processing_method: str) -> str:
+    return "biogas" if processing_method.lower() == "biogas" else "compost"
+
+def ghg_benefit(co2_saved: float) -> dict:
+    """The GHG line of the benefits, as JSON-ready data"""
+    return dict(GHG_BENEFIT, description=f"Prevents {co2_saved:.2f} tons of CO₂ equivalent emissions")
 
-@router.post("/ghg-savings", response_model=GHGCalculationResponse)
+@router.post("/ghg-savings", response_model=GHGCalculationResponse, response_class=ORJSONResponse)
 async def calculate_ghg_savings(request: GHGCalculationRequest):
     """
     Calculate greenhouse gas emissions savings from waste processing
@@ -202,17 +198,14 @@ async def calculate_ghg_savings(request: GHGCalculationRequest):
     """
     
     try:
+        factor_set = get_factor_set()
+        
         # Calculate emissions
         emissions_data = calculate_avoided_emissions(
             request.waste_type,
             request.quantity,
-            request.processing_method
-        )
-        
-        # Generate environmental benefits
-        environmental_benefits = generate_environmental_benefits(
             request.processing_method,
-            emissions_data["total_co2_saved"]
+            factor_set
         )
         
         # Calculate energy output (for biogas)
@@ -225,7 +218,9 @@ async def calculate_ghg_savings(request: GHGCalculationRequest):
         trees_equivalent = emissions_data["total_co2_saved"] * 40  # 1 tree = 25kg CO2/year
         car_miles_equivalent = emissions_data["total_co2_saved"] * 2500  # 1 ton CO2 = 2500 miles
         
-        return GHGCalculationResponse(
+        # Built without validation and serialized by orjson; the benefits
+        # are the precomputed set plus the rendered GHG line
+        response = GHGCalculationResponse.model_construct(
             co2_saved=round(emissions_data["total_co2_saved"], 3),
             co2_saved_unit="tons CO₂e",
             methane_reduction=round(emissions_data["methane_emissions_avoided"], 3),
@@ -233,35 +228,200 @@ async def calculate_ghg_savings(request: GHGCalculationRequest):
             baseline_emissions=round(emissions_data["burning_emissions"], 3),
             processing_emissions=round(emissions_data["processing_emissions"], 3),
             net_reduction=round(emissions_data["total_co2_saved"], 3),
-            environmental_benefits=environmental_benefits,
+            environmental_benefits=[],
             message=f"GHG savings calculated for {request.quantity}kg of {request.waste_type}",
             timestamp=datetime.now()
+        ).model_dump(mode="json")
+        response["environmental_benefits"] = [
+            ghg_benefit(emissions_data["total_co2_saved"]),
+            *BENEFIT_FRAGMENTS[benefit_set(request.processing_method)]
+        ]
+        response["factor_set_version"] = factor_set.version
+        return ORJSONResponse(response, headers={VERSION_HEADER: factor_set.version})
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"GHG calculation failed: {str(e)}"
+        )
+
+def read_batch_file(filename: str, data: bytes) -> Dict[str, Sequence]:
+    """waste_type, quantity and processing_method columns of an uploaded CSV or Parquet file"""
+    if filename.lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise HTTPException(
+                status_code=415,
+                detail="Parquet uploads need pyarrow installed on the server; upload a CSV instead"
+            )
+        table = pq.read_table(io.BytesIO(data))
+        missing = [name for name in BATCH_COLUMNS if name not in table.column_names]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing columns: {', '.join(missing)}")
+        columns = {name: table.column(name).to_pylist() for name in BATCH_COLUMNS}
+        for name in ("waste_type", "processing_method"):
+            columns[name] = ["" if value is None else str(value) for value in columns[name]]
+        return columns
+    
+    try:
+        reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+        header = [name.strip() for name in next(reader, [])]
+        missing = [name for name in BATCH_COLUMNS if name not in header]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing columns: {', '.join(missing)}")
+        positions = [header.index(name) for name in BATCH_COLUMNS]
+        rows = [[row[i] for i in positions] for row in reader if row]
+    except (UnicodeDecodeError, csv.Error, IndexError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read CSV: {str(e)}")
+    return {name: [row[i] for row in rows] for i, name in enumerate(BATCH_COLUMNS)}
+
+def ghg_batch_columns(waste_types: Sequence, quantities: Sequence, processing_methods: Sequence,
+                      factor_set: FactorSet) -> Dict[str, list]:
+    """Validated batch calculation, as JSON-ready columns"""
+    rows = len(quantities)
+    if rows > settings.GHG_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many rows. Maximum is {settings.GHG_BATCH_MAX_ROWS} per request"
+        )
+    for name, column in (("waste_types", waste_types), ("processing_methods", processing_methods)):
+        if len(column) != rows:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{name} has {len(column)} entries but quantities has {rows}"
+            )
+    try:
+        quantity = np.asarray(quantities, dtype=float)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Every quantity must be a number")
+    if not np.all(np.isfinite(quantity)) or np.any(quantity < 0):
+        raise HTTPException(status_code=400, detail="Quantities must be non-negative numbers")
+    
+    emissions = calculate_avoided_emissions_batch(waste_types, quantity, processing_methods, factor_set)
+    return {name: values.tolist() for name, values in emissions.items()}
+
+def batch_response(rows: int, columns: Dict[str, list], factor_set: FactorSet) -> JSONResponse:
+    return JSONResponse({
+        "rows": rows,
+        "unit": "tons CO₂e",
+        "factor_set_version": factor_set.version,
+        "columns": columns,
+        "timestamp": datetime.now().isoformat()
+    }, headers={VERSION_HEADER: factor_set.version})
+
+@router.post("/ghg-savings/batch")
+async def calculate_ghg_savings_batch(request: GHGBatchRequest):
+    """
+    Calculate GHG savings for many rows in one call
+    
+    Takes and returns columns rather than one object per row. Each output
+    column (tons CO₂e) has one entry per row: burning_emissions,
+    processing_emissions, direct_co2_saved, methane_emissions_avoided and
+    total_co2_saved (the net reduction), computed exactly as /ghg-savings
+    does but without rounding.
+    """
+    try:
+        factor_set = get_factor_set()
+        # Hundreds of thousands of rows take a while; keep them off the event loop
+        columns = await asyncio.get_running_loop().run_in_executor(
+            None, ghg_batch_columns, request.waste_types, request.quantities, request.processing_methods, factor_set
         )
         
+        return batch_response(len(request.quantities), columns, factor_set)
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"GHG calculation failed: {str(e)}"
+            detail=f"Batch GHG calculation failed: {str(e)}"
+        )
+
+@router.post("/ghg-savings/batch/upload")
+async def calculate_ghg_savings_file(file: UploadFile = File(..., description="CSV or Parquet file")):
+    """
+    Calculate GHG savings for every row of an uploaded CSV or Parquet file
+    
+    The file needs waste_type, quantity and processing_method columns
+    (other columns are ignored); Parquet needs pyarrow on the server. The
+    response is the same as /ghg-savings/batch.
+    """
+    try:
+        chunks = []
+        size = 0
+        while chunk := await file.read(1024 * 1024):
+            size += len(chunk)
+            if size > settings.GHG_BATCH_MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {settings.GHG_BATCH_MAX_FILE_SIZE / 1024 / 1024:.0f}MB"
+                )
+            chunks.append(chunk)
+        
+        factor_set = get_factor_set()
+        
+        def calculate():
+            uploaded = read_batch_file(file.filename or "", b"".join(chunks))
+            return len(uploaded["quantity"]), ghg_batch_columns(
+                uploaded["waste_type"], uploaded["quantity"], uploaded["processing_method"], factor_set
+            )
+        
+        rows, columns = await asyncio.get_running_loop().run_in_executor(None, calculate)
+        
+        return batch_response(rows, columns, factor_set)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch GHG calculation failed: {str(e)}"
         )
 
 @router.get("/emission-factors")
-async def get_emission_factors():
-    """Get emission factors for different waste types and processes"""
+async def get_emission_factors(response: Response):
+    """Get emission factors for different waste types and processes (keyed by waste type ID)"""
+    factor_set = get_factor_set()
+    response.headers[VERSION_HEADER] = factor_set.version
     return {
-        "emission_factors": EMISSION_FACTORS,
-        "methane_factors": METHANE_FACTORS,
+        "factor_set_version": factor_set.version,
+        "emission_factors": {f"{name}_factors": factor_set.tables[name] for name in EMISSION_TABLES},
+        "methane_factors": {METHANE_TABLE: factor_set.tables[METHANE_TABLE]},
+        "units": factor_set.units,
         "conversion_factors": {
-            "ch4_to_co2e": 25,  # Global Warming Potential
+            "ch4_to_co2e": factor_set.gwp_ch4,  # Global Warming Potential
             "energy_per_m3_biogas": 6,  # kWh per m³
             "biogas_yield_per_kg": 0.03  # m³ per kg waste
         },
-        "data_sources": [
-            "IPCC Guidelines for National Greenhouse Gas Inventories",
-            "FAO Guidelines for measuring GHG emissions from agriculture",
-            "National emission factor databases"
-        ]
+        "data_sources": factor_set.sources
     }
 
+@router.post("/emission-factors/reload")
+async def reload_emission_factors():
+    """
+    Reload the emission factor dataset now
+    
+    The dataset is also reloaded automatically when its file changes
+    (see EMISSION_FACTORS_RELOAD_SECONDS); an invalid file is rejected
+    and the current factors stay in use.
+    """
+    try:
+        previous = get_factor_set().version
+        factor_set = emission_factors.reload()
+        return {
+            "previous_version": previous,
+            "factor_set_version": factor_set.version,
+            "path": factor_set.path,
+            "timestamp": datetime.now()
+        }
+    
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Emission factor reload failed, keeping version {get_factor_set().version}: {str(e)}"
+        )
+
 @router.get("/environmental-impact-categories")
 async def get_impact_categories():
     """Get information about environmental impact categories"""
@@ -301,7 +461,7 @@ async def get_impact_categories():
     }
 
 @router.post("/carbon-credits", response_model=CarbonCreditResponse)
-async def calculate_carbon_credits(request: CarbonCreditRequest):
+async def calculate_carbon_credits(request: CarbonCreditRequest, response: Response):
     """
     Calculate potential carbon credits from GHG emissions reductions
     
@@ -311,6 +471,8 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
     """
     
     try:
+        response.headers[VERSION_HEADER] = get_factor_set().version
+        
         # Validate input
         if request.co2_saved < 0:
             raise HTTPException(
@@ -326,7 +488,7 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
             message=f"Carbon credits calculated: {carbon_credits} tons CO₂e",
             timestamp=datetime.now()
         )
-        
+    
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -371,7 +533,7 @@ async def get_market_info():
     }
 
 @router.post("/carbon-credit", response_model=CarbonCreditResponse)
-async def calculate_carbon_credits(request: CarbonCreditRequest):
+async def calculate_carbon_credits(request: CarbonCreditRequest, response: Response):
     """
     Calculate carbon credits based on CO2 savings and waste processing
     
@@ -384,6 +546,8 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
     """
     
     try:
+        response.headers[VERSION_HEADER] = get_factor_set().version
+        
         # Base carbon credit calculation (1 credit = 1 ton CO2e saved)
         credits_earned = round(request.co2_saved, 2)
         
@@ -425,7 +589,7 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
             market_type = "compliance"
         else:
             market_type = "voluntary"
-            
+        
         current_rate = market_rates[market_type]["current"]
         market_value = round(final_credits * current_rate, 2)
         
@@ -446,7 +610,7 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
             risk_factors.append("Low volume may increase per-credit costs")
         if request.verification_level == "basic":
             risk_factors.append("Basic verification may limit market access")
-            
+        
         risk_assessment = {
             "risk_level": "Medium" if risk_factors else "Low",
             "factors": risk_factors,
@@ -496,7 +660,7 @@ async def calculate_carbon_credits(request: CarbonCreditRequest):
             estimated_timeline="6-12 months for full verification and credit issuance",
             message=f"Carbon credits calculated successfully for {request.waste_type} processing"
         )
-        
+    
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -12,6 +12,7 @@ from datetime import datetime
 
 from app.models.schemas import ImagePredictionResponse, ErrorResponse
 from app.core.config import settings
+from app.services.upload_service import save_image_upload
 
 router = APIRouter()
 
@@ -31,7 +32,7 @@ async def predict_image(
     Analyze agricultural waste from uploaded image using AI
     
     **Mock Implementation:**
-    - Validates image file
+    - Validates image file (size and signature checked while streaming)
     - Simulates AI processing time
     - Returns mock waste classification results
     - Ready for YOLOv8 model integration
@@ -45,22 +46,13 @@ async def predict_image(
                 detail="File must be an image (JPEG, PNG, GIF)"
             )
         
-        # Validate file size
-        if image.size and image.size > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size must be less than {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
-            )
-        
         # Generate unique filename
         file_extension = os.path.splitext(image.filename)[1] if image.filename else '.jpg'
         unique_filename = f"{uuid.uuid4()}{file_extension}"
         file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
         
-        # Save uploaded file
-        with open(file_path, "wb") as buffer:
-            content = await image.read()
-            buffer.write(content)
+        # Stream upload to disk, enforcing size limit and image signature as it arrives
+        await save_image_upload(image, file_path)
         
         # Simulate AI processing time
         processing_start = time.time()
@@ -3,14 +3,18 @@ Image prediction endpoint for agricultural waste classification
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
+import asyncio
 import time
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from app.models.schemas import ImagePredictionResponse
 from app.core.config import settings
-from app.services.ml.image_classifier import WasteImageClassifier
+from app.services.ml.model_utils import model_manager, get_image_classifier, log_prediction, IMAGE_CLASSIFIER
+from app.services.ml.inference_pool import inference_pool, InferenceQueueFull
+from app.services.ml.batch_scheduler import MicroBatchScheduler
 from app.services.ml.recommendation_system import get_waste_recommendations
+from app.services.upload_service import read_image_upload
 
 def get_classification_category(waste_type: str) -> str:
     """Map waste type to classification category"""
@@ -28,8 +32,38 @@ def get_classification_category(waste_type: str) -> str:
 
 router = APIRouter()
 
-# Initialize ML classifier
-image_classifier = WasteImageClassifier()
+def predict_single(image_bytes):
+    """Classify one image with the shared classifier (runs on the inference pool)"""
+    return get_image_classifier().predict(image_bytes)
+
+def predict_batch(images):
+    """Classify a batch of images with the shared classifier (runs on the inference pool)"""
+    return get_image_classifier().predict_batch(images)
+
+# Coalesces concurrent single-image requests into model batches
+batch_scheduler = MicroBatchScheduler(
+    predict_batch,
+    inference_pool,
+    max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS,
+    max_queue=settings.INFERENCE_MAX_PENDING * settings.MICRO_BATCH_MAX_SIZE
+)
+
+async def run_inference(job):
+    """Await an inference job, mapping overload and timeouts to HTTP errors"""
+    try:
+        return await job
+    except InferenceQueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Image classification is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Image classification timed out after {inference_pool.timeout}s"
+        )
 
 @router.post("/predict-image", response_model=ImagePredictionResponse)
 async def predict_image(
@@ -56,17 +90,14 @@ async def predict_image(
                 detail="File must be an image"
             )
         
-        # Read image data
-        image_data = await file.read()
+        # Read image data, rejecting oversized or non-image uploads early
+        image_data = await read_image_upload(file)
         
-        if len(image_data) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Empty image file"
-            )
-        
-        # Use ML classifier for prediction
-        prediction_result = image_classifier.predict(image_data)
+        # Use ML classifier for prediction (off the event loop)
+        if settings.MICRO_BATCHING_ENABLED:
+            prediction_result = await run_inference(batch_scheduler.submit(image_data))
+        else:
+            prediction_result = await run_inference(inference_pool.run(predict_single, image_data))
         
         # Get processing recommendations
         recommendations = get_waste_recommendations(
@@ -76,6 +107,7 @@ async def predict_image(
         )
         
         processing_time = time.time() - processing_start
+        log_prediction("image", {"filename": file.filename}, prediction_result, processing_time)
         
         # Map waste type to classification category
         waste_type = prediction_result.get("wasteType", "Agricultural Waste")
@@ -92,6 +124,8 @@ async def predict_image(
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         # Fallback response on error
         return ImagePredictionResponse(
@@ -102,17 +136,95 @@ async def predict_image(
             processing_time=0.0
         )
 
+@router.post("/predict-images")
+async def predict_images(
+    files: List[UploadFile] = File(...),
+    location: Optional[str] = "Maharashtra"
+):
+    """
+    Classify a batch of agricultural waste images in a single YOLO pass
+    
+    **Features:**
+    - One batched forward pass for all uploads
+    - Per-image waste type, confidence and quantity
+    - Invalid images are reported individually without failing the batch
+    """
+    
+    if len(files) > settings.MAX_BATCH_IMAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many images (max {settings.MAX_BATCH_IMAGES} per request)"
+        )
+    
+    processing_start = time.time()
+    
+    # Read all uploads, keeping track of the ones we can send to the model
+    images = []
+    image_positions = []
+    predictions = [None] * len(files)
+    
+    for position, file in enumerate(files):
+        if not file.content_type or not file.content_type.startswith('image/'):
+            predictions[position] = {"filename": file.filename, "error": "File must be an image"}
+            continue
+        
+        try:
+            image_data = await read_image_upload(file)
+        except HTTPException as e:
+            predictions[position] = {"filename": file.filename, "error": e.detail}
+            continue
+        
+        images.append(image_data)
+        image_positions.append(position)
+    
+    try:
+        batch_results = await run_inference(inference_pool.run(predict_batch, images)) if images else []
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch image prediction failed: {str(e)}"
+        )
+    
+    for position, prediction_result in zip(image_positions, batch_results):
+        waste_type = prediction_result.get("wasteType", "Agricultural Waste")
+        predictions[position] = {
+            "filename": files[position].filename,
+            "waste_type": waste_type,
+            "confidence": float(prediction_result.get("confidence", 0.5) * 100),  # Convert to percentage
+            "quantity": float(prediction_result.get("quantity", 1000)),
+            "classification": get_classification_category(waste_type),
+            "processing_recommendation": prediction_result.get("processingRecommendation"),
+            "decode_time": prediction_result.get("decodeTime"),
+            "error": prediction_result.get("error")
+        }
+    
+    processing_time = time.time() - processing_start
+    
+    return {
+        "predictions": predictions,
+        "count": len(predictions),
+        "location": location,
+        "processing_time": processing_time,
+        "timestamp": datetime.now()
+    }
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint for image classification service"""
     try:
-        # Quick model check
-        model_status = image_classifier.model_loaded if hasattr(image_classifier, 'model_loaded') else True
+        # Quick model check (does not trigger loading)
+        image_classifier = model_manager.get_model(IMAGE_CLASSIFIER)
+        model_status = image_classifier is not None and image_classifier.model is not None
         
         return {
             "status": "healthy",
             "service": "image_classification",
             "model_loaded": model_status,
+            "inference_pool": inference_pool.get_stats(),
+            "micro_batching": batch_scheduler.get_stats() if settings.MICRO_BATCHING_ENABLED else None,
+            "prediction_cache": image_classifier.cache.get_stats() if image_classifier is not None and image_classifier.cache is not None else None,
             "timestamp": datetime.now(),
             "version": "1.0.0"
         }
@@ -3,17 +3,50 @@ Recommendation engine for biogas/compost processing
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from datetime import datetime
-import random
+from functools import lru_cache
+from typing import List, Optional
+import asyncio
 
+import numpy as np
+
+from app.core.config import settings
 from app.models.schemas import (
     RecommendationRequest, 
     RecommendationResponse, 
     ProcessingStep
 )
+from app.services.ml.recommendation_system import (
+    carbon_credit_prices,
+    current_tables,
+    rank_processing_methods,
+    recommend_batch,
+    sweep_processing_methods
+)
 
 router = APIRouter()
 
+class BatchRecommendationRequest(BaseModel):
+    """Lots as columns; every list must have one entry per lot"""
+    waste_types: List[str]
+    weights: List[float]  # kg
+    moisture: Optional[List[str]] = None  # "dry", "moist" or "wet"
+    climate: Optional[List[str]] = None  # Climate zone or location
+    price_tier: str = "mid"
+
+class MethodRankingRequest(BaseModel):
+    waste_type: str
+    quantity: float  # kg
+    price_tier: str = "mid"
+
+class MethodSweepRequest(BaseModel):
+    """Grid of quantities x price tiers to rank the methods over"""
+    waste_type: str
+    quantities: List[float]  # kg
+    price_tiers: Optional[List[str]] = None  # Defaults to every tier
+
 # Decision matrix for processing method selection
 PROCESSING_DECISION_MATRIX = {
     # High moisture content (>60%) -> Biogas
@@ -36,6 +69,11 @@ PROCESSING_DECISION_MATRIX = {
     }
 }
 
+# Output yield ranges (min, max)
+BIOGAS_YIELD_PER_TON = (20, 40)  # m³ of biogas per ton of waste
+SLURRY_FRACTION = (0.6, 0.7)  # Digested slurry, fraction of input weight
+COMPOST_FRACTION = (0.3, 0.4)  # Finished compost, fraction of input weight
+
 # Processing steps templates
 BIOGAS_STEPS = [
     ProcessingStep(
@@ -158,38 +196,104 @@ def determine_processing_method(waste_type: str, quantity: float, moisture_conte
     # Default to compost for unknown types
     return "compost"
 
+def output_range(low: float, high: float) -> tuple:
+    """(min, expected, max), expected being the midpoint"""
+    return low, (low + high) / 2, high
+
 def calculate_expected_output(method: str, quantity: float, waste_type: str) -> dict:
-    """Calculate expected output based on processing method and quantity"""
+    """
+    Calculate expected output based on processing method and quantity
+    
+    Deterministic: the headline figures are the expected (midpoint) values
+    of fixed yield ranges, and the *_range entries give min - max, so the
+    same request always gets the same numbers.
+    """
     
     if method == "biogas":
         # Biogas yield: 20-40 m³ per ton of waste
-        biogas_yield = random.uniform(20, 40) * (quantity / 1000)
+        biogas_min, biogas_yield, biogas_max = (rate * (quantity / 1000) for rate in output_range(*BIOGAS_YIELD_PER_TON))
         # Energy content: ~6 kWh per m³ of biogas
         energy_output = biogas_yield * 6
         # Slurry output: ~60-70% of input weight
-        slurry_output = quantity * random.uniform(0.6, 0.7)
+        slurry_min, slurry_output, slurry_max = (quantity * fraction for fraction in output_range(*SLURRY_FRACTION))
         
         return {
             "biogas_volume": f"{biogas_yield:.1f} m³",
+            "biogas_volume_range": f"{biogas_min:.1f} – {biogas_max:.1f} m³",
             "energy_equivalent": f"{energy_output:.1f} kWh", 
             "organic_slurry": f"{slurry_output:.0f} kg",
+            "organic_slurry_range": f"{slurry_min:.0f} – {slurry_max:.0f} kg",
             "cooking_hours": f"{energy_output / 2:.1f} hours", # Assuming 2 kWh per hour cooking
             "carbon_reduction": f"{quantity * 0.0025:.2f} tons CO₂e"
         }
     else:  # compost
         # Compost yield: 30-40% of input weight
-        compost_yield = quantity * random.uniform(0.3, 0.4)
+        compost_min, compost_yield, compost_max = (quantity * fraction for fraction in output_range(*COMPOST_FRACTION))
         # Fertilizer value calculation
         fertilizer_equivalent = compost_yield * 2  # 1 kg compost = 2 kg chemical fertilizer
         
         return {
             "compost_quantity": f"{compost_yield:.0f} kg",
+            "compost_quantity_range": f"{compost_min:.0f} – {compost_max:.0f} kg",
             "fertilizer_equivalent": f"{fertilizer_equivalent:.0f} kg chemical fertilizer",
             "soil_coverage": f"{compost_yield / 5:.1f} acres", # 5 kg per acre
             "nutrient_content": "2-3% N, 1-2% P, 1-2% K",
             "carbon_sequestration": f"{quantity * 0.0015:.2f} tons CO₂e"
         }
 
+@lru_cache(maxsize=settings.RECOMMENDATION_CACHE_SIZE)
+def build_recommendation(waste_type: str, quantity: float, moisture_content: Optional[float]) -> RecommendationResponse:
+    """
+    The /recommend response for a normalized request
+    
+    Responses are deterministic, so they are cached (LRU); the endpoint
+    stamps each one with the current time.
+    """
+    # Determine optimal processing method
+    recommended_method = determine_processing_method(waste_type, quantity, moisture_content)
+    
+    # Generate reasoning
+    if recommended_method == "biogas":
+        reasoning = f"Biogas production recommended for {waste_type} due to high organic content and moisture. Optimal for energy generation and liquid fertilizer production."
+        processing_steps = BIOGAS_STEPS
+        tools_required = [
+            "Biogas digester (5-10 m³ capacity)",
+            "Gas collection system",
+            "pH and temperature monitoring tools",
+            "Safety equipment",
+            "Slurry storage tanks"
+        ]
+        processing_time = "30-45 days initial fermentation + ongoing production"
+        efficiency = PROCESSING_DECISION_MATRIX["biogas_conditions"]["efficiency"]
+    else:
+        reasoning = f"Composting recommended for {waste_type} due to suitable carbon content and lower moisture. Ideal for solid fertilizer production."
+        processing_steps = COMPOST_STEPS
+        tools_required = [
+            "Composting area (covered)",
+            "Shredding/chopping equipment", 
+            "Turning tools (pitchfork, shovel)",
+            "Moisture monitoring equipment",
+            "Thermometer for temperature monitoring"
+        ]
+        processing_time = "2-4 months for complete decomposition"
+        efficiency = PROCESSING_DECISION_MATRIX["compost_conditions"]["efficiency"]
+    
+    # Calculate expected output
+    expected_output = calculate_expected_output(recommended_method, quantity, waste_type)
+    
+    return RecommendationResponse(
+        recommended_method=recommended_method.title(),
+        processing_method=recommended_method.title(),  # Add for compatibility
+        reasoning=reasoning,
+        processing_steps=processing_steps,
+        tools_required=tools_required,
+        expected_output=expected_output,
+        processing_time=processing_time,
+        efficiency=efficiency,
+        message=f"Processing recommendation generated for {quantity}kg of {waste_type}",
+        timestamp=datetime.now()
+    )
+
 @router.post("/recommend", response_model=RecommendationResponse) 
 async def get_processing_recommendation(request: RecommendationRequest):
     """
@@ -204,63 +308,144 @@ async def get_processing_recommendation(request: RecommendationRequest):
     """
     
     try:
-        # Determine optimal processing method
-        recommended_method = determine_processing_method(
-            request.waste_type, 
-            request.quantity,
-            request.moisture_content
+        # Normalize so equivalent requests share a cache entry
+        waste_type = " ".join(request.waste_type.split())
+        moisture_content = None if request.moisture_content is None else float(request.moisture_content)
+        
+        response = build_recommendation(waste_type, float(request.quantity), moisture_content)
+        return response.model_copy(update={"timestamp": datetime.now()})
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Recommendation generation failed: {str(e)}"
         )
+
+def column_to_list(values: np.ndarray) -> list:
+    """JSON-ready list of a result column (NaN becomes null)"""
+    if values.dtype.kind == "f":
+        return np.where(np.isnan(values), None, values).tolist()
+    return values.tolist()
+
+@router.post("/recommend/batch")
+async def get_batch_recommendations(request: BatchRecommendationRequest):
+    """
+    Recommend processing methods for many lots in one call
+    
+    Takes and returns columns rather than one object per lot. Each output
+    column has one entry per lot: recommended method, weight range, output
+    range, GHG savings range (kg CO₂e) and carbon credit value range (₹);
+    GHG and credit values are null where the method has no savings factor.
+    """
+    try:
+        rows = len(request.weights)
+        if rows > settings.RECOMMEND_BATCH_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many lots. Maximum is {settings.RECOMMEND_BATCH_MAX_ROWS} per request"
+            )
+        for name, column in (("waste_types", request.waste_types), ("moisture", request.moisture), ("climate", request.climate)):
+            if column is not None and len(column) != rows:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{name} has {len(column)} entries but weights has {rows}"
+                )
+        if any(weight < 0 for weight in request.weights):
+            raise HTTPException(status_code=400, detail="Weights must not be negative")
         
-        # Generate reasoning
-        if recommended_method == "biogas":
-            reasoning = f"Biogas production recommended for {request.waste_type} due to high organic content and moisture. Optimal for energy generation and liquid fertilizer production."
-            processing_steps = BIOGAS_STEPS
-            tools_required = [
-                "Biogas digester (5-10 m³ capacity)",
-                "Gas collection system",
-                "pH and temperature monitoring tools",
-                "Safety equipment",
-                "Slurry storage tanks"
-            ]
-            processing_time = "30-45 days initial fermentation + ongoing production"
-            efficiency = PROCESSING_DECISION_MATRIX["biogas_conditions"]["efficiency"]
-        else:
-            reasoning = f"Composting recommended for {request.waste_type} due to suitable carbon content and lower moisture. Ideal for solid fertilizer production."
-            processing_steps = COMPOST_STEPS
-            tools_required = [
-                "Composting area (covered)",
-                "Shredding/chopping equipment", 
-                "Turning tools (pitchfork, shovel)",
-                "Moisture monitoring equipment",
-                "Thermometer for temperature monitoring"
-            ]
-            processing_time = "2-4 months for complete decomposition"
-            efficiency = PROCESSING_DECISION_MATRIX["compost_conditions"]["efficiency"]
+        # A large batch takes tens of milliseconds; keep it off the event loop
+        tables = current_tables()
+        columns = await asyncio.get_running_loop().run_in_executor(
+            None, recommend_batch,
+            request.waste_types, request.weights, request.moisture, request.climate, request.price_tier, tables
+        )
+        
+        return JSONResponse({
+            "rows": rows,
+            "price_tier": request.price_tier,
+            "factor_set_version": tables.factor_set.version,
+            "columns": {name: column_to_list(values) for name, values in columns.items()},
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch recommendation failed: {str(e)}"
+        )
+
+@router.post("/recommend/methods")
+async def get_ranked_methods(request: MethodRankingRequest):
+    """
+    Rank every feasible processing method for one lot
+    
+    Methods are Pareto-ranked on GHG savings, output, processing time and
+    credit value: rank 0 methods are not beaten on all four by any other.
+    """
+    try:
+        if request.quantity < 0:
+            raise HTTPException(status_code=400, detail="Quantity must not be negative")
         
-        # Calculate expected output
-        expected_output = calculate_expected_output(
-            recommended_method, 
-            request.quantity, 
-            request.waste_type
+        tables = current_tables()
+        return {
+            "waste_type": request.waste_type,
+            "quantity": request.quantity,
+            "price_tier": request.price_tier,
+            "factor_set_version": tables.factor_set.version,
+            "methods": rank_processing_methods(request.waste_type, request.quantity, request.price_tier, tables),
+            "timestamp": datetime.now()
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Method ranking failed: {str(e)}"
         )
+
+@router.post("/recommend/sweep")
+async def sweep_methods(request: MethodSweepRequest):
+    """
+    Rank the processing methods for every (quantity, price tier) pair
+    
+    Returns the feasible methods once, and for each metric a nested list
+    indexed [quantity][price tier][method]; best_method is indexed
+    [quantity][price tier].
+    """
+    try:
+        price_tiers = request.price_tiers or list(carbon_credit_prices)
+        cells = len(request.quantities) * len(price_tiers)
+        if cells > settings.RECOMMEND_BATCH_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Grid too large. Maximum is {settings.RECOMMEND_BATCH_MAX_ROWS} quantity x price tier cells"
+            )
+        if any(quantity < 0 for quantity in request.quantities):
+            raise HTTPException(status_code=400, detail="Quantities must not be negative")
         
-        return RecommendationResponse(
-            recommended_method=recommended_method.title(),
-            processing_method=recommended_method.title(),  # Add for compatibility
-            reasoning=reasoning,
-            processing_steps=processing_steps,
-            tools_required=tools_required,
-            expected_output=expected_output,
-            processing_time=processing_time,
-            efficiency=efficiency,
-            message=f"Processing recommendation generated for {request.quantity}kg of {request.waste_type}",
-            timestamp=datetime.now()
+        tables = current_tables()
+        sweep = await asyncio.get_running_loop().run_in_executor(
+            None, sweep_processing_methods, request.waste_type, request.quantities, price_tiers, tables
         )
         
+        return JSONResponse({
+            "waste_type": request.waste_type,
+            "quantities": request.quantities,
+            "price_tiers": price_tiers,
+            "factor_set_version": tables.factor_set.version,
+            "results": {name: column_to_list(values) for name, values in sweep.items()},
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Recommendation generation failed: {str(e)}"
+            detail=f"Method sweep failed: {str(e)}"
         )
 
 @router.get("/processing-methods")
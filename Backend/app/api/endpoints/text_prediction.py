@@ -2,26 +2,42 @@
 Text prediction endpoint for agricultural waste classification
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+import asyncio
+import logging
 import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from app.models.schemas import TextPredictionRequest, TextPredictionResponse
 from app.core.config import settings
-from app.services.ml.text_classifier import WasteTextClassifier
+from app.services.ml.inference_pool import InferenceQueueFull, text_inference_pool
+from app.services.ml.model_utils import TEXT_CLASSIFIER, get_text_classifier, log_prediction, model_manager
 from app.services.ml.recommendation_system import get_waste_recommendations
 
 router = APIRouter()
 
-# Initialize ML classifier
-text_classifier = WasteTextClassifier()
-
 @router.get("/test")
 async def test_endpoint():
     """Simple test endpoint to check if text prediction router is working"""
     return {"status": "Text prediction endpoint is working!", "timestamp": datetime.now()}
 
+def classify_text(description: str, quantity: Optional[float], location: Optional[str]):
+    """Classify one description with the shared text classifier (runs on text_inference_pool)"""
+    return get_text_classifier().predict(description, quantity=quantity, location=location)
+
+def fallback_response(request: TextPredictionRequest, message: str) -> TextPredictionResponse:
+    """Simple classification used when the classifier fails or runs over budget"""
+    return TextPredictionResponse(
+        waste_type=request.waste_type.title(),
+        confidence=50.0,
+        quantity=request.quantity or 1000,
+        matched_category="Agricultural Waste",
+        suggestions=["Rice Straw", "Wheat Straw", "Corn Stalks"],
+        message=message,
+        timestamp=datetime.now()
+    )
+
 @router.post("/predict-text", response_model=TextPredictionResponse)
 async def predict_text(request: TextPredictionRequest):
     """
@@ -32,38 +48,34 @@ async def predict_text(request: TextPredictionRequest):
     - Quantity extraction from text
     - Location detection support
     - Multilingual support (Hindi/English)
-    - Processing recommendations
+    - Per-request latency budget (falls back to simple classification)
     """
     
-    print(f"🔍 Text Prediction Request received:")
-    print(f"   Waste type: '{request.waste_type}'")
-    print(f"   Quantity: {request.quantity}")
-    print(f"   Location: '{request.location}'")
-    print(f"   User ID: '{request.user_id}'")
-    
     # Validation
     if not request.waste_type or not request.waste_type.strip():
-        print("❌ Empty waste type error")
         raise HTTPException(
             status_code=422,
             detail="Waste type description cannot be empty"
         )
     
     try:
+        # Requests arriving before the classifier has loaded wait for it
+        # outside the budget instead of all getting the fallback
+        if model_manager.get_model(TEXT_CLASSIFIER) is None:
+            await asyncio.get_running_loop().run_in_executor(None, get_text_classifier)
+        
         processing_start = time.time()
         
-        # TEMPORARY: Skip ML classifier and use simple fallback for debugging
-        print(f"⚡ Using simple fallback classification for debugging")
-        prediction_result = {
-            "waste_type": request.waste_type.title(),
-            "confidence": 85.0,
-            "quantity": request.quantity or 1000,
-            "category": "Agricultural Waste",
-            "similar_types": ["Rice Straw", "Wheat Straw", "Corn Stalks", "Sugarcane Bagasse"]
-        }
+        # Classify off the event loop, bounded by the latency budget
+        prediction_result = await text_inference_pool.run(
+            classify_text, request.waste_type, request.quantity or None, request.location or None
+        )
         
-        # Skip recommendations for now to speed up response
         processing_time = time.time() - processing_start
+        log_prediction("text", {"text": request.waste_type, "user_id": request.user_id}, prediction_result, processing_time)
+        
+        if "error" in prediction_result:
+            return fallback_response(request, f"Fallback classification used: {prediction_result['error']}")
         
         # Prepare response
         response = TextPredictionResponse(
@@ -72,28 +84,25 @@ async def predict_text(request: TextPredictionRequest):
             quantity=prediction_result["quantity"],
             matched_category=prediction_result["category"],
             suggestions=prediction_result["similar_types"][:3],
-            message=f"Simple classification completed in {processing_time:.2f}s",
+            message=f"Text classification completed in {processing_time:.2f}s",
             timestamp=datetime.now()
         )
         
         return response
         
+    except asyncio.TimeoutError:
+        logging.warning(f"Text prediction exceeded {settings.TEXT_PREDICTION_BUDGET_MS:g}ms budget")
+        return fallback_response(
+            request, f"Fallback classification used: exceeded {settings.TEXT_PREDICTION_BUDGET_MS:g}ms budget"
+        )
+    except InferenceQueueFull as e:
+        logging.warning(f"Text prediction shed: {e}")
+        return fallback_response(request, "Fallback classification used: text classifier busy")
     except Exception as e:
-        print(f"❌ Text Prediction Error: {str(e)}")
-        print(f"❌ Error Type: {type(e).__name__}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logging.exception(f"Text prediction error: {e}")
         
         # Fallback to simple classification on error
-        return TextPredictionResponse(
-            waste_type=request.waste_type.title(),
-            confidence=50.0,
-            quantity=request.quantity or 1000,
-            matched_category="Agricultural Waste",
-            suggestions=["Rice Straw", "Wheat Straw", "Corn Stalks"],
-            message=f"Fallback classification used: {str(e)}",
-            timestamp=datetime.now()
-        )
+        return fallback_response(request, f"Fallback classification used: {str(e)}")
 
 @router.get("/waste-categories")
 async def get_waste_categories():
@@ -102,7 +111,7 @@ async def get_waste_categories():
     """
     try:
         # Get categories from ML classifier
-        categories = text_classifier.get_supported_categories()
+        categories = get_text_classifier().get_supported_categories()
         
         return {
             "categories": categories,
@@ -129,14 +138,18 @@ async def get_waste_categories():
         }
 
 @router.get("/search-suggestions/{query}")
-async def get_search_suggestions(query: str):
+async def get_search_suggestions(query: str, response: Response):
     """
     Get search suggestions for partial waste type queries using ML classifier
+    
+    Suggestions only change on deploy, so responses are cacheable by the
+    browser and any CDN in front of the API.
     """
     try:
-        # Use ML classifier for intelligent suggestions
-        suggestions = text_classifier.get_suggestions(query)
+        # Ranked lookup in the classifier's prebuilt suggestion index
+        suggestions = get_text_classifier().get_suggestions(query)
         
+        response.headers["Cache-Control"] = f"public, max-age={settings.SUGGESTIONS_CACHE_MAX_AGE}"
         return {
             "query": query,
             "suggestions": suggestions[:10],
@@ -154,6 +167,8 @@ async def get_search_suggestions(query: str):
         # Simple filtering based on query
         filtered = [s for s in basic_suggestions if query.lower() in s.lower()]
         
+        response.headers["Cache-Control"] = "no-store"
+        
         return {
             "query": query,
             "suggestions": filtered[:10],
@@ -39,6 +39,54 @@ class Settings(BaseSettings):
         "image/jpg", 
         "image/gif"
     ]
+    MAX_BATCH_IMAGES: int = 50  # Max uploads per /predict-images request
+    
+    # Model Loading
+    MODEL_PATH: str = "app/models/best.pt"
+    MODEL_INPUT_SIZE: int = 224  # Image size the classifier was trained at
+    INFERENCE_BACKEND: str = "torch"  # "torch" (ultralytics) or "onnx" (ONNX Runtime, CPU)
+    ONNX_MODEL_PATH: str = ""  # Defaults to MODEL_PATH with a .onnx extension
+    ONNX_QUANTIZE: bool = False  # Serve an INT8 dynamically quantized copy
+    PRELOAD_MODELS: bool = True  # Load models in the gunicorn master before forking workers
+    MODEL_WARMUP: bool = False  # Load models in the background right after startup
+    
+    # Prediction Cache (keyed by image hash + model version)
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_SIZE: int = 1024  # Entries kept in memory
+    PREDICTION_CACHE_DISK: bool = False  # Also persist entries under UPLOAD_DIR
+    PREDICTION_CACHE_DISK_MAX_MB: int = 256
+    
+    # Inference Worker Pool
+    INFERENCE_WORKERS: int = 2  # Threads running model inference
+    INFERENCE_MAX_PENDING: int = 16  # Running + queued jobs before returning 429
+    INFERENCE_TIMEOUT: float = 30.0  # Seconds per inference request
+    
+    # Micro-batching for concurrent /predict-image requests
+    MICRO_BATCHING_ENABLED: bool = True
+    MICRO_BATCH_MAX_SIZE: int = 8  # Images per coalesced batch
+    MICRO_BATCH_MAX_WAIT_MS: float = 10.0  # Max wait for a batch to fill
+    
+    # Text Classification
+    TEXT_PREDICTION_BUDGET_MS: float = 250.0  # Per-request latency budget for /predict-text
+    TEXT_PREDICTION_WORKERS: int = 2  # Threads classifying /predict-text requests
+    TEXT_PREDICTION_MAX_PENDING: int = 32  # Running + queued classifications before falling back
+    SUGGESTIONS_CACHE_MAX_AGE: int = 3600  # Seconds browsers/CDNs may cache /search-suggestions
+    TEXT_MODEL_PATH: str = ""  # Trained hashed n-gram model (.npz); empty = keyword rules only
+    TEXT_MODEL_MIN_CONFIDENCE: float = 0.5  # Below this probability the keyword rules decide
+    
+    # Recommendations
+    RECOMMEND_BATCH_MAX_ROWS: int = 100000  # Lots per /recommend/batch request
+    RECOMMENDATION_CACHE_SIZE: int = 1024  # /recommend responses kept in memory (0 disables)
+    
+    # GHG Calculations
+    EMISSION_FACTORS_PATH: str = "app/data/emission_factors.json"  # Versioned factor dataset
+    EMISSION_FACTORS_RELOAD_SECONDS: float = 30.0  # How often to check the dataset for changes (0 disables)
+    GHG_BATCH_MAX_ROWS: int = 500000  # Rows per /ghg-savings/batch request
+    GHG_BATCH_MAX_FILE_SIZE: int = 52428800  # 50MB per uploaded CSV/Parquet file
+    
+    # Carbon Credits
+    CARBON_CREDIT_CACHE_SIZE: int = 4096  # /carbon-credit responses kept in memory (0 disables)
+    CARBON_CREDIT_BATCH_MAX_ROWS: int = 500000  # Projects per /carbon-credit/batch request
     
     # Mock Settings (for development)
     MOCK_MODE: bool = True
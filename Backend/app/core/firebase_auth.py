@@ -2,8 +2,6 @@
 Firebase Authentication Integration
 """
 
-import firebase_admin
-from firebase_admin import credentials, auth
 from fastapi import HTTPException, Depends, Request
 from typing import Optional
 import os
@@ -11,13 +9,18 @@ import json
 
 # Global Firebase app instance
 firebase_app = None
+firebase_initialized = False
 
 def initialize_firebase():
-    """Initialize Firebase Admin SDK"""
-    global firebase_app
+    """Initialize Firebase Admin SDK (once, on first use)"""
+    global firebase_app, firebase_initialized
     
-    if firebase_app is None:
+    if not firebase_initialized:
         try:
+            # Imported lazily so API startup does not pay for the Firebase SDK
+            import firebase_admin
+            from firebase_admin import credentials
+            
             # Check if running in development mode
             if os.getenv("ENVIRONMENT") == "development":
                 # For development, you can use service account key file
@@ -42,6 +45,7 @@ def initialize_firebase():
                     # Use default credentials (for Cloud Run, etc.)
                     firebase_app = firebase_admin.initialize_app()
                     
+            firebase_initialized = True
             print("✅ Firebase initialized successfully")
             return firebase_app
             
@@ -50,6 +54,7 @@ def initialize_firebase():
             # For development, continue without Firebase
             if os.getenv("ENVIRONMENT") == "development":
                 print("⚠️ Running in development mode without Firebase")
+                firebase_initialized = True
                 return None
             else:
                 raise HTTPException(
@@ -63,6 +68,8 @@ def verify_firebase_token(token: str) -> dict:
     """
     Verify Firebase ID token and return user info
     """
+    initialize_firebase()
+    
     if not firebase_app:
         # For development mode without Firebase
         if os.getenv("ENVIRONMENT") == "development":
@@ -74,6 +81,8 @@ def verify_firebase_token(token: str) -> dict:
         else:
             raise HTTPException(status_code=500, detail="Firebase not initialized")
     
+    from firebase_admin import auth
+    
     try:
         # Verify the token
         decoded_token = auth.verify_id_token(token)
@@ -135,5 +144,3 @@ def get_optional_user(request: Request) -> Optional[dict]:
     except HTTPException:
         return None
 
-# Initialize Firebase on module import
-initialize_firebase()
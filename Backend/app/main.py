@@ -4,10 +4,15 @@ FastAPI main application for AgriWaste2Fuel Backend
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
 import logging
 
 # Import routers
 from app.api.endpoints import predict_image, text_prediction, dashboard, recommendations, ghg_calculation, certificates
+from app.core.config import settings
+from app.services.ml.inference_pool import inference_pool, text_inference_pool
+from app.services.ml.model_utils import TEXT_CLASSIFIER, model_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +44,23 @@ app.include_router(recommendations.router, prefix="/api", tags=["Recommendations
 app.include_router(ghg_calculation.router, prefix="/api", tags=["GHG Calculation"])
 app.include_router(certificates.router, prefix="/api", tags=["Certificates"])
 
+@app.on_event("startup")
+async def start_model_warmup():
+    """Optionally load models in the background so startup stays fast"""
+    if settings.MODEL_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, model_manager.preload)
+        logger.info("Model warm-up started in background")
+    else:
+        # The text classifier is light, but its first load alone would
+        # exceed the /predict-text latency budget
+        asyncio.get_running_loop().run_in_executor(None, model_manager.preload, [TEXT_CLASSIFIER])
+
+@app.on_event("shutdown")
+async def shutdown_inference_pool():
+    """Release inference worker threads on shutdown"""
+    inference_pool.shutdown()
+    text_inference_pool.shutdown()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -63,6 +85,26 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/ready")
+async def readiness_check(require_models: bool = False):
+    """
+    Readiness check endpoint
+    
+    Lightweight routes are ready as soon as the app is up; pass
+    require_models=true to get 503 until every ML model is loaded.
+    """
+    models_ready = model_manager.all_loaded()
+    ready = models_ready or not require_models
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "models_ready": models_ready,
+            "models": model_manager.list_models()
+        }
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,152 @@
+"""
+Versioned emission factor dataset
+
+Burning, processing and methane emission factors and the per-method GHG
+saving factors all come from one JSON file (EMISSION_FACTORS_PATH, keyed
+by canonical waste type ID). It is compiled into a FactorSet: a dict per
+table for single lookups and dense arrays for batch calculations.
+
+The file is checked for changes at most every
+EMISSION_FACTORS_RELOAD_SECONDS and recompiled when it changes, so
+factors can be corrected without a restart. A file that fails to load is
+reported and the previous set stays in use. Responses carry the version
+of the set they were computed with, so stored results can be recomputed
+selectively after a factor change.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.waste_types import DEFAULT_KEY, index_by_waste_type, lookup_factor, resolve_waste_type
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tables every dataset must have
+EMISSION_TABLES = ("burning", "biogas", "compost")
+METHANE_TABLE = "anaerobic_decomposition"
+
+VERSION_HEADER = "X-Factor-Set-Version"  # Response header naming the factor set used
+
+
+class FactorSet:
+    """
+    One compiled version of the dataset
+    
+    Attributes:
+        version: Version string of the dataset
+        tables: Table name -> {canonical waste type ID: factor}, with a
+            default entry
+        waste_types: Axis of the dense arrays; index 0 is the default entry
+        arrays: Table name -> factor per waste_types entry
+        ghg_saving_factors: (waste type ID, method) -> (min, max) kg CO₂e
+            saved per kg, in dataset order
+    """
+    
+    def __init__(self, data: dict, path: str = "", mtime: float = 0.0):
+        self.version = str(data["version"])
+        self.path = path
+        self.mtime = mtime
+        self.sources = list(data.get("sources", []))
+        self.gwp_ch4 = data["gwp"]["ch4"]
+        
+        self.units: Dict[str, str] = {}
+        self.tables: Dict[str, Dict[str, float]] = {}
+        for group in ("emission_factors", "methane_factors"):
+            for name, table in data[group].items():
+                if DEFAULT_KEY not in table["factors"]:
+                    raise ValueError(f"Factor table {name!r} has no {DEFAULT_KEY!r} entry")
+                self.tables[name] = index_by_waste_type(table["factors"])
+                self.units[name] = table["unit"]
+        missing = [name for name in EMISSION_TABLES + (METHANE_TABLE,) if name not in self.tables]
+        if missing:
+            raise ValueError(f"Missing factor tables: {', '.join(missing)}")
+        
+        savings = data["ghg_saving_factors"]
+        self.units["ghg_savings"] = savings["unit"]
+        self.ghg_saving_factors: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        for waste_type, methods in savings["factors"].items():
+            waste_id = resolve_waste_type(waste_type)
+            if waste_id is None:
+                raise ValueError(f"Unknown waste type in GHG saving factors: {waste_type!r}")
+            for method, (low, high) in methods.items():
+                if not 0 <= low <= high:
+                    raise ValueError(f"Invalid GHG saving factors for {waste_type} / {method}: {low}, {high}")
+                self.ghg_saving_factors[(waste_id, method)] = (float(low), float(high))
+        
+        self.waste_types = [DEFAULT_KEY] + sorted({
+            waste_id for table in self.tables.values() for waste_id in table if waste_id != DEFAULT_KEY
+        })
+        self.codes = {waste_id: code for code, waste_id in enumerate(self.waste_types)}
+        self.arrays = {
+            name: np.array([table.get(waste_id, table[DEFAULT_KEY]) for waste_id in self.waste_types])
+            for name, table in self.tables.items()
+        }
+    
+    def factor(self, table: str, waste_type: str) -> float:
+        """Factor for a waste type name, falling back to the table's default"""
+        return lookup_factor(self.tables[table], waste_type)
+    
+    def code(self, waste_type: str) -> int:
+        """Position of a waste type name in waste_types (0 when unknown)"""
+        return self.codes.get(resolve_waste_type(waste_type), 0)
+
+
+def load_factor_set(path: str) -> FactorSet:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        return FactorSet(data, path, os.path.getmtime(path))
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed emission factor dataset {path}: {e!r}")
+
+
+class EmissionFactorStore:
+    """The current FactorSet, recompiled when its file changes"""
+    
+    def __init__(self, path: str, reload_seconds: float):
+        self.path = os.path.join(BACKEND_DIR, path)  # Relative paths are from the Backend directory
+        self.reload_seconds = reload_seconds
+        self.lock = threading.RLock()
+        self.factor_set = load_factor_set(self.path)
+        self.next_check = time.monotonic() + reload_seconds
+        print(f"✅ Emission factors {self.factor_set.version} loaded from {self.path}")
+    
+    def get(self) -> FactorSet:
+        if self.reload_seconds > 0 and time.monotonic() >= self.next_check:
+            self.check()
+        return self.factor_set
+    
+    def check(self):
+        """Reload if the file changed since it was last loaded"""
+        with self.lock:
+            if time.monotonic() < self.next_check:
+                return
+            self.next_check = time.monotonic() + self.reload_seconds
+            try:
+                if os.path.getmtime(self.path) == self.factor_set.mtime:
+                    return
+                self.reload()
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Keeping emission factors {self.factor_set.version}: {e}")
+    
+    def reload(self) -> FactorSet:
+        """Load the file now; raises (and keeps the current set) if it is invalid"""
+        with self.lock:
+            factor_set = load_factor_set(self.path)
+            previous = self.factor_set.version
+            self.factor_set = factor_set
+            print(f"🔄 Emission factors reloaded: {previous} -> {factor_set.version}")
+            return factor_set
+
+
+# Global store, compiled at startup
+emission_factors = EmissionFactorStore(settings.EMISSION_FACTORS_PATH, settings.EMISSION_FACTORS_RELOAD_SECONDS)
+
+def get_factor_set() -> FactorSet:
+    return emission_factors.get()
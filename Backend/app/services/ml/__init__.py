@@ -7,7 +7,7 @@ from .recommendation_system import (
     estimate_ghg_savings_and_credits,
     get_optimal_processing_method
 )
-from .model_utils import ModelManager
+from .model_utils import ModelManager, model_manager, get_image_classifier, get_text_classifier
 
 __all__ = [
     'WasteImageClassifier',
@@ -16,5 +16,8 @@ __all__ = [
     'full_farm_waste_recommendation',
     'estimate_ghg_savings_and_credits',
     'get_optimal_processing_method',
-    'ModelManager'
+    'ModelManager',
+    'model_manager',
+    'get_image_classifier',
+    'get_text_classifier'
 ]
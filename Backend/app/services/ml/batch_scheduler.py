@@ -0,0 +1,113 @@
+"""
+Micro-batching scheduler that coalesces concurrent single-image predictions
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List
+
+from app.services.ml.inference_pool import InferencePool, InferenceQueueFull
+
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent ``submit`` calls into batches for the model
+    
+    A batch is closed when it reaches ``max_batch_size`` images or when
+    ``max_wait_ms`` has passed since its first image arrived, whichever
+    comes first. Each batch is run through ``predict_batch`` on the
+    inference pool and the results are handed back to the waiting callers
+    in submission order.
+    """
+    
+    def __init__(
+        self,
+        predict_batch: Callable[[List[bytes]], List[Any]],
+        pool: InferencePool,
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_queue: int
+    ):
+        self.predict_batch = predict_batch
+        self.pool = pool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self._queue = None
+        self._collector = None
+        self._loop = None
+        self._dispatches = set()
+        
+    def _ensure_collector(self):
+        """Start the collector task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._collector is None or self._collector.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._collector = loop.create_task(self._collect())
+    
+    async def submit(self, image_bytes: bytes) -> Any:
+        """Queue one image and wait for its prediction"""
+        self._ensure_collector()
+        
+        if self._queue.full():
+            raise InferenceQueueFull(
+                f"Batch queue full ({self._queue.qsize()}/{self.max_queue} images waiting)"
+            )
+        
+        future = self._loop.create_future()
+        self._queue.put_nowait((image_bytes, future))
+        return await future
+    
+    async def _collect(self):
+        """Group queued images into batches and dispatch them"""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                # Take whatever is already waiting before sleeping
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Run the batch without blocking collection of the next one
+            task = self._loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch):
+        """Run one batch on the inference pool and resolve its futures"""
+        images = [image_bytes for image_bytes, _ in batch]
+        
+        try:
+            results = await self.pool.run(self.predict_batch, images)
+        except Exception as e:
+            if not isinstance(e, (InferenceQueueFull, asyncio.TimeoutError)):
+                logging.error(f"Micro-batch of {len(batch)} images failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    def get_stats(self) -> dict:
+        """Get scheduler configuration and queue depth"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "batches_in_flight": len(self._dispatches)
+        }
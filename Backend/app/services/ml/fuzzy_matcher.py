@@ -0,0 +1,211 @@
+"""
+Typo- and transliteration-tolerant keyword matching
+
+Farmers write the same crop many ways: "gehun", "gehoon", "gehu", "गेहूं",
+"paddy stubbel". Texts are transliterated to Latin, folded to a phonetic
+key (so "oo"/"u", "w"/"v", doubled letters compare equal), and each token
+is corrected to the nearest keyword token using a SymSpell-style deletion
+index, which bounds the work per token. The corrected text is then scored
+by the regular KeywordMatcher over the folded keywords.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+# Devanagari -> Latin, in the loose spelling people use when typing Hindi
+# in Latin script
+CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 'sh',
+    'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+# Consonant + nukta (NFC keeps these decomposed)
+NUKTA_CONSONANTS = {'क': 'q', 'ख': 'kh', 'ग': 'g', 'ज': 'z', 'ड': 'r', 'ढ': 'rh', 'फ': 'f', 'य': 'y'}
+VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ee', 'उ': 'u', 'ऊ': 'oo',
+    'ऋ': 'ri', 'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au', 'ऑ': 'o',
+}
+VOWEL_SIGNS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ee', 'ु': 'u', 'ू': 'oo', 'ृ': 'ri',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au', 'ॉ': 'o', 'ॅ': 'e',
+}
+NASALS = {'ं': 'n', 'ँ': 'n'}
+VIRAMA = '्'
+NUKTA = '़'
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9\u0900-\u097f]+")
+
+# Phonetic folding applied to Latin text, in order
+FOLDS = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"ee|ea"), "i"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"(.)\1+"), r"\1"),  # Doubled letters, also turns "aa" into "a"
+]
+
+MAX_TOKEN_LENGTH = 20  # Longer tokens are not corrected
+
+
+def transliterate(text: str) -> str:
+    """Transliterate Devanagari to Latin; other characters pass through"""
+    out = []
+    chars = unicodedata.normalize("NFC", text)
+    i = 0
+    while i < len(chars):
+        char = chars[i]
+        if char in CONSONANTS:
+            latin = CONSONANTS[char]
+            if i + 1 < len(chars) and chars[i + 1] == NUKTA:
+                latin = NUKTA_CONSONANTS.get(char, latin)
+                i += 1
+            following = chars[i + 1] if i + 1 < len(chars) else ""
+            out.append(latin)
+            if following in VOWEL_SIGNS:
+                out.append(VOWEL_SIGNS[following])
+                i += 1
+            elif following == VIRAMA:
+                i += 1
+            elif following in CONSONANTS or following in NASALS:
+                out.append("a")  # Inherent vowel; dropped at the end of a word
+        elif char in VOWELS:
+            out.append(VOWELS[char])
+        elif char in NASALS:
+            out.append(NASALS[char])
+        elif char in VOWEL_SIGNS or char in (VIRAMA, NUKTA, 'ः'):
+            pass
+        else:
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+def fold(token: str) -> str:
+    """Phonetic key of a Latin token"""
+    for pattern, replacement in FOLDS:
+        token = pattern.sub(replacement, token)
+    return token
+
+def normalize_tokens(text: str) -> List[str]:
+    """Transliterated, folded tokens of a text"""
+    latin = transliterate((text or "").lower())
+    return [fold(token) for token in TOKEN_PATTERN.findall(latin)]
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions cost 1), capped"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+def deletes(word: str, distance: int) -> Set[str]:
+    """All strings obtained by deleting up to `distance` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class FuzzyKeywordMatcher:
+    """
+    Keyword matcher that tolerates typos and transliteration
+    
+    Tokens up to 3 characters are only matched exactly, 4-character tokens
+    may be completed by one character ("gehu" -> "gehun"), longer tokens are
+    corrected within edit distance 1 (5-7 characters) or 2 (8 and more).
+    Corrections must keep the first letter, which rules out most unrelated
+    words ("price" is not "rice").
+    """
+    
+    def __init__(self, keywords_by_label: Dict[str, List[str]], max_distance: int = 2):
+        self.max_distance = max_distance
+        folded_keywords = {
+            label: [" ".join(normalize_tokens(keyword)) for keyword in keywords]
+            for label, keywords in keywords_by_label.items()
+        }
+        self.matcher = KeywordMatcher({
+            label: [keyword for keyword in keywords if keyword]
+            for label, keywords in folded_keywords.items()
+        })
+        
+        self.vocabulary: List[str] = []
+        for keywords in folded_keywords.values():
+            for keyword in keywords:
+                for token in keyword.split():
+                    if token not in self.vocabulary:
+                        self.vocabulary.append(token)
+        self.vocabulary_set = set(self.vocabulary)
+        
+        self.delete_index: Dict[str, List[int]] = {}
+        for word_index, word in enumerate(self.vocabulary):
+            for deleted in deletes(word, max_distance):
+                self.delete_index.setdefault(deleted, []).append(word_index)
+        
+        self.corrections: Dict[str, Optional[str]] = {}
+    
+    @staticmethod
+    def allowed_distance(token: str) -> int:
+        if len(token) <= 3:
+            return 0
+        if len(token) <= 7:
+            return 1
+        return 2
+    
+    def correct(self, token: str) -> Optional[str]:
+        """Closest vocabulary token, or None when nothing is close enough"""
+        if token in self.vocabulary_set:
+            return token
+        if token in self.corrections:
+            return self.corrections[token]
+        
+        distance = min(self.allowed_distance(token), self.max_distance)
+        best: Optional[Tuple[int, int]] = None
+        if distance and len(token) <= MAX_TOKEN_LENGTH:
+            candidates = set()
+            for deleted in deletes(token, distance):
+                candidates.update(self.delete_index.get(deleted, ()))
+            
+            for word_index in candidates:
+                word = self.vocabulary[word_index]
+                if word[0] != token[0]:
+                    continue
+                # Short tokens may only be completed, not changed
+                if len(token) == 4 and not word.startswith(token):
+                    continue
+                word_distance = edit_distance(token, word, distance)
+                if word_distance <= distance and (best is None or (word_distance, word_index) < best):
+                    best = (word_distance, word_index)
+        
+        correction = self.vocabulary[best[1]] if best else None
+        if len(self.corrections) < 100000:
+            self.corrections[token] = correction
+        return correction
+    
+    def normalize(self, text: str) -> str:
+        """Text rewritten into folded keyword tokens where possible"""
+        return " ".join(self.correct(token) or token for token in normalize_tokens(text))
+    
+    def best_labels(self, texts: List[str]) -> List[Tuple[str, int]]:
+        """(best label, score) per text, as KeywordMatcher.best_labels"""
+        return self.matcher.best_labels([self.normalize(text) for text in texts])
@@ -0,0 +1,288 @@
+"""
+Gazetteer of Indian states, union territories and major agricultural districts
+
+Names and aliases (English spellings, Hindi/Devanagari names, short forms)
+are indexed once as token n-grams, so a text is resolved to a region in a
+single left-to-right pass over its tokens. Regions are identified by their
+ISO 3166-2 code (e.g. "IN-PB" for Punjab).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# code -> (canonical name, aliases)
+STATES: Dict[str, Tuple[str, List[str]]] = {
+    "IN-AP": ("Andhra Pradesh", ["andhra", "आंध्र प्रदेश", "आन्ध्र प्रदेश"]),
+    "IN-AR": ("Arunachal Pradesh", ["arunachal", "अरुणाचल प्रदेश"]),
+    "IN-AS": ("Assam", ["असम"]),
+    "IN-BR": ("Bihar", ["बिहार"]),
+    "IN-CG": ("Chhattisgarh", ["chattisgarh", "chhatisgarh", "छत्तीसगढ़"]),
+    "IN-GA": ("Goa", ["गोवा"]),
+    "IN-GJ": ("Gujarat", ["gujrat", "गुजरात"]),
+    "IN-HR": ("Haryana", ["हरियाणा", "हरयाणा"]),
+    "IN-HP": ("Himachal Pradesh", ["himachal", "हिमाचल प्रदेश", "हिमाचल"]),
+    "IN-JH": ("Jharkhand", ["झारखंड", "झारखण्ड"]),
+    "IN-KA": ("Karnataka", ["कर्नाटक"]),
+    "IN-KL": ("Kerala", ["keralam", "केरल"]),
+    "IN-MP": ("Madhya Pradesh", ["मध्य प्रदेश", "मध्यप्रदेश"]),
+    "IN-MH": ("Maharashtra", ["maharastra", "महाराष्ट्र"]),
+    "IN-MN": ("Manipur", ["मणिपुर"]),
+    "IN-ML": ("Meghalaya", ["मेघालय"]),
+    "IN-MZ": ("Mizoram", ["मिज़ोरम", "मिजोरम"]),
+    "IN-NL": ("Nagaland", ["नागालैंड"]),
+    "IN-OD": ("Odisha", ["orissa", "ओडिशा", "उड़ीसा"]),
+    "IN-PB": ("Punjab", ["पंजाब"]),
+    "IN-RJ": ("Rajasthan", ["राजस्थान"]),
+    "IN-SK": ("Sikkim", ["सिक्किम"]),
+    "IN-TN": ("Tamil Nadu", ["tamilnadu", "तमिलनाडु", "तमिल नाडु"]),
+    "IN-TS": ("Telangana", ["तेलंगाना"]),
+    "IN-TR": ("Tripura", ["त्रिपुरा"]),
+    "IN-UP": ("Uttar Pradesh", ["उत्तर प्रदेश", "उत्तरप्रदेश"]),
+    "IN-UK": ("Uttarakhand", ["uttaranchal", "उत्तराखंड", "उत्तराखण्ड"]),
+    "IN-WB": ("West Bengal", ["bengal", "पश्चिम बंगाल", "बंगाल"]),
+    "IN-AN": ("Andaman and Nicobar Islands", ["andaman", "andaman and nicobar", "अंडमान"]),
+    "IN-CH": ("Chandigarh", ["चंडीगढ़"]),
+    "IN-DH": ("Dadra and Nagar Haveli and Daman and Diu", ["dadra and nagar haveli", "daman and diu"]),
+    "IN-DL": ("Delhi", ["new delhi", "दिल्ली", "नई दिल्ली"]),
+    "IN-JK": ("Jammu and Kashmir", ["jammu", "kashmir", "जम्मू", "कश्मीर", "जम्मू कश्मीर"]),
+    "IN-LA": ("Ladakh", ["लद्दाख"]),
+    "IN-LD": ("Lakshadweep", ["लक्षद्वीप"]),
+    "IN-PY": ("Puducherry", ["pondicherry", "पुदुचेरी"]),
+}
+
+# Short forms that are also ordinary words ("up", "mp"), only matched when
+# written in capitals
+CASE_SENSITIVE_ALIASES: Dict[str, str] = {
+    "UP": "IN-UP",
+    "MP": "IN-MP",
+    "WB": "IN-WB",
+    "J&K": "IN-JK",
+}
+
+# Major agricultural districts -> state code. Names that are also common
+# words or personal names (Mandi, Gaya, Una, Mau, Dhar, Guna, Surat, Erode,
+# Anand, Krishna) or that exist in two states (Aurangabad, Bilaspur) are
+# left out on purpose.
+DISTRICTS: Dict[str, Tuple[str, List[str]]] = {
+    # Punjab
+    "Ludhiana": ("IN-PB", ["लुधियाना"]),
+    "Amritsar": ("IN-PB", ["अमृतसर"]),
+    "Patiala": ("IN-PB", ["पटियाला"]),
+    "Sangrur": ("IN-PB", ["संगरूर"]),
+    "Bathinda": ("IN-PB", ["bhatinda", "बठिंडा"]),
+    "Jalandhar": ("IN-PB", ["jullundur", "जालंधर"]),
+    "Firozpur": ("IN-PB", ["ferozepur", "फिरोजपुर"]),
+    "Moga": ("IN-PB", ["मोगा"]),
+    "Gurdaspur": ("IN-PB", ["गुरदासपुर"]),
+    "Fazilka": ("IN-PB", ["फाजिल्का"]),
+    # Haryana
+    "Karnal": ("IN-HR", ["करनाल"]),
+    "Kurukshetra": ("IN-HR", ["कुरुक्षेत्र"]),
+    "Kaithal": ("IN-HR", ["कैथल"]),
+    "Hisar": ("IN-HR", ["hissar", "हिसार"]),
+    "Sirsa": ("IN-HR", ["सिरसा"]),
+    "Fatehabad": ("IN-HR", ["फतेहाबाद"]),
+    "Jind": ("IN-HR", ["जींद"]),
+    "Panipat": ("IN-HR", ["पानीपत"]),
+    "Sonipat": ("IN-HR", ["sonepat", "सोनीपत"]),
+    "Ambala": ("IN-HR", ["अंबाला"]),
+    # Uttar Pradesh
+    "Meerut": ("IN-UP", ["मेरठ"]),
+    "Muzaffarnagar": ("IN-UP", ["मुजफ्फरनगर"]),
+    "Saharanpur": ("IN-UP", ["सहारनपुर"]),
+    "Bareilly": ("IN-UP", ["बरेली"]),
+    "Lakhimpur Kheri": ("IN-UP", ["lakhimpur", "लखीमपुर खीरी", "लखीमपुर"]),
+    "Sitapur": ("IN-UP", ["सीतापुर"]),
+    "Lucknow": ("IN-UP", ["लखनऊ"]),
+    "Kanpur": ("IN-UP", ["कानपुर"]),
+    "Agra": ("IN-UP", ["आगरा"]),
+    "Gorakhpur": ("IN-UP", ["गोरखपुर"]),
+    "Varanasi": ("IN-UP", ["banaras", "benares", "वाराणसी", "बनारस"]),
+    "Prayagraj": ("IN-UP", ["allahabad", "प्रयागराज", "इलाहाबाद"]),
+    "Shahjahanpur": ("IN-UP", ["शाहजहांपुर"]),
+    "Bijnor": ("IN-UP", ["बिजनौर"]),
+    # Bihar
+    "Patna": ("IN-BR", ["पटना"]),
+    "Muzaffarpur": ("IN-BR", ["मुजफ्फरपुर"]),
+    "Darbhanga": ("IN-BR", ["दरभंगा"]),
+    "Bhagalpur": ("IN-BR", ["भागलपुर"]),
+    "Purnia": ("IN-BR", ["purnea", "पूर्णिया"]),
+    "Rohtas": ("IN-BR", ["रोहतास"]),
+    "Buxar": ("IN-BR", ["बक्सर"]),
+    # Madhya Pradesh
+    "Indore": ("IN-MP", ["इंदौर"]),
+    "Bhopal": ("IN-MP", ["भोपाल"]),
+    "Jabalpur": ("IN-MP", ["जबलपुर"]),
+    "Gwalior": ("IN-MP", ["ग्वालियर"]),
+    "Ujjain": ("IN-MP", ["उज्जैन"]),
+    "Hoshangabad": ("IN-MP", ["narmadapuram", "होशंगाबाद"]),
+    "Vidisha": ("IN-MP", ["विदिशा"]),
+    "Sehore": ("IN-MP", ["सीहोर"]),
+    "Rewa": ("IN-MP", ["रीवा"]),
+    "Satna": ("IN-MP", ["सतना"]),
+    # Maharashtra
+    "Pune": ("IN-MH", ["poona", "पुणे"]),
+    "Nashik": ("IN-MH", ["nasik", "नाशिक"]),
+    "Nagpur": ("IN-MH", ["नागपुर"]),
+    "Ahmednagar": ("IN-MH", ["ahilyanagar", "अहमदनगर"]),
+    "Kolhapur": ("IN-MH", ["कोल्हापुर"]),
+    "Sangli": ("IN-MH", ["सांगली"]),
+    "Satara": ("IN-MH", ["सातारा"]),
+    "Solapur": ("IN-MH", ["sholapur", "सोलापुर"]),
+    "Jalgaon": ("IN-MH", ["जलगांव"]),
+    "Amravati": ("IN-MH", ["अमरावती"]),
+    "Latur": ("IN-MH", ["लातूर"]),
+    "Yavatmal": ("IN-MH", ["यवतमाल"]),
+    # Rajasthan
+    "Jaipur": ("IN-RJ", ["जयपुर"]),
+    "Sri Ganganagar": ("IN-RJ", ["ganganagar", "श्रीगंगानगर", "गंगानगर"]),
+    "Hanumangarh": ("IN-RJ", ["हनुमानगढ़"]),
+    "Bikaner": ("IN-RJ", ["बीकानेर"]),
+    "Jodhpur": ("IN-RJ", ["जोधपुर"]),
+    "Alwar": ("IN-RJ", ["अलवर"]),
+    "Bharatpur": ("IN-RJ", ["भरतपुर"]),
+    "Nagaur": ("IN-RJ", ["नागौर"]),
+    "Udaipur": ("IN-RJ", ["उदयपुर"]),
+    # Gujarat
+    "Ahmedabad": ("IN-GJ", ["अहमदाबाद"]),
+    "Rajkot": ("IN-GJ", ["राजकोट"]),
+    "Vadodara": ("IN-GJ", ["baroda", "वडोदरा"]),
+    "Junagadh": ("IN-GJ", ["जूनागढ़"]),
+    "Banaskantha": ("IN-GJ", ["बनासकांठा"]),
+    # Karnataka
+    "Bengaluru": ("IN-KA", ["bangalore", "बेंगलुरु", "बैंगलोर"]),
+    "Mysuru": ("IN-KA", ["mysore", "मैसूर"]),
+    "Belagavi": ("IN-KA", ["belgaum", "बेलगाम"]),
+    "Mandya": ("IN-KA", ["मांड्या"]),
+    "Davanagere": ("IN-KA", ["davangere", "दावणगेरे"]),
+    "Raichur": ("IN-KA", ["रायचूर"]),
+    # Andhra Pradesh and Telangana
+    "Guntur": ("IN-AP", ["गुंटूर"]),
+    "East Godavari": ("IN-AP", ["पूर्वी गोदावरी"]),
+    "West Godavari": ("IN-AP", ["पश्चिमी गोदावरी"]),
+    "Kurnool": ("IN-AP", ["कुरनूल"]),
+    "Hyderabad": ("IN-TS", ["हैदराबाद"]),
+    "Warangal": ("IN-TS", ["वारंगल"]),
+    "Nizamabad": ("IN-TS", ["निजामाबाद"]),
+    "Karimnagar": ("IN-TS", ["करीमनगर"]),
+    "Nalgonda": ("IN-TS", ["नलगोंडा"]),
+    # Tamil Nadu and Kerala
+    "Thanjavur": ("IN-TN", ["tanjore", "तंजावुर"]),
+    "Coimbatore": ("IN-TN", ["कोयंबटूर"]),
+    "Madurai": ("IN-TN", ["मदुरै"]),
+    "Tiruchirappalli": ("IN-TN", ["trichy", "तिरुचिरापल्ली"]),
+    "Palakkad": ("IN-KL", ["palghat", "पलक्कड़"]),
+    "Thrissur": ("IN-KL", ["trichur", "त्रिशूर"]),
+    "Alappuzha": ("IN-KL", ["alleppey", "अलाप्पुझा"]),
+    # West Bengal and Odisha
+    "Bardhaman": ("IN-WB", ["burdwan", "बर्धमान"]),
+    "Murshidabad": ("IN-WB", ["मुर्शिदाबाद"]),
+    "Cuttack": ("IN-OD", ["कटक"]),
+    "Sambalpur": ("IN-OD", ["संबलपुर"]),
+    "Bargarh": ("IN-OD", ["बरगढ़"]),
+    # Chhattisgarh and Jharkhand
+    "Raipur": ("IN-CG", ["रायपुर"]),
+    "Durg": ("IN-CG", ["दुर्ग"]),
+    "Ranchi": ("IN-JH", ["रांची"]),
+}
+
+
+class Region(NamedTuple):
+    code: str  # ISO 3166-2 code of the state / union territory
+    state: str  # Canonical state name
+    district: Optional[str] = None  # Set when the text named a district
+
+
+# Devanagari vowel signs are not \w, so they are added to the token class
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u097f&]+")
+
+
+def normalize(text: str) -> str:
+    """NFC-normalise so composed and decomposed Hindi spellings compare equal"""
+    return unicodedata.normalize("NFC", text or "")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+class Gazetteer:
+    """
+    Token n-gram index from place names to regions
+    
+    Lookup walks the tokens of a text once, trying the longest indexed
+    n-gram at each position, so it is linear in the text length and only
+    matches whole words.
+    """
+    
+    def __init__(self):
+        self.index: Dict[Tuple[str, ...], Region] = {}
+        self.case_sensitive_index: Dict[Tuple[str, ...], Region] = {}
+        
+        for code, (name, aliases) in STATES.items():
+            region = Region(code, name)
+            for alias in [name, *aliases]:
+                self._add(self.index, alias.lower(), region)
+        
+        for district, (code, aliases) in DISTRICTS.items():
+            region = Region(code, STATES[code][0], district)
+            for alias in [district, *aliases]:
+                self._add(self.index, alias.lower(), region)
+        
+        for alias, code in CASE_SENSITIVE_ALIASES.items():
+            self._add(self.case_sensitive_index, alias, Region(code, STATES[code][0]))
+        
+        self.max_ngram = max(len(key) for key in [*self.index, *self.case_sensitive_index])
+        self.codes = {code: Region(code, name) for code, (name, _) in STATES.items()}
+    
+    @staticmethod
+    def _add(index: Dict, alias: str, region: Region):
+        key = tuple(tokenize(alias))
+        if key:
+            index.setdefault(key, region)
+    
+    def find_all(self, text: str) -> List[Region]:
+        """Every place named in the text, in order of appearance"""
+        tokens = tokenize(text)
+        lowered = [token.lower() for token in tokens]
+        regions = []
+        
+        position = 0
+        while position < len(tokens):
+            for n in range(min(self.max_ngram, len(tokens) - position), 0, -1):
+                region = (
+                    self.index.get(tuple(lowered[position:position + n])) or
+                    self.case_sensitive_index.get(tuple(tokens[position:position + n]))
+                )
+                if region is not None:
+                    regions.append(region)
+                    position += n
+                    break
+            else:
+                position += 1
+        
+        return regions
+    
+    def find(self, text: str) -> Optional[Region]:
+        """The first place named in the text, or None"""
+        regions = self.find_all(text)
+        return regions[0] if regions else None
+    
+    def resolve(self, location: str) -> Optional[Region]:
+        """Resolve a location field, which may already be a region code"""
+        if not location:
+            return None
+        code = location.strip().upper()
+        if code in self.codes:
+            return self.codes[code]
+        return self.find(location)
+
+
+gazetteer = Gazetteer()
+
+@lru_cache(maxsize=1024)
+def resolve_region_code(location: str) -> Optional[str]:
+    """Region code for a location name, district, alias or code (cached)"""
+    region = gazetteer.resolve(location)
+    return region.code if region else None
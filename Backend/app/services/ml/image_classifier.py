@@ -1,28 +1,70 @@
-import torch
-import cv2
 import numpy as np
 from PIL import Image
 import io
 import os
-from ultralytics import YOLO
+import time
 import logging
 
+from app.core.config import settings
+from .prediction_cache import PredictionCache, image_digest
+
+class DecodedImage:
+    """
+    A decoded upload: one contiguous, model-sized RGB array shared by the
+    model, the fallback classifier and quantity estimation, plus the
+    original dimensions (which quantity estimation is based on)
+    """
+    
+    __slots__ = ("array", "size", "decode_time", "digest")
+    
+    def __init__(self, array, size, decode_time, digest=None):
+        self.array = array
+        self.size = size  # Original (width, height), like PIL's Image.size
+        self.decode_time = decode_time
+        self.digest = digest  # Hash of the upload bytes, seeds quantity noise
+
 class WasteImageClassifier:
     def __init__(self):
         self.model = None
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.backend = None
+        self.device = None
         self.classes = [
             'Rice Straw', 'Wheat Straw', 'Corn Stalks', 
             'Cotton Waste', 'Sugarcane Bagasse', 'Agricultural Waste'
         ]
         self.load_model()
+        self.model_version = self.get_model_version()
+        self.cache = None
+        if settings.PREDICTION_CACHE_ENABLED:
+            self.cache = PredictionCache(
+                max_entries=settings.PREDICTION_CACHE_SIZE,
+                disk_dir=os.path.join(settings.UPLOAD_DIR, "prediction_cache") if settings.PREDICTION_CACHE_DISK else None,
+                disk_max_bytes=settings.PREDICTION_CACHE_DISK_MAX_MB * 1024 * 1024
+            )
     
     def load_model(self):
-        """Load YOLOv8 model"""
+        """Load YOLOv8 model with the configured inference backend"""
         try:
-            model_path = "app/models/best.pt"
-            if os.path.exists(model_path):
+            model_path = settings.MODEL_PATH
+            if settings.INFERENCE_BACKEND == "onnx":
+                from .onnx_backend import load_onnx_model
+                
+                self.model = load_onnx_model(
+                    model_path,
+                    onnx_path=settings.ONNX_MODEL_PATH,
+                    quantize=settings.ONNX_QUANTIZE,
+                    imgsz=settings.MODEL_INPUT_SIZE
+                )
+                self.backend = "onnx-int8" if settings.ONNX_QUANTIZE else "onnx"
+                print(f"✅ ONNX model loaded successfully ({self.backend})")
+            elif os.path.exists(model_path):
+                # Heavy imports are deferred until a model is actually loaded
+                import torch
+                from ultralytics import YOLO
+                
+                self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
                 self.model = YOLO(model_path)
+                self.backend = "torch"
                 print(f"✅ YOLO model loaded successfully from {model_path}")
             else:
                 print(f"⚠️ Model file not found at {model_path}. Using fallback classification.")
@@ -30,25 +72,68 @@ class WasteImageClassifier:
         except Exception as e:
             print(f"⚠️ Error loading YOLO model: {e}. Using fallback classification.")
             self.model = None
+            self.backend = None
+    
+    def get_model_version(self):
+        """Identify the loaded weights and backend (part of the prediction cache key)"""
+        if self.model is None:
+            return "fallback"
+        try:
+            stat = os.stat(settings.MODEL_PATH)
+            weights = f"{stat.st_size}-{int(stat.st_mtime)}"
+        except OSError:
+            weights = "unknown"
+        return f"{self.backend}-{weights}-{settings.MODEL_INPUT_SIZE}"
+    
+    def run_model(self, image_arrays):
+        """Run one forward pass over a list of RGB image arrays"""
+        if self.backend == "torch":
+            # ultralytics treats numpy input as BGR (OpenCV order)
+            bgr_arrays = [np.ascontiguousarray(image_array[..., ::-1]) for image_array in image_arrays]
+            return self.model(bgr_arrays, verbose=False)
+        return self.model(image_arrays)
     
-    def preprocess_image(self, image_bytes):
-        """Preprocess image for model input"""
+    def preprocess_image(self, image_bytes, digest=None):
+        """
+        Decode an upload straight down to model resolution
+        
+        JPEGs are decoded in draft mode, which lets libjpeg scale by 1/2,
+        1/4 or 1/8 during decoding, so a 48 MP photo never materialises at
+        full size. Any remaining reduction is a single resize so the
+        shorter side equals MODEL_INPUT_SIZE. Returns a DecodedImage, or
+        None if the bytes cannot be decoded.
+        """
         try:
-            # Convert bytes to PIL Image
+            decode_start = time.perf_counter()
             image = Image.open(io.BytesIO(image_bytes))
+            original_size = image.size
+            
+            # Smallest size whose shorter side still covers the model input
+            target = settings.MODEL_INPUT_SIZE
+            scale = min(1.0, target / min(original_size))
+            target_size = (
+                max(1, round(original_size[0] * scale)),
+                max(1, round(original_size[1] * scale))
+            )
+            
+            # Reduced-resolution decode (JPEG only; no-op for other formats)
+            image.draft('RGB', target_size)
             
             # Convert to RGB if necessary
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
-            # Convert to numpy array for YOLO
-            image_array = np.array(image)
+            if image.size != target_size:
+                image = image.resize(target_size, Image.BILINEAR, reducing_gap=2.0)
+            
+            # Single contiguous copy for YOLO and the fallback heuristics
+            image_array = np.ascontiguousarray(np.asarray(image))
             
-            return image_array, image
+            return DecodedImage(image_array, original_size, time.perf_counter() - decode_start, digest)
             
         except Exception as e:
             print(f"Error preprocessing image: {e}")
-            return None, None
+            return None
     
     def estimate_quantity_from_image(self, image, waste_type, detection_results=None):
         """Estimate quantity from image analysis"""
@@ -85,14 +170,18 @@ class WasteImageClassifier:
                     total_detection_area += detection_area
                 
                 # Estimate quantity based on detection coverage
-                detection_ratio = total_detection_area / (width * height)
+                # (boxes are in the coordinates of the decoded array)
+                array_height, array_width = image.array.shape[:2]
+                detection_ratio = total_detection_area / (array_width * array_height)
                 estimated_qty = base_qty * detection_ratio * (1 + area_factor)
             else:
                 # Fallback estimation based on image size
                 estimated_qty = base_qty * area_factor
             
-            # Add some randomness and bounds
-            estimated_qty *= (0.8 + np.random.random() * 0.4)  # 80% to 120% variation
+            # Add some randomness and bounds, seeded by the image hash so the
+            # same upload always gets the same estimate
+            seed = int(image.digest[:16], 16) if getattr(image, 'digest', None) else None
+            estimated_qty *= (0.8 + np.random.default_rng(seed).random() * 0.4)  # 80% to 120% variation
             estimated_qty = max(100, min(5000, estimated_qty))  # Bounds: 100kg to 5000kg
             
             return round(estimated_qty, 0)
@@ -104,8 +193,7 @@ class WasteImageClassifier:
     def classify_image_fallback(self, image):
         """Fallback classification based on image properties"""
         try:
-            # Convert PIL to numpy array
-            img_array = np.array(image)
+            img_array = image.array
             
             # Simple color-based classification
             # Calculate average color values
@@ -125,75 +213,126 @@ class WasteImageClassifier:
             print(f"Error in fallback classification: {e}")
             return "Agricultural Waste", 0.5
     
-    def predict(self, image_bytes):
-        """Main prediction function"""
-        try:
-            # Preprocess image
-            processed_image, pil_image = self.preprocess_image(image_bytes)
+    def interpret_result(self, result, image):
+        """Turn a single YOLO result into (waste_type, confidence, quantity)"""
+        if result is None:
+            # No model output for this image, use fallback
+            waste_type, confidence = self.classify_image_fallback(image)
+            quantity = self.estimate_quantity_from_image(image, waste_type)
+            return waste_type, confidence, quantity
+        
+        results = [result]
+        
+        if hasattr(result, 'probs') and result.probs is not None:
+            # Classification results
+            top1_idx = result.probs.top1
+            confidence = float(result.probs.top1conf)
+            
+            # Get waste type from model classes
+            if hasattr(result, 'names') and top1_idx < len(result.names):
+                waste_type = result.names[top1_idx]
+            else:
+                waste_type = self.classes[min(top1_idx, len(self.classes) - 1)]
+            
+            # Estimate quantity
+            quantity = self.estimate_quantity_from_image(image, waste_type, results)
             
-            if processed_image is None:
-                return {
+        elif hasattr(result, 'boxes') and result.boxes is not None and len(result.boxes) > 0:
+            # Detection results
+            best_detection = result.boxes[0]  # Get first/best detection
+            class_id = int(best_detection.cls[0].cpu())
+            confidence = float(best_detection.conf[0].cpu())
+            
+            # Get waste type from detection
+            if hasattr(result, 'names') and class_id < len(result.names):
+                waste_type = result.names[class_id]
+            else:
+                waste_type = self.classes[min(class_id, len(self.classes) - 1)]
+            
+            # Estimate quantity
+            quantity = self.estimate_quantity_from_image(image, waste_type, results)
+            
+        else:
+            # No valid predictions, use fallback
+            waste_type, confidence = self.classify_image_fallback(image)
+            quantity = self.estimate_quantity_from_image(image, waste_type)
+        
+        return waste_type, confidence, quantity
+    
+    def predict_batch(self, images):
+        """
+        Batch prediction function
+        
+        Serves repeated uploads from the prediction cache, runs every other
+        decodable image through the model in a single forward pass, and
+        returns one result dict per input, in input order.
+        """
+        digests = [image_digest(image_bytes) for image_bytes in images]
+        predictions = [None] * len(images)
+        cache_keys = [None] * len(images)
+        
+        if self.cache is not None:
+            for i, digest in enumerate(digests):
+                cache_keys[i] = self.cache.make_key(digest, self.model_version)
+                cached = self.cache.get(cache_keys[i])
+                if cached is not None:
+                    cached["decodeTime"] = 0.0
+                    cached["cached"] = True
+                    predictions[i] = cached
+        
+        pending = [i for i in range(len(images)) if predictions[i] is None]
+        decoded = {i: self.preprocess_image(images[i], digests[i]) for i in pending}
+        valid_indices = [i for i in pending if decoded[i] is not None]
+        
+        model_results = {}
+        if self.model and valid_indices:
+            try:
+                # One YOLO forward pass for the whole batch
+                results = self.run_model([decoded[i].array for i in valid_indices])
+                model_results = dict(zip(valid_indices, results))
+            except Exception as model_error:
+                print(f"YOLO batch prediction error: {model_error}")
+                # Fallback to rule-based classification for every image
+                model_results = {}
+        
+        for i in pending:
+            image = decoded[i]
+            if image is None:
+                predictions[i] = {
                     "wasteType": "Unknown",
                     "confidence": 0.5,
                     "quantity": 1000,
                     "error": "Image preprocessing failed"
                 }
+                continue
             
-            if self.model:
-                try:
-                    # YOLO prediction
-                    results = self.model(processed_image)
-                    
-                    if results and len(results) > 0 and hasattr(results[0], 'probs') and results[0].probs is not None:
-                        # Classification results
-                        top1_idx = results[0].probs.top1
-                        confidence = float(results[0].probs.top1conf)
-                        
-                        # Get waste type from model classes
-                        if hasattr(results[0], 'names') and top1_idx < len(results[0].names):
-                            waste_type = results[0].names[top1_idx]
-                        else:
-                            waste_type = self.classes[min(top1_idx, len(self.classes) - 1)]
-                        
-                        # Estimate quantity
-                        quantity = self.estimate_quantity_from_image(pil_image, waste_type, results)
-                        
-                    elif results and len(results) > 0 and hasattr(results[0], 'boxes') and len(results[0].boxes) > 0:
-                        # Detection results
-                        best_detection = results[0].boxes[0]  # Get first/best detection
-                        class_id = int(best_detection.cls[0].cpu())
-                        confidence = float(best_detection.conf[0].cpu())
-                        
-                        # Get waste type from detection
-                        if hasattr(results[0], 'names') and class_id < len(results[0].names):
-                            waste_type = results[0].names[class_id]
-                        else:
-                            waste_type = self.classes[min(class_id, len(self.classes) - 1)]
-                        
-                        # Estimate quantity
-                        quantity = self.estimate_quantity_from_image(pil_image, waste_type, results)
-                        
-                    else:
-                        # No valid predictions, use fallback
-                        waste_type, confidence = self.classify_image_fallback(pil_image)
-                        quantity = self.estimate_quantity_from_image(pil_image, waste_type)
-                        
-                except Exception as model_error:
-                    print(f"YOLO model prediction error: {model_error}")
-                    # Fallback to rule-based classification
-                    waste_type, confidence = self.classify_image_fallback(pil_image)
-                    quantity = self.estimate_quantity_from_image(pil_image, waste_type)
-            else:
-                # No model available, use fallback
-                waste_type, confidence = self.classify_image_fallback(pil_image)
-                quantity = self.estimate_quantity_from_image(pil_image, waste_type)
-            
-            return {
-                "wasteType": waste_type,
-                "confidence": confidence,
-                "quantity": int(quantity),
-                "processingRecommendation": self.get_processing_method(waste_type)
-            }
+            try:
+                waste_type, confidence, quantity = self.interpret_result(model_results.get(i), image)
+                predictions[i] = {
+                    "wasteType": waste_type,
+                    "confidence": confidence,
+                    "quantity": int(quantity),
+                    "processingRecommendation": self.get_processing_method(waste_type),
+                    "decodeTime": image.decode_time
+                }
+                # Only cache real model output, not fallbacks after a model error
+                if self.cache is not None and (i in model_results or self.model is None):
+                    self.cache.put(cache_keys[i], predictions[i])
+            except Exception as e:
+                print(f"Prediction error: {e}")
+                predictions[i] = {
+                    "wasteType": "Agricultural Waste",
+                    "confidence": 0.5,
+                    "quantity": 1000,
+                    "error": str(e)
+                }
+        
+        return predictions
+    
+    def predict(self, image_bytes):
+        """Main prediction function"""
+        try:
+            return self.predict_batch([image_bytes])[0]
             
         except Exception as e:
             print(f"Prediction error: {e}")
@@ -215,6 +354,3 @@ class WasteImageClassifier:
             'Agricultural Waste': 'Anaerobic Digestion'
         }
         return methods.get(waste_type, 'Anaerobic Digestion')
-
-# Global instance
-image_classifier = WasteImageClassifier()
@@ -0,0 +1,105 @@
+"""
+Bounded worker pool for running blocking model inference off the event loop
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.core.config import settings
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference pool cannot accept more work"""
+
+
+class InferencePool:
+    """
+    Runs synchronous model calls on a dedicated thread pool
+    
+    PyTorch releases the GIL during the forward pass, so a small thread
+    pool keeps the event loop free without loading a model copy per
+    process. The number of jobs admitted (running + waiting) is capped at
+    ``max_pending``; beyond that ``run`` raises InferenceQueueFull so the
+    API can shed load instead of queueing unboundedly.
+    """
+    
+    def __init__(self, max_workers: int, max_pending: int, timeout: float, thread_name_prefix: str = "inference"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.thread_name_prefix = thread_name_prefix
+        self._executor = None
+        self._pending = 0
+        
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the executor on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.thread_name_prefix
+            )
+        return self._executor
+    
+    def _release(self, _future):
+        """Free a slot once the worker thread has actually finished"""
+        self._pending -= 1
+        
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run ``func(*args)`` on the pool and await its result
+        
+        Raises InferenceQueueFull when the backlog is full and
+        asyncio.TimeoutError when the job exceeds the per-request timeout.
+        """
+        if self._pending >= self.max_pending:
+            raise InferenceQueueFull(
+                f"Inference queue full ({self._pending}/{self.max_pending} jobs pending)"
+            )
+        
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            future = loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        
+        # Shield the job so a timed-out request does not free its slot
+        # while the worker thread is still busy with it
+        return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+    
+    def get_stats(self) -> Dict:
+        """Get current pool utilisation"""
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "timeout": self.timeout
+        }
+    
+    def shutdown(self):
+        """Stop accepting work and release the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            logging.info("Inference pool shut down")
+
+# Global inference pool
+inference_pool = InferencePool(
+    max_workers=settings.INFERENCE_WORKERS,
+    max_pending=settings.INFERENCE_MAX_PENDING,
+    timeout=settings.INFERENCE_TIMEOUT
+)
+
+# Pool for /predict-text: timed-out classifications keep their worker
+# until they finish, so they cannot pile up on the default executor that
+# the batch endpoints use
+text_inference_pool = InferencePool(
+    max_workers=settings.TEXT_PREDICTION_WORKERS,
+    max_pending=settings.TEXT_PREDICTION_MAX_PENDING,
+    timeout=settings.TEXT_PREDICTION_BUDGET_MS / 1000,
+    thread_name_prefix="text-inference"
+)
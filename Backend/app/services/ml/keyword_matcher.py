@@ -0,0 +1,147 @@
+"""
+Compiled keyword matcher for rule-based waste text classification
+
+All keywords are compiled into a single regex once, so a text (or a whole
+batch of texts joined together) is scanned in one pass instead of one
+substring search per keyword.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Characters that delimit whole-word matches in preprocessed text. Newlines
+# separate the texts of a batch, so they also count as word boundaries.
+BOUNDARY_CODEPOINTS = np.array([ord(" "), ord("\n")], dtype=np.uint32)
+
+
+def build_trie_pattern(keywords: List[str]) -> str:
+    """
+    Regex source matching any of the keywords, nested as a trie
+    
+    Alternatives are greedy, so a match is always the longest keyword
+    starting at its position.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of keyword marker
+    
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Scores texts against a {label: [keywords]} table
+    
+    A keyword found as a whole word scores 2 for each label listing it, a
+    keyword found only inside another word scores 1. The best label is the
+    one with the highest total, ties going to the label listed first.
+    """
+    
+    def __init__(self, keywords_by_label: Dict[str, List[str]]):
+        self.labels = list(keywords_by_label.keys())
+        self.keywords = sorted(
+            {keyword.lower() for keywords in keywords_by_label.values() for keyword in keywords},
+            key=lambda keyword: (-len(keyword), keyword)
+        )
+        keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        
+        # How many times each keyword is listed under each label
+        self.weights = np.zeros((len(self.keywords), len(self.labels)), dtype=np.int32)
+        for label_index, keywords in enumerate(keywords_by_label.values()):
+            for keyword in keywords:
+                self.weights[keyword_index[keyword.lower()], label_index] += 1
+        
+        # One regex over all keywords, shaped as a trie so that a failing first
+        # character rejects every keyword at once and the match at a position
+        # is the longest keyword starting there. Shorter keywords that are
+        # prefixes of it are recovered from the table below.
+        self.pattern = re.compile(build_trie_pattern(self.keywords))
+        self.prefixes = {
+            keyword: [keyword_index[k] for k in self.keywords if keyword.startswith(k)]
+            for keyword in self.keywords
+        }
+        self.lengths = np.array([len(keyword) for keyword in self.keywords], dtype=np.int64)
+    
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """(position, longest keyword) for every position where a keyword starts"""
+        matches = []
+        search = self.pattern.search
+        match = search(text)
+        while match is not None:
+            position = match.start()
+            matches.append((position, match.group()))
+            # Restart one character later so overlapping keywords are found
+            match = search(text, position + 1)
+        return matches
+    
+    def match_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Find keywords in preprocessed texts
+        
+        Returns an (n_texts, n_keywords) array holding 2 where the keyword
+        occurs as a whole word, 1 where it occurs only as a substring and 0
+        where it does not occur.
+        """
+        hits = np.zeros((len(texts), len(self.keywords)), dtype=np.int32)
+        if not texts or not self.keywords:
+            return hits
+        
+        joined = "\n".join(texts)
+        matches = self.find_all(joined)
+        if not matches:
+            return hits
+        
+        # Expand each match into every keyword occurring at that position
+        positions = np.array(
+            [position for position, keyword in matches for _ in self.prefixes[keyword]],
+            dtype=np.int64
+        )
+        columns = np.array(
+            [column for _, keyword in matches for column in self.prefixes[keyword]],
+            dtype=np.int64
+        )
+        ends = positions + self.lengths[columns]
+        
+        # Whole word: preceded and followed by a boundary or the end of the text
+        codepoints = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+        is_boundary = np.isin(codepoints, BOUNDARY_CODEPOINTS)
+        bounded = np.concatenate(([True], is_boundary, [True]))
+        whole_word = bounded[positions] & bounded[ends + 1]
+        
+        # Map positions in the joined string back to their text
+        starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]])
+        rows = np.searchsorted(starts, positions, side="right") - 1
+        
+        np.maximum.at(hits, (rows, columns), np.where(whole_word, 2, 1).astype(np.int32))
+        return hits
+    
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """Per-label scores, shape (n_texts, n_labels)"""
+        return self.match_batch(texts) @ self.weights
+    
+    def best_labels(self, texts: List[str]) -> List[Tuple[str, int]]:
+        """(best label, score) for each text; the label is None when nothing matched"""
+        scores = self.score_batch(texts)
+        if scores.size == 0:
+            return [(None, 0) for _ in texts]
+        
+        best = scores.argmax(axis=1)  # First maximum, i.e. label order breaks ties
+        best_scores = scores[np.arange(len(texts)), best]
+        return [
+            (self.labels[label_index] if score > 0 else None, int(score))
+            for label_index, score in zip(best, best_scores)
+        ]
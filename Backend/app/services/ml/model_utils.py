@@ -1,8 +1,11 @@
 import logging
+import threading
 import time
 import json
 from datetime import datetime
-from typing import Dict, Any, List, List
+from typing import Dict, Any, Callable, List, List, Optional
+
+from app.core.config import settings
 
 def log_prediction(model_type: str, input_data: Dict, prediction: Dict, processing_time: float):
     """Log model predictions for monitoring"""
@@ -12,32 +15,39 @@ def log_prediction(model_type: str, input_data: Dict, prediction: Dict, processi
         "prediction": prediction,
         "processing_time": processing_time,
         "confidence": prediction.get("confidence", 0),
-        "waste_type": prediction.get("wasteType", "unknown"),
+        "waste_type": prediction.get("wasteType", prediction.get("waste_type", "unknown")),
         "quantity": prediction.get("quantity", 0)
     }
     
     logging.info(f"ML_PREDICTION: {json.dumps(log_data)}")
 
+# Magic bytes of the image formats we accept, checked before decoding
+IMAGE_HEADERS = {
+    b'\xff\xd8\xff': "jpeg",
+    b'\x89PNG\r\n\x1a\n': "png",
+    b'GIF87a': "gif",
+    b'GIF89a': "gif",
+}
+IMAGE_HEADER_BYTES = 12  # Enough to identify any format above, plus RIFF/WEBP
+
+def detect_image_format(header: bytes) -> Optional[str]:
+    """Identify an image format from its leading bytes, or None if unrecognised"""
+    for magic, image_format in IMAGE_HEADERS.items():
+        if header.startswith(magic):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return "webp"
+    return None
+
 def validate_image_input(image_bytes: bytes) -> Dict[str, Any]:
     """Validate image input"""
     if not image_bytes:
         return {"valid": False, "error": "Empty image data"}
     
-    if len(image_bytes) > 10 * 1024 * 1024:  # 10MB limit
-        return {"valid": False, "error": "Image too large (max 10MB)"}
-    
-    # Check for basic image headers
-    image_headers = [
-        b'\xff\xd8\xff',  # JPEG
-        b'\x89PNG\r\n\x1a\n',  # PNG
-        b'GIF87a',  # GIF87a
-        b'GIF89a',  # GIF89a
-        b'RIFF',  # WebP (partial)
-    ]
-    
-    is_valid_image = any(image_bytes.startswith(header) for header in image_headers)
+    if len(image_bytes) > settings.MAX_FILE_SIZE:
+        return {"valid": False, "error": f"Image too large (max {settings.MAX_FILE_SIZE // (1024 * 1024)}MB)"}
     
-    if not is_valid_image:
+    if detect_image_format(image_bytes[:IMAGE_HEADER_BYTES]) is None:
         return {"valid": False, "error": "Invalid image format"}
     
     return {"valid": True}
@@ -134,6 +144,10 @@ class ModelManager:
     def __init__(self):
         self.models = {}
         self.load_times = {}
+        self.factories = {}
+        self.loading = set()
+        self.load_errors = {}
+        self._load_lock = threading.Lock()
         
     def register_model(self, name: str, model_instance: Any):
         """Register a model instance"""
@@ -145,20 +159,65 @@ class ModelManager:
         """Get a registered model"""
         return self.models.get(name)
         
+    def register_factory(self, name: str, factory: Callable[[], Any]):
+        """Register a loader that builds the model on first use"""
+        self.factories[name] = factory
+        
+    def get_or_load(self, name: str):
+        """Get a model, loading it through its factory once per process"""
+        model = self.models.get(name)
+        if model is not None:
+            return model
+        
+        with self._load_lock:
+            # Another thread may have finished loading while we waited
+            if name not in self.models:
+                if name not in self.factories:
+                    raise KeyError(f"No model or factory registered as '{name}'")
+                
+                load_start = time.time()
+                self.loading.add(name)
+                try:
+                    self.register_model(name, self.factories[name]())
+                    self.load_errors.pop(name, None)
+                except Exception as e:
+                    self.load_errors[name] = str(e)
+                    raise
+                finally:
+                    self.loading.discard(name)
+                logging.info(f"Model '{name}' loaded in {time.time() - load_start:.2f}s")
+            
+            return self.models[name]
+        
+    def preload(self, names: List[str] = None):
+        """Load the given (default: all registered) models up front"""
+        for name in names or list(self.factories.keys()):
+            try:
+                self.get_or_load(name)
+            except Exception as e:
+                logging.error(f"Failed to preload model '{name}': {e}")
+        
     def get_model_info(self, name: str) -> Dict:
         """Get model information"""
         if name in self.models:
             return {
                 "name": name,
                 "loaded": True,
+                "status": "loaded",
                 "load_time": self.load_times[name].isoformat(),
                 "type": type(self.models[name]).__name__
             }
-        return {"name": name, "loaded": False}
+        if name in self.loading:
+            return {"name": name, "loaded": False, "status": "loading"}
+        if name in self.load_errors:
+            return {"name": name, "loaded": False, "status": "failed", "error": self.load_errors[name]}
+        return {"name": name, "loaded": False, "status": "not_loaded"}
         
     def list_models(self) -> List[Dict]:
-        """List all registered models"""
-        return [self.get_model_info(name) for name in self.models.keys()]
+        """List all registered models, including ones not loaded yet"""
+        names = list(self.models.keys())
+        names.extend(name for name in self.factories if name not in self.models)
+        return [self.get_model_info(name) for name in names]
         
     def unload_model(self, name: str):
         """Unload a model to free memory"""
@@ -167,6 +226,10 @@ class ModelManager:
             del self.load_times[name]
             logging.info(f"Model '{name}' unloaded")
             
+    def all_loaded(self) -> bool:
+        """Whether every registered model has been loaded"""
+        return all(name in self.models for name in self.factories)
+            
     def get_memory_usage(self) -> Dict:
         """Get memory usage statistics"""
         try:
@@ -185,3 +248,26 @@ performance_monitor = PerformanceMonitor()
 
 # Global model manager instance
 model_manager = ModelManager()
+
+# Shared model names
+IMAGE_CLASSIFIER = "image_classifier"
+TEXT_CLASSIFIER = "text_classifier"
+
+def _load_image_classifier():
+    from .image_classifier import WasteImageClassifier
+    return WasteImageClassifier()
+
+def _load_text_classifier():
+    from .text_classifier import WasteTextClassifier
+    return WasteTextClassifier()
+
+model_manager.register_factory(IMAGE_CLASSIFIER, _load_image_classifier)
+model_manager.register_factory(TEXT_CLASSIFIER, _load_text_classifier)
+
+def get_image_classifier():
+    """Get the process-wide WasteImageClassifier instance"""
+    return model_manager.get_or_load(IMAGE_CLASSIFIER)
+
+def get_text_classifier():
+    """Get the process-wide WasteTextClassifier instance"""
+    return model_manager.get_or_load(TEXT_CLASSIFIER)
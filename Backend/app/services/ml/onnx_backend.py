@@ -0,0 +1,144 @@
+"""
+ONNX Runtime inference backend for the YOLOv8 waste classifier
+
+Exports the ultralytics checkpoint to ONNX once, optionally applies INT8
+dynamic quantization, and serves it through ONNX Runtime on the CPU
+execution provider. OnnxClassificationModel is a drop-in replacement for
+the ultralytics model object as far as WasteImageClassifier is concerned:
+calling it with a list of RGB arrays returns results exposing ``probs``
+(``top1``/``top1conf``), ``names`` and ``boxes``.
+"""
+
+import ast
+import logging
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+
+class OnnxProbs:
+    """Classification probabilities for one image (ultralytics ``Probs`` subset)"""
+    
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.top1 = int(np.argmax(data))
+        self.top1conf = float(data[self.top1])
+
+
+class OnnxResult:
+    """Prediction result for one image (ultralytics ``Results`` subset)"""
+    
+    def __init__(self, probs: OnnxProbs, names: Dict[int, str]):
+        self.probs = probs
+        self.names = names
+        self.boxes = None
+
+
+class OnnxClassificationModel:
+    """YOLOv8 classification model served through ONNX Runtime"""
+    
+    def __init__(self, onnx_path: str, imgsz: int = 224, names: Optional[Dict[int, str]] = None):
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        self.session = ort.InferenceSession(
+            onnx_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.imgsz = imgsz
+        self.names = names or self._read_names()
+        
+    def _read_names(self) -> Dict[int, str]:
+        """Read class names from the metadata ultralytics writes on export"""
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        try:
+            return ast.literal_eval(metadata["names"])
+        except (KeyError, ValueError, SyntaxError):
+            return {}
+        
+    def preprocess(self, image_array: np.ndarray) -> np.ndarray:
+        """
+        Match ultralytics' classify transforms: resize the shorter side to
+        imgsz, center crop to imgsz x imgsz, scale to [0, 1], HWC -> CHW
+        """
+        image = Image.fromarray(image_array)
+        width, height = image.size
+        scale = self.imgsz / min(width, height)
+        resized = image.resize(
+            (max(self.imgsz, round(width * scale)), max(self.imgsz, round(height * scale))),
+            Image.BILINEAR
+        )
+        
+        left = (resized.width - self.imgsz) // 2
+        top = (resized.height - self.imgsz) // 2
+        cropped = resized.crop((left, top, left + self.imgsz, top + self.imgsz))
+        
+        tensor = np.asarray(cropped, dtype=np.float32) / 255.0
+        return tensor.transpose(2, 0, 1)
+        
+    def __call__(self, images: List[np.ndarray]) -> List[OnnxResult]:
+        """Run one forward pass over a batch of RGB images"""
+        if isinstance(images, np.ndarray):
+            images = [images]
+        
+        batch = np.ascontiguousarray(np.stack([self.preprocess(image) for image in images]))
+        probs = self.session.run(None, {self.input_name: batch})[0]
+        
+        return [OnnxResult(OnnxProbs(row), self.names) for row in probs]
+
+
+def export_onnx(pt_path: str, onnx_path: str, imgsz: int) -> str:
+    """Export an ultralytics checkpoint to ONNX with a dynamic batch axis"""
+    from ultralytics import YOLO
+    
+    exported_path = YOLO(pt_path).export(format="onnx", imgsz=imgsz, dynamic=True)
+    if os.path.abspath(exported_path) != os.path.abspath(onnx_path):
+        shutil.move(exported_path, onnx_path)
+    
+    logging.info(f"Exported {pt_path} to ONNX at {onnx_path}")
+    return onnx_path
+
+
+def quantize_onnx(onnx_path: str, quantized_path: str) -> str:
+    """Apply INT8 dynamic quantization to an ONNX model"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    
+    quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QUInt8)
+    
+    logging.info(f"Quantized {onnx_path} to INT8 at {quantized_path}")
+    return quantized_path
+
+
+def is_stale(derived_path: str, source_path: str) -> bool:
+    """Whether a derived file is missing or older than the file it came from"""
+    if not os.path.exists(derived_path):
+        return True
+    return os.path.exists(source_path) and os.path.getmtime(source_path) > os.path.getmtime(derived_path)
+
+
+def load_onnx_model(pt_path: str, onnx_path: str = "", quantize: bool = False, imgsz: int = 224) -> OnnxClassificationModel:
+    """
+    Load the ONNX classifier, exporting (and quantizing) it first if the
+    ONNX file is missing or older than the PyTorch checkpoint
+    """
+    onnx_path = onnx_path or os.path.splitext(pt_path)[0] + ".onnx"
+    
+    if is_stale(onnx_path, pt_path):
+        if not os.path.exists(pt_path):
+            raise FileNotFoundError(f"Neither {onnx_path} nor {pt_path} exists")
+        export_onnx(pt_path, onnx_path, imgsz)
+    
+    model_path = onnx_path
+    if quantize:
+        model_path = os.path.splitext(onnx_path)[0] + ".int8.onnx"
+        if is_stale(model_path, onnx_path):
+            quantize_onnx(onnx_path, model_path)
+    
+    return OnnxClassificationModel(model_path, imgsz=imgsz)
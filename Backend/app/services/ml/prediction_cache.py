@@ -0,0 +1,159 @@
+"""
+Content-addressed cache of image predictions
+
+Keys are derived from a hash of the uploaded image bytes plus the model
+version, so re-uploads of the same photo (network retries, forwarded
+images) are served without another model pass, and swapping the model
+weights or backend naturally invalidates old entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def image_digest(image_bytes: bytes) -> str:
+    """Hash of the raw upload bytes"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class PredictionCache:
+    """
+    Two-tier prediction cache: an in-process LRU and an optional on-disk
+    tier (one JSON file per entry) with size-based eviction
+    """
+    
+    def __init__(self, max_entries: int, disk_dir: Optional[str] = None, disk_max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+    
+    @staticmethod
+    def make_key(digest: str, model_version: str) -> str:
+        """Cache key for an image digest under a given model version"""
+        return hashlib.sha256(f"{model_version}:{digest}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a prediction, promoting disk hits into memory"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+        
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return dict(value)
+    
+    def put(self, key: str, value: Dict):
+        """Store a prediction in both tiers"""
+        with self._lock:
+            self._remember(key, dict(value))
+        self._write_disk(key, value)
+    
+    def _remember(self, key: str, value: Dict):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+    
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_disk(self, key: str, value: Dict):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            size = os.path.getsize(tmp_path)
+            # Under the lock so concurrent writes of one key count its old size once
+            with self._lock:
+                try:
+                    replaced_size = os.path.getsize(path)
+                except OSError:
+                    replaced_size = 0
+                os.replace(tmp_path, path)
+                self._disk_bytes += size - replaced_size
+                over_limit = self._disk_bytes > self.disk_max_bytes
+        except OSError as e:
+            logging.warning(f"Prediction cache write failed: {e}")
+            return
+        
+        if over_limit:
+            self._evict_disk()
+    
+    def _disk_entries(self):
+        """(path, size, mtime) for every entry file on disk"""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _evict_disk(self):
+        """Delete the oldest entries until the disk tier is back under 90% of its limit"""
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.disk_max_bytes * 0.9
+        
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        
+        with self._lock:
+            self._disk_bytes = total
+    
+    def get_stats(self) -> Dict:
+        """Get cache hit/miss counters and tier sizes"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.disk_dir),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes
+        }
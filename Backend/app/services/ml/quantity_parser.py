@@ -0,0 +1,140 @@
+"""
+Unit-aware quantity extraction for waste descriptions
+
+One regex, compiled at import, finds every "<number> <unit>" pair in a
+text; the unit table converts each to kilograms. Several quantities in one
+sentence ("5 quintal rice and 2 ton wheat") are added up.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+# unit -> (kg per unit, kind). "mass" and "count" units describe the waste
+# directly; "area" units estimate it from the cultivated area and are only
+# used when the text gives no direct quantity.
+UNITS: Dict[str, Tuple[float, str]] = {}
+
+def _add_units(names: List[str], kg_per_unit: float, kind: str):
+    for name in names:
+        UNITS[unicodedata.normalize("NFC", name)] = (kg_per_unit, kind)
+
+_add_units(['kg', 'kgs', 'kilo', 'kilos', 'kilogram', 'kilograms', 'किलो'], 1, "mass")
+_add_units(['ton', 'tons', 'tonne', 'tonnes', 'टन'], 1000, "mass")
+_add_units(['quintal', 'quintals', 'qtl', 'क्विंटल'], 100, "mass")
+_add_units(['pound', 'pounds', 'lb', 'lbs'], 0.453592, "mass")
+_add_units(['gram', 'grams', 'gm', 'gms', 'ग्राम'], 0.001, "mass")
+_add_units(['sack', 'sacks', 'bag', 'bags', 'बोरी'], 50, "count")  # Assuming 50kg per sack
+_add_units(['bundle', 'bundles', 'गट्ठर'], 25, "count")  # Assuming 25kg per bundle
+_add_units(['acre', 'acres', 'एकड़'], 2000, "area")  # Assuming 2000kg waste per acre
+_add_units(['hectare', 'hectares', 'हेक्टेयर'], 5000, "area")  # Assuming 5000kg waste per hectare
+
+# Used when the text has no number with a unit, first listed term wins
+QUANTITY_TERMS: Dict[str, int] = {
+    'small': 100, 'छोटा': 100, 'little': 100, 'few': 150,
+    'medium': 500, 'मध्यम': 500, 'moderate': 500, 'some': 300,
+    'large': 1500, 'बड़ा': 1500, 'big': 1500, 'huge': 2000,
+    'massive': 3000, 'enormous': 3000, 'lots': 2000, 'many': 1000,
+    'truck': 5000, 'ट्रक': 5000, 'tractor': 3000, 'ट्रैक्टर': 3000
+}
+QUANTITY_TERMS = {unicodedata.normalize("NFC", term): qty for term, qty in QUANTITY_TERMS.items()}
+TERM_RANK = {term: rank for rank, term in enumerate(QUANTITY_TERMS)}
+
+DEFAULT_QUANTITY = 1000
+MIN_QUANTITY = 10
+MAX_QUANTITY = 50000
+
+# Devanagari vowel signs are not \w, so they are added to the word class
+# to keep boundaries from falling inside Hindi words
+_WORD = r"[\w\u0900-\u097f]"
+
+def _alternation(words) -> str:
+    # Longest first so "kilograms" is preferred over "kilo"
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+# Numbers may use thousands separators in either the western (1,000) or the
+# Indian (1,00,000) style. Both patterns start with a character class so
+# the regex engine can skip ahead quickly; the check that a number does not
+# start in the middle of another number sits after its first digit, and the
+# left word boundary of descriptive terms is checked by the caller.
+QUANTITY_PATTERN = re.compile(
+    rf"(\d(?<!\d\d)(?<!\d[.,]\d)\d*(?:,\d{{2,3}})*(?:\.\d+)?)\s*({_alternation(UNITS)})(?!{_WORD})"
+)
+TERM_PATTERN = re.compile(rf"({_alternation(QUANTITY_TERMS)})(?!{_WORD})")
+WORD_CHAR = re.compile(_WORD)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and NFC-normalise so Hindi spellings compare equal"""
+    return unicodedata.normalize("NFC", (text or "").lower())
+
+def parse_quantities(text: str) -> List[Tuple[float, str]]:
+    """All (number, unit) pairs in a text, in order of appearance"""
+    return [
+        (float(number.replace(",", "")), unit)
+        for number, unit in QUANTITY_PATTERN.findall(normalize_text(text))
+    ]
+
+def total_quantity(quantities: List[Tuple[float, str]], terms: List[str]) -> float:
+    """
+    Combine the parsed quantities of one text into kilograms
+    
+    Mass and count quantities are added up; area quantities are only used
+    when there is neither. Descriptive terms are the last resort.
+    """
+    direct = 0.0
+    area = 0.0
+    found_direct = False
+    found_area = False
+    
+    for number, unit in quantities:
+        kg_per_unit, kind = UNITS[unit]
+        if kind == "area":
+            area += number * kg_per_unit
+            found_area = True
+        else:
+            direct += number * kg_per_unit
+            found_direct = True
+    
+    if found_direct or found_area:
+        quantity = direct if found_direct else area
+        return max(MIN_QUANTITY, min(MAX_QUANTITY, quantity))  # Bounds: 10kg to 50000kg
+    
+    if terms:
+        return QUANTITY_TERMS[min(terms, key=TERM_RANK.__getitem__)]
+    
+    return DEFAULT_QUANTITY
+
+def extract_quantity(text: str) -> float:
+    """Estimated waste quantity in kg for one description"""
+    return extract_quantity_batch([text])[0]
+
+def extract_quantity_batch(texts: List[str]) -> List[float]:
+    """
+    extract_quantity for many descriptions
+    
+    The texts are joined and scanned once per pattern; matches are mapped
+    back to their text by offset.
+    """
+    normalized = [normalize_text(text).replace("\n", " ") for text in texts]
+    joined = "\n".join(normalized)
+    starts = []
+    offset = 0
+    for text in normalized:
+        starts.append(offset)
+        offset += len(text) + 1
+    
+    quantities = [[] for _ in texts]
+    for match in QUANTITY_PATTERN.finditer(joined):
+        row = bisect_right(starts, match.start()) - 1
+        quantities[row].append((float(match.group(1).replace(",", "")), match.group(2)))
+    
+    terms = [[] for _ in texts]
+    for match in TERM_PATTERN.finditer(joined):
+        start = match.start()
+        if start and WORD_CHAR.match(joined, start - 1):
+            continue  # Inside a longer word, e.g. "some" in "handsome"
+        terms[bisect_right(starts, start) - 1].append(match.group(1))
+    
+    return [total_quantity(q, t) for q, t in zip(quantities, terms)]
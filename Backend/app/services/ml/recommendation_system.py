@@ -1,5 +1,23 @@
 # Farm-Waste Handling Recommendation System Integration
-import os
+#
+# Every recommendation input except the quantity is categorical, so the
+# ranked method list for each (waste type, weight band, moisture, climate
+# zone, price tier) is built once into a table of plans. Requests look
+# their plan up and only do the quantity-dependent arithmetic.
+#
+# GHG saving factors come from the versioned emission factor dataset
+# (app/services/emission_factors.py). The plans and lookup arrays built
+# from them are kept together in FactorTables, which is rebuilt when the
+# dataset is reloaded.
+import threading
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.emission_factors import FactorSet, get_factor_set
+from app.services.waste_types import resolve_waste_type
+from .gazetteer import resolve_region_code
 
 # Weight range midpoints
 weight_range_midpoints = {
@@ -22,30 +40,6 @@ attribute_profiles = {
     "sugarcane_bagasse": {"%C": 48, "%N": 0.3, "cn_ratio": 160, "decomposition_speed": "slow"}
 }
 
-# GHG saving factors per (waste, method)
-ghg_saving_factors = {
-    ("cow_dung", "Biogas"): (0.36, 0.45),
-    ("cow_dung", "Composting"): (0.12, 0.18),
-    ("cow_dung", "Vermicompost"): (0.15, 0.22),
-    ("fruit_veg_peels", "Biogas"): (0.32, 0.40),
-    ("fruit_veg_peels", "Composting"): (0.14, 0.20),
-    ("fruit_veg_peels", "Vermicompost"): (0.18, 0.24),
-    ("crop_residues", "Biogas"): (0.34, 0.42),
-    ("crop_residues", "Composting"): (0.10, 0.14),
-    ("crop_residues", "Vermicompost"): (0.12, 0.16),
-    ("crop_residues", "Mulching"): (0.80, 0.80),
-    ("rice_straw", "Anaerobic Digestion"): (0.6, 0.7),
-    ("rice_straw", "Gasification"): (0.8, 0.9),
-    ("wheat_straw", "Gasification"): (0.7, 0.8),
-    ("wheat_straw", "Composting"): (0.3, 0.4),
-    ("corn_stalks", "Pyrolysis"): (0.9, 1.0),
-    ("corn_stalks", "Biogas"): (0.5, 0.6),
-    ("cotton_waste", "Composting"): (0.4, 0.5),
-    ("cotton_waste", "Mulching"): (0.6, 0.7),
-    ("sugarcane_bagasse", "Direct Combustion"): (1.2, 1.4),
-    ("sugarcane_bagasse", "Biogas"): (0.7, 0.8)
-}
-
 # Carbon credit pricing tiers (₹ per kg CO₂e)
 carbon_credit_prices = {
     "low": 0.50,
@@ -53,6 +47,89 @@ carbon_credit_prices = {
     "high": 1.00
 }
 
+# Expected output per kg of waste: (min, max, unit)
+output_factors = {
+    "Biogas": (0.20, 0.30, "m³ of biogas"),
+    "Anaerobic Digestion": (0.25, 0.35, "m³ of biogas"),
+    "Gasification": (0.40, 0.50, "m³ of syngas"),
+    "Pyrolysis": (0.30, 0.40, "liters of bio-oil"),
+    "Direct Combustion": (0.80, 0.90, "kWh of energy"),
+    "Composting": (0.30, 0.45, "kg of compost"),
+    "Vermicompost": (0.60, 0.85, "kg of vermicompost"),
+    "Mulching": (1.0, 1.0, "kg of mulch")
+}
+DEFAULT_OUTPUT_FACTORS = (0.3, 0.4, "units of processed waste")
+
+# Why a method suits a waste type ({waste_type} is filled in)
+reason_templates = {
+    "Biogas": "Biogas production is optimal for {waste_type} of this quantity. The organic matter will generate methane gas suitable for cooking and heating.",
+    "Anaerobic Digestion": "Anaerobic digestion is ideal for {waste_type}. This process breaks down organic matter without oxygen, producing biogas and nutrient-rich slurry.",
+    "Gasification": "Gasification converts {waste_type} into synthetic gas (syngas) through high-temperature processing with limited oxygen.",
+    "Pyrolysis": "Pyrolysis breaks down {waste_type} at high temperatures without oxygen, producing bio-oil, biochar, and gases.",
+    "Direct Combustion": "Direct combustion of {waste_type} efficiently converts biomass directly into heat and electricity.",
+    "Composting": "Composting is suitable for {waste_type}. Microorganisms break down organic matter into nutrient-rich compost.",
+    "Vermicompost": "Vermicomposting uses earthworms to break down {waste_type} into high-quality organic fertilizer.",
+    "Mulching": "Using {waste_type} as mulch helps retain soil moisture, suppress weeds, and improve soil health."
+}
+DEFAULT_REASON_TEMPLATE = "Processing {waste_type} using {method} is recommended for optimal resource utilization."
+
+# Base processing time per method (days, or hours for thermal methods)
+base_times = {
+    "Biogas": 15,  # days
+    "Anaerobic Digestion": 20,
+    "Gasification": 1,  # hours
+    "Pyrolysis": 2,  # hours  
+    "Direct Combustion": 0.5,  # hours
+    "Composting": 45,  # days
+    "Vermicompost": 60,  # days
+    "Mulching": 0.1  # immediate
+}
+THERMAL_METHODS = ("Gasification", "Pyrolysis", "Direct Combustion")
+
+# Benefits, cost and the moisture levels / climate zones each method suits
+method_profiles = {
+    "Biogas": {"benefits": ["Clean cooking fuel", "Digestate fertilizer"], "cost_range": "Medium",
+               "moisture": ("moist", "wet"), "climates": ("moderate", "humid", "hot_dry")},
+    "Anaerobic Digestion": {"benefits": ["Biogas for energy", "Nutrient-rich slurry"], "cost_range": "Medium",
+                            "moisture": ("moist", "wet"), "climates": ("moderate", "humid", "hot_dry")},
+    "Gasification": {"benefits": ["Syngas for power", "Biochar byproduct"], "cost_range": "High",
+                     "moisture": ("dry",), "climates": ("moderate", "hot_dry")},
+    "Pyrolysis": {"benefits": ["Bio-oil", "Biochar for soil carbon"], "cost_range": "High",
+                  "moisture": ("dry",), "climates": ("moderate", "hot_dry")},
+    "Direct Combustion": {"benefits": ["Heat and electricity", "Replaces fossil fuel"], "cost_range": "Medium",
+                          "moisture": ("dry",), "climates": ("moderate", "hot_dry")},
+    "Composting": {"benefits": ["Soil improvement", "Nutrient recycling"], "cost_range": "Low",
+                   "moisture": ("moist",), "climates": ("moderate", "humid")},
+    "Vermicompost": {"benefits": ["High-quality organic fertilizer", "Soil structure"], "cost_range": "Low",
+                     "moisture": ("moist",), "climates": ("moderate", "humid")},
+    "Mulching": {"benefits": ["Soil moisture retention", "Weed suppression"], "cost_range": "Low",
+                 "moisture": ("dry", "moist"), "climates": ("moderate", "hot_dry", "humid")}
+}
+DEFAULT_METHOD_PROFILE = {"benefits": ["Resource recovery"], "cost_range": "Moderate", "moisture": (), "climates": ()}
+
+# Location (state, district, alias or region code) -> climate zone (simplified)
+climate_map = {
+    "IN-MH": "moderate",
+    "IN-RJ": "hot_dry", 
+    "IN-KL": "humid",
+    "IN-PB": "moderate",
+    "IN-GJ": "hot_dry"
+}
+
+MOISTURE_LEVELS = ("dry", "moist", "wet")
+CLIMATE_ZONES = ("moderate", "hot_dry", "humid")
+DEFAULT_WASTE_TYPE = "default"  # Table key for waste types without a profile
+
+# Plans depend on weight only through the 50 kg cut-offs in preferred_method
+# (cow dung goes to Biogas from 50 kg, peels stay on Vermicompost up to
+# 50 kg), so they are keyed on a band around 50 kg; each band maps to the
+# weight preferred_method is evaluated at
+PLAN_WEIGHT_BANDS = {
+    "<50kg": 30,
+    "50kg": 50,
+    ">50kg": 75
+}
+
 def get_weight_range_from_kg(weight_kg):
     """Convert weight in kg to weight range string"""
     if weight_kg < 10:
@@ -66,43 +143,68 @@ def get_weight_range_from_kg(weight_kg):
     else:
         return ">500kg"
 
-def estimate_ghg_savings_and_credits(waste_type, method, weight_kg, price_tier="mid"):
-    """Estimate GHG savings and carbon credits"""
-    # Normalize waste type
-    waste_type_normalized = waste_type.lower().replace(" ", "_")
-    
-    key = (waste_type_normalized, method)
-    if key not in ghg_saving_factors:
+def get_plan_weight_band(weight_kg):
+    """Convert weight in kg to its PLAN_WEIGHT_BANDS key"""
+    if weight_kg < 50:
+        return "<50kg"
+    elif weight_kg == 50:
+        return "50kg"
+    else:
+        return ">50kg"
+
+@lru_cache(maxsize=1024)
+def normalize_waste_type(waste_type):
+    """Canonical waste type key ("Rice Straw", "paddy straw" -> "rice_straw")"""
+    return resolve_waste_type(waste_type) or waste_type.lower().replace(" ", "_")
+
+def get_ghg_factors(waste_type, method, ghg_saving_factors=None):
+    """(min, max) kg CO₂e saved per kg, falling back to generic crop residues"""
+    if ghg_saving_factors is None:
+        ghg_saving_factors = get_factor_set().ghg_saving_factors
+    waste_type_normalized = normalize_waste_type(waste_type)
+    factors = ghg_saving_factors.get((waste_type_normalized, method))
+    if factors is None:
         # Try with generic crop_residues if specific type not found
-        key = ("crop_residues", method)
-        if key not in ghg_saving_factors:
-            return {
-                "ghg_savings_range": "N/A",
-                "carbon_credit_value": "N/A",
-                "credit_rate_used": "N/A"
-            }
+        factors = ghg_saving_factors.get(("crop_residues", method))
+    return factors
+
+def credit_rate_label(credit_rate_per_kg, price_tier):
+    return f"{credit_rate_per_kg} ₹/kg CO₂e ({price_tier})"
 
-    min_factor, max_factor = ghg_saving_factors[key]
+def ghg_savings_and_credits(factors, weight_kg, credit_rate_per_kg, credit_rate_used):
+    """GHG savings and carbon credits for a lot, given its (min, max) factors"""
+    if factors is None:
+        return {
+            "ghg_savings_range": "N/A",
+            "carbon_credit_value": "N/A",
+            "credit_rate_used": "N/A"
+        }
+    
+    min_factor, max_factor = factors
     min_saving = round(weight_kg * min_factor, 2)
     max_saving = round(weight_kg * max_factor, 2)
-    credit_rate_per_kg = carbon_credit_prices.get(price_tier, 0.85)
     min_credit = round(min_saving * credit_rate_per_kg, 2)
     max_credit = round(max_saving * credit_rate_per_kg, 2)
-
+    
     return {
         "ghg_savings_range": f"{min_saving} – {max_saving} kg CO₂e",
         "carbon_credit_value": f"₹{min_credit} – ₹{max_credit}",
-        "credit_rate_used": f"{credit_rate_per_kg} ₹/kg CO₂e ({price_tier})",
+        "credit_rate_used": credit_rate_used,
         "co2_saved": (min_saving + max_saving) / 2,  # Average for calculations
         "carbon_credits": (min_credit + max_credit) / 2,  # Average for calculations
         "estimated_value": (min_credit + max_credit) / 2 * 15  # Estimated market value
     }
 
-def get_optimal_processing_method(waste_type, weight_kg, moisture_content="moist", climate_zone="moderate"):
-    """Get optimal processing method for waste type"""
-    waste_type_normalized = waste_type.lower().replace(" ", "_")
-    
-    # Method selection logic based on waste type and conditions
+def estimate_ghg_savings_and_credits(waste_type, method, weight_kg, price_tier="mid"):
+    """Estimate GHG savings and carbon credits"""
+    credit_rate_per_kg = carbon_credit_prices.get(price_tier, 0.85)
+    return ghg_savings_and_credits(
+        get_ghg_factors(waste_type, method), weight_kg,
+        credit_rate_per_kg, credit_rate_label(credit_rate_per_kg, price_tier)
+    )
+
+def preferred_method(waste_type_normalized, weight_kg, moisture_content):
+    """The method recommended first for a waste type under given conditions"""
     method_preferences = {
         "rice_straw": "Anaerobic Digestion",
         "wheat_straw": "Gasification",
@@ -113,85 +215,486 @@ def get_optimal_processing_method(waste_type, weight_kg, moisture_content="moist
         "fruit_veg_peels": "Vermicompost" if weight_kg <= 50 else "Composting",
         "crop_residues": "Mulching" if moisture_content == "dry" else "Composting"
     }
-    
     return method_preferences.get(waste_type_normalized, "Anaerobic Digestion")
 
-def full_farm_waste_recommendation(waste_type, weight_kg, moisture_content="moist", climate_zone="moderate", price_tier="mid"):
-    """Main recommendation function integrated for our system"""
+class MethodOption(NamedTuple):
+    """One processing method for a plan, with everything that does not depend on quantity"""
+    method: str
+    suitability: int
+    reason: str  # Written for the plan's waste type key
+    output_factors: Tuple[float, float, str]
+    ghg_factors: Optional[Tuple[float, float]]
+    benefits: Tuple[str, ...]
+    cost_range: str
+
+class RecommendationPlan(NamedTuple):
+    waste_type: str
+    options: Tuple[MethodOption, ...]  # Best first; options[0] is the recommended method
+    credit_rate: float
+    credit_rate_used: str
+
+def candidate_methods(waste_type_normalized, ghg_saving_factors):
+    """Methods with GHG factors for a waste type (generic crop residue ones otherwise)"""
+    methods = [method for waste, method in ghg_saving_factors if waste == waste_type_normalized]
+    return methods or [method for waste, method in ghg_saving_factors if waste == "crop_residues"]
+
+def suitability_score(method, is_preferred, ghg_share, moisture_content, climate_zone):
+    """
+    0-100 suitability of a method
+    
+    The preferred method starts at 90, others at 60 plus up to 10 for
+    their GHG savings relative to the best method for the waste type;
+    matching (or not) the moisture and climate the method suits adjusts
+    the score.
+    """
+    profile = method_profiles.get(method, DEFAULT_METHOD_PROFILE)
+    score = 90 if is_preferred else 60 + round(10 * ghg_share)
+    score += 5 if moisture_content in profile["moisture"] else -10
+    score += 5 if climate_zone in profile["climates"] else 0
+    return max(0, min(100, score))
+
+def build_plan(waste_type_normalized, weight_band, moisture_content, climate_zone, price_tier, ghg_saving_factors):
+    recommended = preferred_method(waste_type_normalized, PLAN_WEIGHT_BANDS[weight_band], moisture_content)
+    methods = candidate_methods(waste_type_normalized, ghg_saving_factors)
+    if recommended not in methods:
+        methods = [recommended] + methods
     
-    # Get optimal processing method
-    method = get_optimal_processing_method(waste_type, weight_kg, moisture_content, climate_zone)
+    factors = {method: get_ghg_factors(waste_type_normalized, method, ghg_saving_factors) for method in methods}
+    best_saving = max((sum(f) for f in factors.values() if f), default=0)
     
-    # Calculate expected output based on method and waste type
-    output_factors = {
-        "Biogas": (0.20, 0.30, "m³ of biogas"),
-        "Anaerobic Digestion": (0.25, 0.35, "m³ of biogas"),
-        "Gasification": (0.40, 0.50, "m³ of syngas"),
-        "Pyrolysis": (0.30, 0.40, "liters of bio-oil"),
-        "Direct Combustion": (0.80, 0.90, "kWh of energy"),
-        "Composting": (0.30, 0.45, "kg of compost"),
-        "Vermicompost": (0.60, 0.85, "kg of vermicompost"),
-        "Mulching": (1.0, 1.0, "kg of mulch")
-    }
+    options = []
+    for method in methods:
+        is_preferred = method == recommended
+        ghg_share = sum(factors[method]) / best_saving if factors[method] and best_saving else 0
+        profile = method_profiles.get(method, DEFAULT_METHOD_PROFILE)
+        options.append(MethodOption(
+            method=method,
+            suitability=suitability_score(method, is_preferred, ghg_share, moisture_content, climate_zone),
+            reason=reason_templates.get(method, DEFAULT_REASON_TEMPLATE).format(waste_type=waste_type_normalized, method=method),
+            output_factors=output_factors.get(method, DEFAULT_OUTPUT_FACTORS),
+            ghg_factors=factors[method],
+            benefits=tuple(profile["benefits"]),
+            cost_range=profile["cost_range"]
+        ))
+    # Recommended method first, then by suitability (ties keep table order)
+    options.sort(key=lambda option: (option.method != recommended, -option.suitability))
     
-    output_min, output_max, output_unit = output_factors.get(method, (0.3, 0.4, "units of processed waste"))
+    credit_rate = carbon_credit_prices[price_tier]
+    return RecommendationPlan(waste_type_normalized, tuple(options), credit_rate, credit_rate_label(credit_rate, price_tier))
+
+def table_waste_types(ghg_saving_factors):
+    """Waste types with their own plans, plus the default entry"""
+    return list(dict.fromkeys(
+        list(attribute_profiles) + [waste for waste, _ in ghg_saving_factors] + [DEFAULT_WASTE_TYPE]
+    ))
+
+def build_recommendation_table(ghg_saving_factors):
+    """Plans for every combination of the categorical inputs"""
+    return {
+        (waste_type, weight_band, moisture, climate, tier): build_plan(waste_type, weight_band, moisture, climate, tier, ghg_saving_factors)
+        for waste_type in table_waste_types(ghg_saving_factors)
+        for weight_band in PLAN_WEIGHT_BANDS
+        for moisture in MOISTURE_LEVELS
+        for climate in CLIMATE_ZONES
+        for tier in carbon_credit_prices
+    }
+
+def lookup_plan(waste_type, weight_kg, moisture_content="moist", climate_zone="moderate", price_tier="mid", tables=None):
+    """The precomputed plan for a lot; unknown inputs use the defaults"""
+    plans = (tables or current_tables()).plans
+    waste_type_normalized = normalize_waste_type(waste_type)
+    key = (
+        waste_type_normalized,
+        get_plan_weight_band(weight_kg),
+        moisture_content if moisture_content in MOISTURE_LEVELS else "moist",
+        climate_zone if climate_zone in CLIMATE_ZONES else "moderate",
+        price_tier if price_tier in carbon_credit_prices else "mid"
+    )
+    plan = plans.get(key)
+    if plan is None:
+        plan = plans[(DEFAULT_WASTE_TYPE,) + key[1:]]
+    return plan
+
+def get_optimal_processing_method(waste_type, weight_kg, moisture_content="moist", climate_zone="moderate"):
+    """Get optimal processing method for waste type"""
+    return lookup_plan(waste_type, weight_kg, moisture_content, climate_zone).options[0].method
+
+def option_details(plan, option, waste_type, weight_kg, credit_rate, credit_rate_used):
+    """The quantity-dependent figures of one method option"""
+    output_min, output_max, output_unit = option.output_factors
     output_min = round(weight_kg * output_min, 2)
     output_max = round(weight_kg * output_max, 2)
     
-    # Generate reason based on method
-    reasons = {
-        "Biogas": f"Biogas production is optimal for {waste_type} of this quantity. The organic matter will generate methane gas suitable for cooking and heating.",
-        "Anaerobic Digestion": f"Anaerobic digestion is ideal for {waste_type}. This process breaks down organic matter without oxygen, producing biogas and nutrient-rich slurry.",
-        "Gasification": f"Gasification converts {waste_type} into synthetic gas (syngas) through high-temperature processing with limited oxygen.",
-        "Pyrolysis": f"Pyrolysis breaks down {waste_type} at high temperatures without oxygen, producing bio-oil, biochar, and gases.",
-        "Direct Combustion": f"Direct combustion of {waste_type} efficiently converts biomass directly into heat and electricity.",
-        "Composting": f"Composting is suitable for {waste_type}. Microorganisms break down organic matter into nutrient-rich compost.",
-        "Vermicompost": f"Vermicomposting uses earthworms to break down {waste_type} into high-quality organic fertilizer.",
-        "Mulching": f"Using {waste_type} as mulch helps retain soil moisture, suppress weeds, and improve soil health."
+    reason = option.reason
+    if waste_type != plan.waste_type:
+        reason = reason_templates.get(option.method, DEFAULT_REASON_TEMPLATE).format(waste_type=waste_type, method=option.method)
+    
+    return {
+        "reason": reason,
+        "expected_output_range": f"{output_min} – {output_max} {output_unit}",
+        "ghg_info": ghg_savings_and_credits(option.ghg_factors, weight_kg, credit_rate, credit_rate_used),
+        "processing_time": estimate_processing_time(option.method, weight_kg)
     }
+
+def full_farm_waste_recommendation(waste_type, weight_kg, moisture_content="moist", climate_zone="moderate", price_tier="mid"):
+    """Main recommendation function integrated for our system"""
+    plan = lookup_plan(waste_type, weight_kg, moisture_content, climate_zone, price_tier)
+    credit_rate = plan.credit_rate
+    credit_rate_used = plan.credit_rate_used
+    if price_tier not in carbon_credit_prices:
+        credit_rate_used = credit_rate_label(credit_rate, price_tier)
     
-    reason = reasons.get(method, f"Processing {waste_type} using {method} is recommended for optimal resource utilization.")
+    recommendations = []
+    best_ghg_info = None
+    for option in plan.options:
+        details = option_details(plan, option, waste_type, weight_kg, credit_rate, credit_rate_used)
+        ghg_info = details["ghg_info"]
+        best_ghg_info = best_ghg_info or ghg_info
+        co2_saved = ghg_info.get("co2_saved", 0)
+        recommendations.append({
+            "method": option.method,
+            "suitability_score": option.suitability,
+            "reason": details["reason"],
+            "benefits": list(option.benefits),
+            "processing_time": details["processing_time"],
+            "cost_range": option.cost_range,
+            "expected_output_range": details["expected_output_range"],
+            "ghg_savings": {
+                "range": ghg_info["ghg_savings_range"],
+                "co2_kg": co2_saved,
+                "co2_tons": round(co2_saved / 1000, 4)
+            },
+            "carbon_credit_value": ghg_info["carbon_credit_value"]
+        })
     
-    # Estimate GHG and carbon credits
-    ghg_info = estimate_ghg_savings_and_credits(waste_type, method, weight_kg, price_tier)
+    best = recommendations[0]
+    ghg_info = best_ghg_info
     
     return {
-        "recommended_method": method,
-        "reason": reason,
-        "expected_output_range": f"{output_min} – {output_max} {output_unit}",
+        "recommended_method": best["method"],
+        "reason": best["reason"],
+        "expected_output_range": best["expected_output_range"],
         "ghg_savings_range": ghg_info["ghg_savings_range"],
         "carbon_credit_value": ghg_info["carbon_credit_value"],
         "credit_rate_used": ghg_info["credit_rate_used"],
         "co2_saved": ghg_info.get("co2_saved", 0),
         "carbon_credits": ghg_info.get("carbon_credits", 0),
         "estimated_value": ghg_info.get("estimated_value", 0),
-        "processing_time": estimate_processing_time(method, weight_kg),
-        "efficiency": min(95, 70 + (weight_kg / 100))  # Efficiency based on scale
+        "processing_time": best["processing_time"],
+        "efficiency": min(95, 70 + (weight_kg / 100)),  # Efficiency based on scale
+        "recommendations": recommendations
     }
 
 def estimate_processing_time(method, weight_kg):
     """Estimate processing time based on method and quantity"""
-    base_times = {
-        "Biogas": 15,  # days
-        "Anaerobic Digestion": 20,
-        "Gasification": 1,  # hours
-        "Pyrolysis": 2,  # hours  
-        "Direct Combustion": 0.5,  # hours
-        "Composting": 45,  # days
-        "Vermicompost": 60,  # days
-        "Mulching": 0.1  # immediate
-    }
-    
     base_time = base_times.get(method, 10)
     scale_factor = (weight_kg / 1000) + 1
     
-    if method in ["Gasification", "Pyrolysis", "Direct Combustion"]:
+    if method in THERMAL_METHODS:
         return f"{round(base_time * scale_factor, 1)} hours"
     elif method == "Mulching":
         return "Immediate application"
     else:
         return f"{round(base_time * scale_factor)} days"
 
+class FactorTables(NamedTuple):
+    """
+    Plans and batch lookup arrays built from one emission factor set
+    
+    Array axes follow waste_types, PLAN_WEIGHT_BANDS, MOISTURE_LEVELS,
+    CLIMATE_ZONES, methods and carbon_credit_prices; infeasible (waste,
+    method) GHG factors are NaN.
+    """
+    factor_set: FactorSet
+    ghg_saving_factors: Dict[Tuple[str, str], Tuple[float, float]]
+    waste_types: List[str]
+    plans: Dict[Tuple[str, str, str, str, str], RecommendationPlan]
+    methods: List[str]
+    recommended_method_ids: np.ndarray
+    output_factor_array: np.ndarray
+    output_units: np.ndarray
+    ghg_factor_array: np.ndarray
+    processing_hours_array: np.ndarray
+
+WEIGHT_RANGES = list(weight_range_midpoints)
+
+def compile_tables(factor_set: FactorSet) -> FactorTables:
+    ghg_saving_factors = factor_set.ghg_saving_factors
+    waste_types = table_waste_types(ghg_saving_factors)
+    plans = build_recommendation_table(ghg_saving_factors)
+    methods = list(dict.fromkeys(
+        list(output_factors) + [option.method for plan in plans.values() for option in plan.options]
+    ))
+    return FactorTables(
+        factor_set=factor_set,
+        ghg_saving_factors=ghg_saving_factors,
+        waste_types=waste_types,
+        plans=plans,
+        methods=methods,
+        recommended_method_ids=np.array([
+            [[[methods.index(plans[(waste_type, weight_band, moisture, climate, "mid")].options[0].method)
+               for climate in CLIMATE_ZONES]
+              for moisture in MOISTURE_LEVELS]
+             for weight_band in PLAN_WEIGHT_BANDS]
+            for waste_type in waste_types
+        ], dtype=np.intp),
+        output_factor_array=np.array([output_factors.get(method, DEFAULT_OUTPUT_FACTORS)[:2] for method in methods]),
+        output_units=np.array([output_factors.get(method, DEFAULT_OUTPUT_FACTORS)[2] for method in methods]),
+        ghg_factor_array=np.array([
+            [get_ghg_factors(waste_type, method, ghg_saving_factors) or (np.nan, np.nan) for method in methods]
+            for waste_type in waste_types
+        ]),
+        # Hours per unit of estimate_processing_time's base time (Mulching is immediate)
+        processing_hours_array=np.array([
+            0.0 if method == "Mulching" else base_times.get(method, 10) * (1 if method in THERMAL_METHODS else 24)
+            for method in methods
+        ])
+    )
+
+TABLES: Optional[FactorTables] = None
+TABLES_LOCK = threading.Lock()
+
+def current_tables() -> FactorTables:
+    """Tables for the current emission factor set, rebuilt after a reload"""
+    global TABLES
+    factor_set = get_factor_set()
+    tables = TABLES
+    if tables is None or tables.factor_set is not factor_set:
+        with TABLES_LOCK:
+            if TABLES is None or TABLES.factor_set is not factor_set:
+                TABLES = compile_tables(factor_set)
+            tables = TABLES
+    return tables
+
+current_tables()  # Build at import
+
+CREDIT_RATE_ARRAY = np.array(list(carbon_credit_prices.values()))
+
+def climate_zone_for_location(location):
+    """Climate zone of a location (state, district, alias or region code)"""
+    if location in CLIMATE_ZONES:
+        return location
+    return climate_map.get(resolve_region_code(location or ""), "moderate")
+
+def encode_column(values: Sequence[str], encode) -> np.ndarray:
+    """Integer codes for a column of labels, resolving each distinct label once"""
+    # A dict pass is several times faster than np.unique's sort of the strings
+    codes = {}
+    return np.fromiter(
+        (codes[value] if value in codes else codes.setdefault(value, encode(value)) for value in values),
+        dtype=np.intp, count=len(values)
+    )
+
+def waste_type_code(waste_type, tables=None):
+    """Position in the tables' waste_types (the default entry for unknown types)"""
+    waste_types = (tables or current_tables()).waste_types
+    waste_type_normalized = normalize_waste_type(waste_type)
+    if waste_type_normalized not in waste_types:
+        waste_type_normalized = DEFAULT_WASTE_TYPE
+    return waste_types.index(waste_type_normalized)
+
+def moisture_code(moisture_content):
+    return MOISTURE_LEVELS.index(moisture_content if moisture_content in MOISTURE_LEVELS else "moist")
+
+def round_cents(values: np.ndarray) -> np.ndarray:
+    """
+    round(value, 2) for an array
+    
+    np.round scales by 100 first, which can tip values lying just below
+    a half cent (0.595 is really 0.59499...) the other way. Instead each
+    value is compared with the half cent above its cent exactly: 200 *
+    value is taken as the sum of two exactly computed halves (Veltkamp
+    splitting), so the sign of 200 * value - (2 * cent + 1) is never lost.
+    Exact ties go to the even cent, as with round(); values too large for
+    this (or not finite) fall back to round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    exact = magnitude < 1e13
+    magnitude = np.where(exact, magnitude, 0.0)
+    
+    cents = np.floor(magnitude * 100)
+    split = 134217729.0 * magnitude  # 2**27 + 1
+    high = split - (split - magnitude)
+    low = magnitude - high
+    above_half = (high * 200 - (2 * cents + 1)) + low * 200
+    cents += (above_half > 0) | ((above_half == 0) & (cents % 2 == 1))
+    
+    rounded = np.copysign(cents / 100, values)
+    if not exact.all():
+        rounded[~exact] = [round(value, 2) for value in values[~exact].tolist()]
+    return rounded
+
+def weight_range_codes(weights_kg: np.ndarray) -> np.ndarray:
+    """Positions in WEIGHT_RANGES, as get_weight_range_from_kg"""
+    return (weights_kg >= 10).astype(np.intp) + (weights_kg > 50) + (weights_kg > 100) + (weights_kg > 500)
+
+def plan_weight_band_codes(weights_kg: np.ndarray) -> np.ndarray:
+    """Positions in PLAN_WEIGHT_BANDS, as get_plan_weight_band"""
+    return (weights_kg >= 50).astype(np.intp) + (weights_kg > 50)
+
+def recommend_batch(waste_types: Sequence[str], weights_kg: Sequence[float],
+                    moisture_contents: Optional[Sequence[str]] = None,
+                    climate_zones: Optional[Sequence[str]] = None,
+                    price_tier: str = "mid",
+                    tables: Optional[FactorTables] = None) -> Dict[str, np.ndarray]:
+    """
+    Recommended method, output range, GHG savings and credit value for many lots
+    
+    Every row is resolved with array lookups, so the cost per row is a few
+    array operations regardless of batch size. Results match
+    full_farm_waste_recommendation row for row; GHG and credit columns are
+    NaN where it reports "N/A".
+    
+    Args:
+        waste_types: Waste type names or codes ("Rice Straw", "rice_straw")
+        weights_kg: Quantity of each lot in kg
+        moisture_contents: "dry", "moist" or "wet" per lot (default "moist")
+        climate_zones: Climate zone or location per lot (default "moderate")
+        price_tier: Carbon credit price tier for all lots
+        tables: FactorTables to use (default: the current ones)
+    """
+    tables = tables or current_tables()
+    weights = np.asarray(weights_kg, dtype=np.float64)
+    rows = len(weights)
+    
+    waste_ids = encode_column(waste_types, lambda waste_type: waste_type_code(waste_type, tables))
+    if moisture_contents is None:
+        moisture_ids = np.full(rows, MOISTURE_LEVELS.index("moist"), dtype=np.intp)
+    else:
+        moisture_ids = encode_column(moisture_contents, moisture_code)
+    if climate_zones is None:
+        climate_ids = np.full(rows, CLIMATE_ZONES.index("moderate"), dtype=np.intp)
+    else:
+        climate_ids = encode_column(climate_zones, lambda location: CLIMATE_ZONES.index(climate_zone_for_location(location)))
+    band_ids = plan_weight_band_codes(weights)
+    
+    method_ids = tables.recommended_method_ids[waste_ids, band_ids, moisture_ids, climate_ids]
+    output = round_cents(weights[:, None] * tables.output_factor_array[method_ids])
+    savings = round_cents(weights[:, None] * tables.ghg_factor_array[waste_ids, method_ids])
+    credit_rate = carbon_credit_prices.get(price_tier, 0.85)
+    credits = round_cents(savings * credit_rate)
+    
+    return {
+        "recommended_method": np.array(tables.methods)[method_ids],
+        "weight_range": np.array(WEIGHT_RANGES)[weight_range_codes(weights)],
+        "output_min": output[:, 0],
+        "output_max": output[:, 1],
+        "output_unit": tables.output_units[method_ids],
+        "ghg_savings_min": savings[:, 0],
+        "ghg_savings_max": savings[:, 1],
+        "carbon_credit_min": credits[:, 0],
+        "carbon_credit_max": credits[:, 1],
+        "credit_rate": np.full(rows, credit_rate)
+    }
+
+# Method ranking: every feasible method for a lot is scored on these
+# objectives, (column, maximize); output is compared in each method's own unit
+RANKING_OBJECTIVES = (("ghg_savings", True), ("output", True), ("processing_hours", False), ("credit_value", True))
+
+def pareto_ranks(objectives: np.ndarray, maximize: Sequence[bool]) -> np.ndarray:
+    """
+    Pareto front index of each option (0 = not dominated by any other)
+    
+    Args:
+        objectives: (..., options, objectives) array; leading axes are
+            independent problems, all ranked at once
+        maximize: Per objective, whether larger is better
+    """
+    signed = np.where(np.asarray(maximize), objectives, -objectives)
+    a = signed[..., :, None, :]
+    b = signed[..., None, :, :]
+    dominates = (a >= b).all(axis=-1) & (a > b).any(axis=-1)  # [..., i, j]: i dominates j
+    
+    ranks = np.full(signed.shape[:-1], -1, dtype=np.intp)
+    remaining = np.ones(signed.shape[:-1], dtype=bool)
+    front = 0
+    while remaining.any():
+        dominated = (dominates & remaining[..., :, None]).any(axis=-2)
+        current = remaining & ~dominated
+        ranks[current] = front
+        remaining &= ~current
+        front += 1
+    return ranks
+
+def method_metrics(waste_type, weights_kg: Sequence[float], price_tiers: Sequence[str],
+                   tables: Optional[FactorTables] = None) -> Dict[str, np.ndarray]:
+    """
+    Every feasible method's figures over a (quantity x price tier) grid
+    
+    Arrays are shaped (quantities, price tiers, methods); figures are the
+    midpoints of the ranges full_farm_waste_recommendation reports, from
+    the same rounded values.
+    """
+    tables = tables or current_tables()
+    waste_id = waste_type_code(waste_type, tables)
+    candidates = candidate_methods(tables.waste_types[waste_id], tables.ghg_saving_factors)
+    method_ids = np.array([tables.methods.index(method) for method in candidates], dtype=np.intp)
+    weights = np.asarray(weights_kg, dtype=np.float64)[:, None, None]
+    rates = np.array([carbon_credit_prices.get(tier, 0.85) for tier in price_tiers])[None, :, None]
+    
+    ghg_factors = tables.ghg_factor_array[waste_id, method_ids]
+    savings = round_cents(weights[..., None] * ghg_factors)
+    credits = round_cents(savings * rates[..., None])
+    output = round_cents(weights[..., None] * tables.output_factor_array[method_ids])
+    shape = (len(weights), len(price_tiers), len(method_ids))
+    
+    return {
+        "methods": np.array(tables.methods)[method_ids],
+        "output_unit": tables.output_units[method_ids],
+        "ghg_savings": np.broadcast_to(savings.mean(axis=-1), shape),
+        "output": np.broadcast_to(output.mean(axis=-1), shape),
+        "processing_hours": np.broadcast_to(tables.processing_hours_array[method_ids] * (weights / 1000 + 1), shape),
+        "credit_value": credits.mean(axis=-1)
+    }
+
+def rank_metrics(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    objectives = np.stack([np.nan_to_num(metrics[name], nan=0.0) for name, _ in RANKING_OBJECTIVES], axis=-1)
+    return pareto_ranks(objectives, [maximize for _, maximize in RANKING_OBJECTIVES])
+
+def rank_processing_methods(waste_type, weight_kg, price_tier="mid", tables=None) -> List[Dict]:
+    """
+    All feasible methods for one lot, Pareto-ranked
+    
+    Methods on the first front are not beaten on every objective (GHG
+    savings, output, processing time, credit value) by any other method;
+    within a front, larger GHG savings come first.
+    """
+    metrics = method_metrics(waste_type, [weight_kg], [price_tier], tables)
+    ranks = rank_metrics(metrics)[0, 0]
+    ranked = []
+    for i, method in enumerate(metrics["methods"].tolist()):
+        ghg_savings = float(metrics["ghg_savings"][0, 0, i])
+        ranked.append({
+            "method": method,
+            "pareto_rank": int(ranks[i]),
+            "ghg_savings": None if np.isnan(ghg_savings) else ghg_savings,
+            "expected_output": float(metrics["output"][0, 0, i]),
+            "output_unit": str(metrics["output_unit"][i]),
+            "processing_time": estimate_processing_time(method, weight_kg),
+            "processing_hours": round(float(metrics["processing_hours"][0, 0, i]), 2),
+            "credit_value": None if np.isnan(ghg_savings) else float(metrics["credit_value"][0, 0, i])
+        })
+    ranked.sort(key=lambda option: (option["pareto_rank"], -(option["ghg_savings"] or 0)))
+    return ranked
+
+def sweep_processing_methods(waste_type, weights_kg: Sequence[float], price_tiers: Sequence[str],
+                             tables: Optional[FactorTables] = None) -> Dict[str, np.ndarray]:
+    """
+    rank_processing_methods over a (quantity x price tier) grid, in one pass
+    
+    Returns the metrics of method_metrics plus "pareto_rank" per grid cell
+    and method, and "best_method" per grid cell (first front, largest GHG
+    savings).
+    """
+    metrics = method_metrics(waste_type, weights_kg, price_tiers, tables)
+    ranks = rank_metrics(metrics)
+    # Lowest rank first, then largest savings
+    order_key = ranks * 1e12 - np.nan_to_num(metrics["ghg_savings"], nan=0.0)
+    metrics["pareto_rank"] = ranks
+    metrics["best_method"] = metrics["methods"][order_key.argmin(axis=-1)]
+    return metrics
+
 def get_waste_recommendations(waste_type: str, quantity: int, location: str = "Maharashtra"):
     """
     Wrapper function for full_farm_waste_recommendation to maintain API compatibility
@@ -199,22 +702,13 @@ def get_waste_recommendations(waste_type: str, quantity: int, location: str = "M
     Args:
         waste_type: Type of agricultural waste
         quantity: Quantity in kg
-        location: Location (used for climate zone inference)
+        location: Location name, district or region code (used for climate zone inference)
         
     Returns:
-        List of processing recommendations with details
+        List of processing recommendations with details, best first
     """
     try:
-        # Map location to climate zone (simplified)
-        climate_map = {
-            "maharashtra": "moderate",
-            "rajasthan": "hot_dry", 
-            "kerala": "humid",
-            "punjab": "moderate",
-            "gujarat": "hot_dry"
-        }
-        
-        climate_zone = climate_map.get(location.lower(), "moderate")
+        climate_zone = climate_zone_for_location(location)
         
         # Get full recommendation
         result = full_farm_waste_recommendation(
@@ -0,0 +1,147 @@
+"""
+Autocomplete index for waste type search suggestions
+
+Built once from the supported waste types and their multilingual aliases.
+Prefix queries walk a trie whose nodes keep their best entries presorted;
+infix queries intersect a character trigram index. Every type whose name
+contains the query is kept (up to the limit, in type order), and alias hits
+only fill the remaining slots. Results are ranked and cached, so repeated
+keystroke queries are dictionary lookups.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+# Ranking tiers, lower is better
+EXACT_MATCH = 0
+NAME_PREFIX = 1
+WORD_PREFIX = 2
+ALIAS_PREFIX = 3
+INFIX = 4
+
+NGRAM_SIZE = 3
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, NFC-normalise and collapse punctuation/whitespace"""
+    text = unicodedata.normalize("NFC", text or "").lower()
+    text = re.sub(r"[^\w\u0900-\u097f]+", " ", text)
+    return text.strip()
+
+
+class TrieNode:
+    __slots__ = ("children", "matches")
+    
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.matches: List[Tuple[int, int]] = []  # (tier, entry id), best first
+
+
+class SuggestionIndex:
+    """
+    Ranked prefix/infix search over waste type names and aliases
+    
+    Args:
+        types: Waste type names, in the order they should be listed on ties
+        aliases: Extra search terms per waste type (other spellings, Hindi)
+        limit: Maximum suggestions returned per query
+    """
+    
+    def __init__(self, types: List[str], aliases: Dict[str, List[str]] = None, limit: int = 10):
+        self.types = list(dict.fromkeys(types))
+        self.limit = limit
+        self.root = TrieNode()
+        self.ngrams: Dict[str, Set[int]] = {}
+        self.entry_terms: List[List[str]] = [[] for _ in self.types]  # Normalized terms per entry
+        self.names = [normalize_query(waste_type) for waste_type in self.types]
+        self.exact: Dict[str, int] = {}
+        
+        for entry_id, name in enumerate(self.names):
+            self.exact[name] = entry_id
+            self._add_term(name, entry_id, NAME_PREFIX)
+            for word in name.split()[1:]:
+                self._add_term(word, entry_id, WORD_PREFIX)
+        
+        for waste_type, terms in (aliases or {}).items():
+            if waste_type not in self.types:
+                continue
+            entry_id = self.types.index(waste_type)
+            for term in terms:
+                self._add_term(normalize_query(term), entry_id, ALIAS_PREFIX)
+        
+        self._finalize(self.root)
+        self.search = lru_cache(maxsize=4096)(self._search)
+    
+    def _add_term(self, term: str, entry_id: int, tier: int):
+        if not term:
+            return
+        self.entry_terms[entry_id].append(term)
+        
+        node = self.root
+        for char in term:
+            node = node.children.setdefault(char, TrieNode())
+            node.matches.append((tier, entry_id))
+        
+        # Every substring up to NGRAM_SIZE long, so short queries are answered
+        # exactly and longer ones get their candidates from the trigrams
+        for size in range(1, NGRAM_SIZE + 1):
+            for i in range(len(term) - size + 1):
+                self.ngrams.setdefault(term[i:i + size], set()).add(entry_id)
+    
+    def _finalize(self, node: TrieNode):
+        """Keep only the best tier per entry at each node, presorted"""
+        best = {}
+        for tier, entry_id in node.matches:
+            best[entry_id] = min(tier, best.get(entry_id, tier))
+        node.matches = sorted((tier, entry_id) for entry_id, tier in best.items())
+        for child in node.children.values():
+            self._finalize(child)
+    
+    def _prefix_matches(self, query: str) -> List[Tuple[int, int]]:
+        node = self.root
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.matches
+    
+    def _infix_matches(self, query: str) -> Set[int]:
+        if len(query) <= NGRAM_SIZE:
+            return self.ngrams.get(query, set())
+        
+        candidates = None
+        for i in range(len(query) - NGRAM_SIZE + 1):
+            ids = self.ngrams.get(query[i:i + NGRAM_SIZE], set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        return {entry_id for entry_id in candidates if any(query in term for term in self.entry_terms[entry_id])}
+    
+    def _search(self, query: str) -> Tuple[str, ...]:
+        query = normalize_query(query)
+        if not query:
+            return tuple(self.types[:self.limit])
+        
+        ranked = {}
+        if query in self.exact:
+            ranked[self.exact[query]] = EXACT_MATCH
+        for tier, entry_id in self._prefix_matches(query):
+            ranked.setdefault(entry_id, tier)
+        candidates = self._infix_matches(query)
+        for entry_id in candidates:
+            ranked.setdefault(entry_id, INFIX)
+        
+        # Types whose own name contains the query, capped in type order, always
+        # make the cut; alias-only hits can only take the slots left over
+        name_hits = sorted(entry_id for entry_id in candidates if query in self.names[entry_id])[:self.limit]
+        alias_hits = [entry_id for entry_id in ranked if query not in self.names[entry_id]]
+        
+        best = (sorted(name_hits, key=lambda entry_id: (ranked[entry_id], entry_id))
+                + sorted(alias_hits, key=lambda entry_id: (ranked[entry_id], entry_id)))
+        return tuple(self.types[entry_id] for entry_id in best[:self.limit])
+    
+    def suggest(self, query: str) -> List[str]:
+        """Ranked waste type suggestions for a partial query"""
+        return list(self.search(query))
@@ -1,12 +1,32 @@
 import re
 import json
-from typing import Dict, List, Tuple
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from app.core.config import settings
+from .keyword_matcher import KeywordMatcher
+from .quantity_parser import extract_quantity, extract_quantity_batch
+from .gazetteer import gazetteer, resolve_region_code
+from .suggestion_index import SuggestionIndex
+from .fuzzy_matcher import FuzzyKeywordMatcher
+from .text_model import LinearTextModel
+
+FUZZY_MAX_CONFIDENCE = 80.0  # Typo/transliteration matches are less certain
+
 class WasteTextClassifier:
     def __init__(self):
         self.model = None
+        self.model_checked = False  # The trained model is loaded on first use
+        self.model_lock = threading.Lock()
         self.waste_keywords = self.load_waste_keywords()
+        self.keyword_matcher = KeywordMatcher(self.waste_keywords)
+        self.fuzzy_matcher = FuzzyKeywordMatcher(self.waste_keywords)
+        self.suggestion_index = SuggestionIndex(
+            [t for types in self.get_supported_categories().values() for t in types],
+            aliases=self.waste_keywords
+        )
         print("✅ Text classifier initialized with rule-based classification")
     
     def load_waste_keywords(self) -> Dict[str, List[str]]:
@@ -49,114 +69,116 @@ class WasteTextClassifier:
         text = re.sub(r'\s+', ' ', text)
         return text
     
-    def extract_quantity_from_text(self, text: str) -> float:
-        """Extract quantity from text using regex patterns"""
-        text = text.lower()
+    def preprocess_batch(self, texts: List[str]) -> List[str]:
+        """
+        preprocess_text for many texts at once
         
-        # Patterns for quantity extraction
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:kg|किलो|kilo)',
-            r'(\d+(?:\.\d+)?)\s*(?:ton|tons|टन)',
-            r'(\d+(?:\.\d+)?)\s*(?:quintal|quintals|क्विंटल)',
-            r'(\d+(?:\.\d+)?)\s*(?:pound|pounds|lb)',
-            r'(\d+(?:\.\d+)?)\s*(?:gram|grams|ग्राम|gm)',
-            r'(\d+(?:\.\d+)?)\s*(?:sack|sacks|बोरी|bags)',
-            r'(\d+(?:\.\d+)?)\s*(?:bundle|bundles|गट्ठर)',
-            r'(\d+(?:\.\d+)?)\s*(?:acre|acres|एकड़)',
-            r'(\d+(?:\.\d+)?)\s*(?:hectare|hectares|हेक्टेयर)',
-        ]
+        The texts are joined with NUL separators and cleaned with one pass of
+        each regex, which avoids the per-call regex overhead on large imports.
+        """
+        if not texts:
+            return []
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                quantity = float(matches[0])
-                
-                # Convert to kg based on unit
-                if 'ton' in pattern or 'टन' in pattern:
-                    quantity *= 1000
-                elif 'quintal' in pattern or 'क्विंटल' in pattern:
-                    quantity *= 100
-                elif 'pound' in pattern or 'lb' in pattern:
-                    quantity *= 0.453592
-                elif 'gram' in pattern or 'ग्राम' in pattern or 'gm' in pattern:
-                    quantity /= 1000
-                elif 'sack' in pattern or 'बोरी' in pattern or 'bags' in pattern:
-                    quantity *= 50  # Assuming 50kg per sack
-                elif 'bundle' in pattern or 'गट्ठर' in pattern:
-                    quantity *= 25  # Assuming 25kg per bundle
-                elif 'acre' in pattern or 'एकड़' in pattern:
-                    quantity *= 2000  # Assuming 2000kg waste per acre
-                elif 'hectare' in pattern or 'हेक्टेयर' in pattern:
-                    quantity *= 5000  # Assuming 5000kg waste per hectare
-                
-                return max(10, min(50000, quantity))  # Bounds: 10kg to 50000kg
+        # NUL is neither a word nor a space character, so it survives both
+        # substitutions; any NUL inside a text is blanked like other symbols
+        joined = "\x00".join((text or "").lower().strip().replace("\x00", " ") for text in texts)
+        joined = re.sub(r'[^\w\s\x00]', ' ', joined)
+        # Same as \s+ -> ' ', without rewriting every single space
+        joined = re.sub(r'\s\s+|[^\S ]', ' ', joined)
+        return joined.split("\x00")
+    
+    def extract_quantity_from_text(self, text: str) -> float:
+        """Extract quantity in kg from text, adding up every quantity mentioned"""
+        return extract_quantity(text)
+    
+    def load_model(self) -> Optional[LinearTextModel]:
+        """Load the trained text model from TEXT_MODEL_PATH, if configured"""
+        model_path = settings.TEXT_MODEL_PATH
+        if not model_path:
+            return None
+        try:
+            if not os.path.exists(model_path):
+                print(f"⚠️ Text model not found at {model_path}. Using rule-based classification.")
+                return None
+            model = LinearTextModel.load(model_path)
+            print(f"✅ Text model loaded from {model_path} ({len(model.labels)} classes)")
+            return model
+        except Exception as e:
+            print(f"⚠️ Error loading text model: {e}. Using rule-based classification.")
+            return None
+    
+    def get_model(self) -> Optional[LinearTextModel]:
+        """The trained text model, loaded on first call (None when unavailable)"""
+        if not self.model_checked:
+            with self.model_lock:
+                if not self.model_checked:
+                    self.model = self.load_model()
+                    self.model_checked = True
+        return self.model
+    
+    def classify_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify many texts: trained model first, keyword rules as fallback
         
-        # If no quantity found, look for descriptive terms
-        quantity_terms = {
-            'small': 100, 'छोटा': 100, 'little': 100, 'few': 150,
-            'medium': 500, 'मध्यम': 500, 'moderate': 500, 'some': 300,
-            'large': 1500, 'बड़ा': 1500, 'big': 1500, 'huge': 2000,
-            'massive': 3000, 'enormous': 3000, 'lots': 2000, 'many': 1000,
-            'truck': 5000, 'ट्रक': 5000, 'tractor': 3000, 'ट्रैक्टर': 3000
-        }
+        Texts the model is not confident about (or every text, when no
+        model is configured) are classified by the keyword rules.
+        """
+        model = self.get_model()
+        if model is None:
+            return self.rule_based_batch(texts)
         
-        for term, qty in quantity_terms.items():
-            if term in text:
-                return qty
+        results = []
+        for waste_type, probability in model.predict_batch(texts):
+            if probability >= settings.TEXT_MODEL_MIN_CONFIDENCE:
+                results.append((waste_type, round(probability * 100.0, 1)))
+            else:
+                results.append(None)
         
-        return 1000  # Default quantity
+        unsure = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(unsure, self.rule_based_batch([texts[i] for i in unsure])):
+            results[i] = result
+        return results
     
     def rule_based_classification(self, text: str) -> Tuple[str, float]:
         """Rule-based classification using keyword matching"""
-        text = self.preprocess_text(text)
+        return self.rule_based_batch([text])[0]
+    
+    def rule_based_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Rule-based classification of many texts in one pass
         
-        # Score each waste type based on keyword matches
-        scores = {}
+        Each keyword found as a whole word scores 2, as part of a word 1;
+        the highest scoring waste type wins. Texts with no exact keyword
+        are retried with typo/transliteration tolerant matching, whose
+        confidence is capped lower.
+        """
+        processed_texts = self.preprocess_batch(texts)
+        exact = self.keyword_matcher.best_labels(processed_texts)
         
-        for waste_type, keywords in self.waste_keywords.items():
-            score = 0
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                if keyword_lower in text:
-                    # Give higher score for exact matches
-                    if f" {keyword_lower} " in f" {text} ":
-                        score += 2
-                    else:
-                        score += 1
-            
-            if score > 0:
-                scores[waste_type] = score
+        unmatched = [i for i, (waste_type, _) in enumerate(exact) if waste_type is None]
+        fuzzy = dict(zip(unmatched, self.fuzzy_matcher.best_labels([texts[i] or "" for i in unmatched])))
         
-        if scores:
-            # Get the waste type with highest score
-            best_waste_type = max(scores.keys(), key=lambda k: scores[k])
-            max_score = scores[best_waste_type]
+        results = []
+        for i, (best_waste_type, max_score) in enumerate(exact):
+            max_confidence = 95.0
+            if best_waste_type is None:
+                best_waste_type, max_score = fuzzy[i]
+                max_confidence = FUZZY_MAX_CONFIDENCE
             
-            # Calculate confidence based on score (return as percentage)
-            confidence = min(95.0, 60.0 + (max_score * 10.0))
+            if best_waste_type is None:
+                results.append(("Agricultural Waste", 60.0))
+                continue
             
-            return best_waste_type, confidence
+            # Calculate confidence based on score (return as percentage)
+            confidence = min(max_confidence, 60.0 + (max_score * 10.0))
+            results.append((best_waste_type, confidence))
         
-        return "Agricultural Waste", 60.0
+        return results
     
     def extract_location_info(self, text: str) -> str:
-        """Extract location information from text"""
-        text = text.lower()
-        
-        # Common Indian states and regions
-        locations = [
-            'punjab', 'haryana', 'uttar pradesh', 'up', 'bihar', 'rajasthan',
-            'maharashtra', 'gujarat', 'karnataka', 'andhra pradesh', 'telangana',
-            'tamil nadu', 'kerala', 'odisha', 'west bengal', 'jharkhand',
-            'chhattisgarh', 'madhya pradesh', 'mp', 'assam', 'delhi',
-            'पंजाब', 'हरियाणा', 'उत्तर प्रदेश', 'बिहार', 'राजस्थान'
-        ]
-        
-        for location in locations:
-            if location in text:
-                return location.title()
-        
-        return "India"  # Default location
+        """Extract location information from text (state name, or "India")"""
+        region = gazetteer.find(text)
+        return region.state if region else "India"  # Default location
     
     def get_processing_method(self, waste_type: str) -> str:
         """Get processing recommendation"""
@@ -206,14 +228,8 @@ class WasteTextClassifier:
         }
     
     def get_suggestions(self, query: str) -> List[str]:
-        """Get search suggestions for partial queries"""
-        all_types = []
-        for category_types in self.get_supported_categories().values():
-            all_types.extend(category_types)
-        
-        # Filter based on query
-        suggestions = [t for t in all_types if query.lower() in t.lower()]
-        return suggestions[:10]
+        """Get ranked search suggestions for partial queries (English or Hindi aliases)"""
+        return self.suggestion_index.suggest(query)
     
     def predict(self, waste_description: str, quantity: float = None, location: str = None) -> Dict:
         """Main prediction function"""
@@ -221,55 +237,94 @@ class WasteTextClassifier:
             processed_text = self.preprocess_text(waste_description)
             
             if not processed_text:
-                return {
-                    "wasteType": "Agricultural Waste",
-                    "confidence": 0.5,
-                    "quantity": quantity or 1000,
-                    "location": location or "India",
-                    "error": "Empty or invalid input text"
-                }
+                return self.empty_prediction(quantity, location)
             
             # Classify waste type
-            waste_type, confidence = self.rule_based_classification(processed_text)
-            
-            # Extract quantity if not provided
-            if quantity is None:
-                quantity = self.extract_quantity_from_text(processed_text)
-            
-            # Extract location if not provided
-            if location is None:
-                location = self.extract_location_info(processed_text)
-            
-            # Get processing recommendation
-            processing_method = self.get_processing_method(waste_type)
-            
-            return {
-                "waste_type": waste_type,
-                "confidence": confidence,
-                "quantity": quantity,
-                "category": self.get_waste_category(waste_type),
-                "location": location,
-                "processing_recommendation": processing_method,
-                "similar_types": self.get_similar_waste_types(waste_type),
-                "extracted_info": {
-                    "original_text": waste_description,
-                    "processed_text": processed_text,
-                    "extracted_quantity": quantity,
-                    "extracted_location": location
-                }
-            }
+            waste_type, confidence = self.classify_batch([waste_description])[0]
             
+            return self.build_prediction(waste_description, processed_text, waste_type, confidence, quantity, location)
+        
         except Exception as e:
             logging.error(f"Text prediction error: {e}")
-            return {
-                "waste_type": "Agricultural Waste",
-                "confidence": 50.0,
-                "quantity": quantity or 1000,
-                "category": "General",
-                "location": location or "India",
-                "similar_types": ["Rice Straw", "Wheat Straw", "Corn Stalks"],
-                "error": str(e)
+            return self.error_prediction(e, quantity, location)
+    
+    def predict_batch(self, waste_descriptions: List[str]) -> List[Dict]:
+        """
+        Batch prediction function
+        
+        Classifies all descriptions in one model/keyword pass, extracts
+        their quantities with a single unit scan, and returns one result
+        dict per description, in input order.
+        """
+        processed_texts = self.preprocess_batch(waste_descriptions)
+        classifications = self.classify_batch(waste_descriptions)
+        quantities = extract_quantity_batch(waste_descriptions)
+        
+        predictions = []
+        for description, processed_text, (waste_type, confidence), quantity in zip(
+                waste_descriptions, processed_texts, classifications, quantities):
+            if not processed_text:
+                predictions.append(self.empty_prediction())
+                continue
+            
+            try:
+                predictions.append(self.build_prediction(description, processed_text, waste_type, confidence, quantity))
+            except Exception as e:
+                logging.error(f"Text prediction error: {e}")
+                predictions.append(self.error_prediction(e))
+        
+        return predictions
+    
+    def build_prediction(self, waste_description: str, processed_text: str, waste_type: str,
+                         confidence: float, quantity: float = None, location: str = None) -> Dict:
+        """Assemble the prediction dict for one classified description"""
+        # Extract quantity if not provided (from the raw text, which still has
+        # decimal points and Hindi vowel signs)
+        if quantity is None:
+            quantity = self.extract_quantity_from_text(waste_description)
+        
+        # Extract location if not provided
+        if location is None:
+            location = self.extract_location_info(waste_description)
+        
+        # Get processing recommendation
+        processing_method = self.get_processing_method(waste_type)
+        
+        return {
+            "waste_type": waste_type,
+            "confidence": confidence,
+            "quantity": quantity,
+            "category": self.get_waste_category(waste_type),
+            "location": location,
+            "processing_recommendation": processing_method,
+            "similar_types": self.get_similar_waste_types(waste_type),
+            "extracted_info": {
+                "original_text": waste_description,
+                "processed_text": processed_text,
+                "extracted_quantity": quantity,
+                "extracted_location": location,
+                "region_code": resolve_region_code(location)
             }
-
-# Global instance
-text_classifier = WasteTextClassifier()
+        }
+    
+    def empty_prediction(self, quantity: float = None, location: str = None) -> Dict:
+        """Result for empty or unusable input text"""
+        return {
+            "wasteType": "Agricultural Waste",
+            "confidence": 0.5,
+            "quantity": quantity or 1000,
+            "location": location or "India",
+            "error": "Empty or invalid input text"
+        }
+    
+    def error_prediction(self, error: Exception, quantity: float = None, location: str = None) -> Dict:
+        """Fallback result when prediction fails"""
+        return {
+            "waste_type": "Agricultural Waste",
+            "confidence": 50.0,
+            "quantity": quantity or 1000,
+            "category": "General",
+            "location": location or "India",
+            "similar_types": ["Rice Straw", "Wheat Straw", "Corn Stalks"],
+            "error": str(error)
+        }
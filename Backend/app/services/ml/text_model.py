@@ -0,0 +1,144 @@
+"""
+Hashed n-gram linear model for waste descriptions
+
+Words, word bigrams and character n-grams of the transliterated, folded
+text (see fuzzy_matcher) are hashed into a fixed number of features and
+scored by a multinomial logistic regression. The weights are a dense
+(features x labels) matrix, so scoring a batch means gathering the rows of
+its hashed features: a sparse matrix product that needs nothing beyond
+numpy. Models are trained by ML_Models/train_text_classifier.py and saved
+as a compressed .npz file.
+"""
+
+import zlib
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .fuzzy_matcher import normalize_tokens
+
+FORMAT_VERSION = 1
+
+
+class HashingVectorizer:
+    """
+    Text -> L2-normalised hashed feature vector, as CSR arrays
+    
+    Features are hashed with CRC32, which (unlike hash()) is stable across
+    processes; the top bit picks the feature's sign so that collisions tend
+    to cancel out instead of adding up.
+    """
+    
+    def __init__(self, n_features: int = 2 ** 18, char_ngrams: Tuple[int, int] = (3, 5)):
+        self.n_features = n_features
+        self.char_ngrams = tuple(char_ngrams)
+        self.token_features = lru_cache(maxsize=65536)(self._token_features)
+    
+    def hash_feature(self, feature: str) -> Tuple[int, float]:
+        value = zlib.crc32(feature.encode("utf-8"))
+        return value % self.n_features, (-1.0 if value & 0x80000000 else 1.0)
+    
+    def _token_features(self, token: str) -> Tuple[Tuple[int, float], ...]:
+        features = [self.hash_feature("w:" + token)]
+        padded = f" {token} "
+        low, high = self.char_ngrams
+        for size in range(low, high + 1):
+            for i in range(len(padded) - size + 1):
+                features.append(self.hash_feature("c:" + padded[i:i + size]))
+        return tuple(features)
+    
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, values) of one text"""
+        tokens = normalize_tokens(text)
+        counts = {}
+        for token in tokens:
+            for index, sign in self.token_features(token):
+                counts[index] = counts.get(index, 0.0) + sign
+        for first, second in zip(tokens, tokens[1:]):
+            index, sign = self.hash_feature(f"b:{first} {second}")
+            counts[index] = counts.get(index, 0.0) + sign
+        
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        norm = np.sqrt(values @ values)
+        if norm:
+            values /= norm
+        return indices, values
+    
+    def transform(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR (indptr, indices, values) of a batch of texts"""
+        rows = [self.features(text) for text in texts]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+        if not rows:
+            return indptr, np.zeros(0, dtype=np.int64), np.zeros(0)
+        indices = np.concatenate([indices for indices, _ in rows])
+        values = np.concatenate([values for _, values in rows])
+        return indptr, indices, values
+
+
+def csr_dot(indptr: np.ndarray, indices: np.ndarray, values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(rows x features) CSR matrix times a dense (features x labels) matrix"""
+    contributions = weights[indices] * values[:, None]
+    # Row sums as differences of a running total; handles empty rows
+    totals = np.zeros((len(values) + 1, weights.shape[1]))
+    np.cumsum(contributions, axis=0, out=totals[1:])
+    return totals[indptr[1:]] - totals[indptr[:-1]]
+
+
+class LinearTextModel:
+    """
+    Softmax regression over hashed features
+    
+    Args:
+        labels: Waste type per output column
+        weights: (n_features, n_labels) weight matrix
+        bias: (n_labels,) bias vector
+        vectorizer: The HashingVectorizer the weights were trained with
+    """
+    
+    def __init__(self, labels: List[str], weights: np.ndarray, bias: np.ndarray, vectorizer: HashingVectorizer):
+        self.labels = list(labels)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float64)
+        self.vectorizer = vectorizer
+    
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        indptr, indices, values = self.vectorizer.transform(texts)
+        return csr_dot(indptr, indices, values, self.weights) + self.bias
+    
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+    
+    def predict_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(label, probability) per text"""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+    
+    def save(self, path: str):
+        # Half precision halves the file size; weights are cast back on load
+        np.savez_compressed(
+            path,
+            format_version=np.array(FORMAT_VERSION),
+            labels=np.array(self.labels),
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            n_features=np.array(self.vectorizer.n_features),
+            char_ngrams=np.array(self.vectorizer.char_ngrams)
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "LinearTextModel":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported text model format {int(data['format_version'])} in {path}")
+            vectorizer = HashingVectorizer(int(data["n_features"]), tuple(int(n) for n in data["char_ngrams"]))
+            return cls([str(label) for label in data["labels"]], data["weights"], data["bias"], vectorizer)
@@ -0,0 +1,91 @@
+"""
+Streaming upload handling for image endpoints
+
+Uploads are consumed chunk by chunk so that oversized files and files that
+are not images are rejected as soon as that is known, instead of after the
+whole body has been read into memory.
+"""
+
+import os
+from typing import AsyncIterator, Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.services.ml.model_utils import detect_image_format, IMAGE_HEADER_BYTES
+
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File size must be less than {max_size / 1024 / 1024}MB"
+    )
+
+async def iter_image_upload(
+    file: UploadFile,
+    max_size: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield the chunks of an image upload, enforcing the size limit as bytes
+    arrive and checking the magic bytes before anything past the header
+    is consumed
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+    
+    # Reject on the declared size before reading anything
+    if file.size is not None and file.size > max_size:
+        raise _too_large(max_size)
+    
+    received = 0
+    header = b""
+    
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        
+        received += len(chunk)
+        if received > max_size:
+            raise _too_large(max_size)
+        
+        if len(header) < IMAGE_HEADER_BYTES:
+            header += chunk[:IMAGE_HEADER_BYTES - len(header)]
+            if len(header) == IMAGE_HEADER_BYTES and detect_image_format(header) is None:
+                raise HTTPException(status_code=400, detail="Invalid image format")
+        
+        yield chunk
+    
+    if received == 0:
+        raise HTTPException(status_code=400, detail="Empty image file")
+    
+    # Files shorter than the header never reached the check above
+    if len(header) < IMAGE_HEADER_BYTES and detect_image_format(header) is None:
+        raise HTTPException(status_code=400, detail="Invalid image format")
+
+async def read_image_upload(file: UploadFile, max_size: Optional[int] = None) -> bytes:
+    """Read a validated image upload into memory"""
+    chunks = [chunk async for chunk in iter_image_upload(file, max_size)]
+    return b"".join(chunks)
+
+async def save_image_upload(file: UploadFile, file_path: str, max_size: Optional[int] = None) -> int:
+    """
+    Stream a validated image upload to disk without blocking the event loop
+    
+    Returns the number of bytes written. A partially written file is
+    removed if the upload is rejected midway.
+    """
+    written = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            async for chunk in iter_image_upload(file, max_size):
+                await buffer.write(chunk)
+                written += len(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    
+    return written
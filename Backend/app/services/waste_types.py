@@ -0,0 +1,80 @@
+"""
+Waste type resolution shared by the emission, methane and GHG saving
+factor tables
+
+Every table is keyed by canonical waste type IDs ("rice_straw"), and every
+free-text waste type from a request is resolved to one ID the same way:
+exact alias first, then the longest alias found as whole words inside the
+name ("rice straw residue" -> "rice_straw"). Resolutions are cached.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, TypeVar
+
+V = TypeVar("V")
+
+# Canonical ID -> display name and other names people (and the image
+# model's classes) use for it
+WASTE_TYPES = {
+    "rice_straw": {"name": "Rice Straw", "aliases": ["paddy straw", "rice stubble", "paddy stubble", "rice residue", "parali"]},
+    "wheat_straw": {"name": "Wheat Straw", "aliases": ["wheat stubble", "wheat residue", "bhusa"]},
+    "corn_stalks": {"name": "Corn Stalks", "aliases": ["corn stalk", "maize stalks", "corn stover", "maize stover"]},
+    "corn_husks": {"name": "Corn Husks", "aliases": ["corn husk", "maize husks"]},
+    "sugarcane_bagasse": {"name": "Sugarcane Bagasse", "aliases": ["sugar cane bagasse", "bagasse"]},
+    "cotton_stalks": {"name": "Cotton Stalks", "aliases": ["cotton stalk"]},
+    "cotton_waste": {"name": "Cotton Waste", "aliases": ["cotton residue"]},
+    "banana_leaves": {"name": "Banana Leaves", "aliases": ["banana leaf"]},
+    "cow_dung": {"name": "Cow Dung", "aliases": ["cattle manure", "cattle dung", "gobar"]},
+    "buffalo_dung": {"name": "Buffalo Dung", "aliases": ["buffalo manure"]},
+    "chicken_manure": {"name": "Chicken Manure", "aliases": ["poultry manure", "poultry litter"]},
+    "vegetable_scraps": {"name": "Vegetable Scraps", "aliases": ["vegetable waste"]},
+    "food_waste": {"name": "Food Waste", "aliases": ["kitchen waste"]},
+    "fruit_veg_peels": {"name": "Fruit Veg Peels", "aliases": ["fruit peels", "vegetable peels", "fruit vegggie waste", "fruit veggie waste"]},
+    "crop_residues": {"name": "Crop Residues", "aliases": ["crop residue", "crop waste", "agricultural residue"]},
+}
+
+DEFAULT_KEY = "default"  # Fallback entry of the factor tables
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, with underscores, hyphens and repeated spaces folded to one space"""
+    return " ".join(re.sub(r"[_\-]+", " ", (name or "").lower()).split())
+
+
+ALIASES: Dict[str, str] = {}
+for waste_id, info in WASTE_TYPES.items():
+    for alias in [waste_id, info["name"]] + info["aliases"]:
+        ALIASES[normalize_name(alias)] = waste_id
+
+# Longest aliases first, so "cotton stalks" wins over a shorter alias at
+# the same position
+ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(alias) for alias in sorted(ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+
+@lru_cache(maxsize=4096)
+def resolve_waste_type(name: str) -> Optional[str]:
+    """Canonical waste type ID for a free-text name, or None if unknown"""
+    normalized = normalize_name(name)
+    if normalized in ALIASES:
+        return ALIASES[normalized]
+    match = ALIAS_PATTERN.search(normalized)
+    return ALIASES[match.group(1)] if match else None
+
+
+def index_by_waste_type(table: Dict[str, V]) -> Dict[str, V]:
+    """A name-keyed factor table re-keyed by canonical ID (the default entry is kept)"""
+    indexed = {}
+    for name, value in table.items():
+        key = name if name == DEFAULT_KEY else resolve_waste_type(name)
+        if key is None:
+            raise ValueError(f"Unknown waste type in factor table: {name!r}")
+        indexed[key] = value
+    return indexed
+
+
+def lookup_factor(indexed: Dict[str, V], waste_type: str) -> V:
+    """Factor for a waste type from an indexed table, falling back to its default"""
+    return indexed.get(resolve_waste_type(waste_type), indexed[DEFAULT_KEY])
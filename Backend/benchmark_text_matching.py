@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Text Matching Benchmark
+Compares exact keyword matching with typo/transliteration tolerant matching
+
+Usage:
+    python benchmark_text_matching.py [--samples 3000] [--csv labelled.csv]
+
+The default corpus is synthetic: waste keywords with typos (dropped,
+doubled, swapped letters), common Hinglish respellings and Devanagari
+forms, wrapped in filler words. A CSV of real farmer messages with
+"text,label" columns can be passed instead.
+"""
+
+import argparse
+import csv
+import random
+import time
+
+from app.services.ml.text_classifier import WasteTextClassifier
+
+FILLERS = [
+    "i have", "mere paas", "मेरे पास", "after harvest", "from my farm",
+    "about 5 quintal", "2 ton", "near the village", "please help", "",
+]
+
+# Hinglish/Hindi spellings people actually type, with the expected label
+RESPELLINGS = {
+    "Wheat Straw": ["gehu", "gehoon", "gehun ka bhusa", "गेहूँ", "wheet straw", "भूसा"],
+    "Rice Straw": ["dhaan ki parali", "paddy stubbel", "parali", "धान की पराली", "chaawal"],
+    "Sugarcane Bagasse": ["ganna", "bagase", "sugar cane bagass", "गन्ना", "khoi"],
+    "Cotton Waste": ["kapaas", "cottan", "कॉटन", "kapas ke dant"],
+    "Corn Stalks": ["makka", "makki", "maize stalk", "मक्का"],
+}
+
+def add_typo(word, rng):
+    """One random dropped, doubled or swapped letter"""
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(["drop", "double", "swap"])
+    if kind == "drop":
+        return word[:i] + word[i + 1:]
+    if kind == "double":
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+def synthetic_corpus(classifier, samples, seed=7):
+    rng = random.Random(seed)
+    labelled = []
+    for label, keywords in classifier.waste_keywords.items():
+        for keyword in keywords:
+            labelled.append((keyword, label))
+            labelled.append((" ".join(add_typo(word, rng) for word in keyword.split()), label))
+    for label, spellings in RESPELLINGS.items():
+        labelled.extend((spelling, label) for spelling in spellings)
+    
+    corpus = []
+    for _ in range(samples):
+        phrase, label = rng.choice(labelled)
+        text = " ".join(part for part in (rng.choice(FILLERS), phrase, rng.choice(FILLERS)) if part)
+        corpus.append((text, label))
+    return corpus
+
+def load_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+def evaluate(name, classify, corpus):
+    texts = [text for text, _ in corpus]
+    start = time.perf_counter()
+    predictions = classify(texts)
+    elapsed = time.perf_counter() - start
+    
+    correct = sum(1 for (_, label), (predicted, _) in zip(corpus, predictions) if predicted == label)
+    unmatched = sum(1 for predicted, confidence in predictions if predicted == "Agricultural Waste" and confidence == 60.0)
+    print(f"   {name:<16} accuracy {correct / len(corpus) * 100:5.1f}%  "
+          f"unmatched {unmatched:5d}  {elapsed / len(corpus) * 1e6:7.1f} µs/text")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact vs fuzzy waste keyword matching")
+    parser.add_argument("--samples", type=int, default=3000)
+    parser.add_argument("--csv", help="CSV file with text,label columns")
+    args = parser.parse_args()
+    
+    classifier = WasteTextClassifier()
+    corpus = load_csv(args.csv) if args.csv else synthetic_corpus(classifier, args.samples)
+    print(f"📊 {len(corpus)} labelled texts ({'from ' + args.csv if args.csv else 'synthetic'})")
+    
+    def exact(texts):
+        labels = classifier.keyword_matcher.best_labels(classifier.preprocess_batch(texts))
+        return [(label or "Agricultural Waste", 60.0 if label is None else 70.0) for label, _ in labels]
+    
+    # Start with an empty correction cache so the first fuzzy run pays for unseen tokens
+    evaluate("exact", exact, corpus)
+    classifier.fuzzy_matcher.corrections.clear()
+    evaluate("exact + fuzzy", classifier.rule_based_batch, corpus)
+    evaluate("  (warm cache)", classifier.rule_based_batch, corpus)
+
+if __name__ == "__main__":
+    main()
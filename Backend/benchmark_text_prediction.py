@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+/predict-text Latency Benchmark
+Sends requests at a fixed rate (default 1000 RPS) and reports p50/p99 latency
+
+Usage:
+    python benchmark_text_prediction.py [--url URL] [--rps 1000] [--duration 10] [--threads 64]
+
+Requests are scheduled open-loop: latency is measured from the time a request
+was due, not from when a thread got round to sending it, so a backed-up
+server shows up as higher latency instead of a silently lower request rate.
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SAMPLE_DESCRIPTIONS = [
+    "5 quintal paddy straw left after harvest in Ludhiana",
+    "I have 2 ton wheat stubble from my farm in Karnal",
+    "धान की पराली 10 क्विंटल, पंजाब",
+    "sugarcane bagasse 500 kg from the mill",
+    "corn stalks and maize residue, about 3 acres",
+    "cotton stalks 20 bags near Nagpur",
+    "गन्ने का कचरा 2 टन",
+    "large heap of crop waste after kharif season",
+]
+
+_local = threading.local()
+
+def get_session():
+    """One HTTP session (connection pool) per worker thread"""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+def send_request(url, due_time, timeout):
+    """Send one request once it is due; returns (latency_seconds, ok)"""
+    delay = due_time - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+    
+    body = {"waste_type": random.choice(SAMPLE_DESCRIPTIONS)}
+    try:
+        response = get_session().post(url, json=body, timeout=timeout)
+        ok = response.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - due_time, ok
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_benchmark(url, rps, duration, threads, timeout):
+    total_requests = int(rps * duration)
+    interval = 1.0 / rps
+    
+    print(f"🚀 Benchmarking {url}")
+    print(f"   Target: {rps} RPS for {duration}s ({total_requests} requests, {threads} threads)")
+    
+    # Warm up the connection pools and the classifier
+    for _ in range(threads):
+        send_request(url, time.perf_counter(), timeout)
+    
+    start = time.perf_counter() + 0.1
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(send_request, url, start + i * interval, timeout)
+            for i in range(total_requests)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    
+    latencies = sorted(latency for latency, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    
+    print()
+    print("📊 Results:")
+    print(f"   Achieved throughput: {len(results) / elapsed:.0f} RPS")
+    print(f"   Successful: {len(latencies)}  Errors: {errors}")
+    print(f"   p50: {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"   p90: {percentile(latencies, 0.90) * 1000:.1f} ms")
+    print(f"   p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"   max: {percentile(latencies, 1.0) * 1000:.1f} ms")
+    
+    return latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/predict-text latency at a fixed request rate")
+    parser.add_argument("--url", default="http://localhost:8000/api/predict-text")
+    parser.add_argument("--rps", type=float, default=1000)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=5)
+    args = parser.parse_args()
+    
+    run_benchmark(args.url, args.rps, args.duration, args.threads, args.timeout)
+
+if __name__ == "__main__":
+    main()
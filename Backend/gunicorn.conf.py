@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the AgriWaste2Fuel Backend
+
+Usage: gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master process (preload_app) and, when
+PRELOAD_MODELS is enabled, the ML models are loaded there too. Forked
+workers then share the model weights through copy-on-write pages
+instead of each loading their own copy.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120
+preload_app = True
+
+def when_ready(server):
+    """Load shared models in the master before workers are forked"""
+    from app.core.config import settings
+    
+    if not settings.PRELOAD_MODELS:
+        return
+    
+    from app.services.ml.model_utils import model_manager
+    model_manager.preload()
+    
+    # Move everything allocated so far out of the GC's reach so that
+    # collections in the workers don't touch (and copy) the shared pages
+    gc.freeze()
+    server.log.info(f"Preloaded models: {[m['name'] for m in model_manager.list_models()]}")
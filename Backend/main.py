@@ -6,12 +6,17 @@ Main entry point for the FastAPI application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
+import asyncio
+import logging
 import uvicorn
 import os
 from pathlib import Path
 
 from app.core.config import settings
 from app.api.routes import api_router
+from app.services.ml.inference_pool import inference_pool
+from app.services.ml.model_utils import model_manager
 
 # Create FastAPI application instance
 app = FastAPI(
@@ -38,6 +43,20 @@ app.mount("/certificates", StaticFiles(directory="certificates"), name="certific
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def start_model_warmup():
+    """
+    Optionally load models in the background so startup stays fast
+    """
+    if settings.MODEL_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, model_manager.preload)
+        logging.info("Model warm-up started in background")
+
+@app.on_event("shutdown")
+async def shutdown_inference_pool():
+    """Release inference worker threads on shutdown"""
+    inference_pool.shutdown()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -64,6 +83,25 @@ async def health_check():
         "version": settings.VERSION
     }
 
+# Readiness check endpoint
+@app.get("/ready")
+async def readiness_check(require_models: bool = False):
+    """
+    Readiness check: lightweight routes are ready as soon as the app is up;
+    pass require_models=true to get 503 until every ML model is loaded
+    """
+    models_ready = model_manager.all_loaded()
+    ready = models_ready or not require_models
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "models_ready": models_ready,
+            "models": model_manager.list_models()
+        }
+    )
+
 if __name__ == "__main__":
     # Create necessary directories if they don't exist
     Path("uploads").mkdir(exist_ok=True)
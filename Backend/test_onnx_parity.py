@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+ONNX Backend Parity Test Script
+Compares ONNX Runtime predictions against the PyTorch/ultralytics model
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+# FP32 must match PyTorch numerically on identical input tensors;
+# INT8 is only required to keep the same top-1 class
+MAX_PROB_DIFF_FP32 = 1e-4
+
+def make_test_images(count=16, seed=0):
+    """Smooth random RGB images in a few phone-camera shapes"""
+    rng = np.random.default_rng(seed)
+    shapes = [(480, 640), (640, 480), (720, 1280), (224, 224)]
+    images = []
+    for i in range(count):
+        height, width = shapes[i % len(shapes)]
+        coarse = rng.integers(0, 256, size=(height // 32 + 1, width // 32 + 1, 3), dtype=np.uint8)
+        images.append(np.kron(coarse, np.ones((32, 32, 1), dtype=np.uint8))[:height, :width])
+    return images
+
+def torch_probs(torch_model, batch):
+    """Run the underlying nn.Module on a preprocessed NCHW batch"""
+    import torch
+    with torch.no_grad():
+        output = torch_model.model(torch.from_numpy(batch))
+    if isinstance(output, (list, tuple)):
+        output = output[0]
+    return output.cpu().numpy()
+
+def test_onnx_parity():
+    print('🧪 Testing ONNX backend parity...')
+    print()
+
+    from app.core.config import settings
+    from app.services.ml.onnx_backend import load_onnx_model
+
+    if not os.path.exists(settings.MODEL_PATH):
+        print(f'❌ Model file not found at {settings.MODEL_PATH}')
+        return
+
+    from ultralytics import YOLO
+    torch_model = YOLO(settings.MODEL_PATH)
+    torch_model.model.float().eval()
+    images = make_test_images()
+
+    # End-to-end reference: ultralytics pipeline (expects BGR numpy input)
+    start = time.time()
+    reference = torch_model([image[..., ::-1].copy() for image in images], verbose=False)
+    torch_time = time.time() - start
+    print(f'⏱️ PyTorch pipeline: {torch_time * 1000 / len(images):.1f} ms/image')
+
+    for quantize in [False, True]:
+        name = 'ONNX INT8' if quantize else 'ONNX FP32'
+        try:
+            onnx_model = load_onnx_model(settings.MODEL_PATH, quantize=quantize, imgsz=settings.MODEL_INPUT_SIZE)
+
+            # Runtime parity: identical input tensors through both runtimes
+            batch = np.stack([onnx_model.preprocess(image) for image in images])
+            expected = torch_probs(torch_model, batch)
+            actual = onnx_model.session.run(None, {onnx_model.input_name: batch})[0]
+            worst = float(np.max(np.abs(expected - actual)))
+            top1_match = int(np.sum(expected.argmax(axis=1) == actual.argmax(axis=1)))
+            passed = top1_match == len(images) if quantize else worst <= MAX_PROB_DIFF_FP32
+            status = '✅' if passed else '❌'
+            print(f'{status} {name} runtime parity: max prob diff {worst:.6f}, '
+                  f'top-1 match {top1_match}/{len(images)}')
+
+            # End-to-end agreement, including each backend's own preprocessing
+            start = time.time()
+            candidate = onnx_model(images)
+            onnx_time = time.time() - start
+            agree = sum(r.probs.top1 == c.probs.top1 for r, c in zip(reference, candidate))
+            print(f'⏱️ {name} pipeline: {onnx_time * 1000 / len(images):.1f} ms/image, '
+                  f'top-1 agreement {agree}/{len(images)}')
+        except Exception as e:
+            print(f'❌ {name} failed: {e}')
+
+    print()
+    print('🏁 ONNX parity test complete!')
+
+if __name__ == "__main__":
+    test_onnx_parity()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Search Suggestion Parity Test Script
+Checks that the suggestion index still returns every hit of the old
+substring filter for short autocomplete queries
+"""
+
+import sys
+import os
+import itertools
+import string
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def old_suggestions(classifier, query):
+    """The substring filter get_suggestions used before the index"""
+    all_types = []
+    for category_types in classifier.get_supported_categories().values():
+        all_types.extend(category_types)
+    return [t for t in all_types if query.lower() in t.lower()][:10]
+
+def short_queries(alphabet=string.ascii_lowercase + " ", max_length=3):
+    for length in range(1, max_length + 1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield "".join(chars)
+
+def test_suggestion_parity():
+    print('🧪 Testing search suggestion parity...')
+    print()
+
+    from app.services.ml.text_classifier import WasteTextClassifier
+
+    classifier = WasteTextClassifier()
+    supported = {t for types in classifier.get_supported_categories().values() for t in types}
+
+    checked = 0
+    missing = []
+    unsupported = []
+    for query in itertools.chain(short_queries(), ["C", "Wh", "STR"]):
+        old = old_suggestions(classifier, query)
+        new = classifier.get_suggestions(query)
+        checked += 1
+        if set(old) - set(new):
+            missing.append((query, sorted(set(old) - set(new))))
+        if set(new) - supported:
+            unsupported.append((query, sorted(set(new) - supported)))
+
+    status = '✅' if not missing else '❌'
+    print(f'{status} Old substring hits kept for {checked - len(missing)}/{checked} queries')
+    for query, types in missing[:10]:
+        print(f'   {query!r}: missing {types}')
+
+    status = '✅' if not unsupported else '❌'
+    print(f'{status} Suggestions outside the supported categories: {len(unsupported)} queries')
+    for query, types in unsupported[:10]:
+        print(f'   {query!r}: {types}')
+
+    print()
+    print('🏁 Suggestion parity test complete!')
+
+if __name__ == "__main__":
+    test_suggestion_parity()
@@ -1,5 +1,8 @@
 # Farm-Waste Handling Recommendation System with GHG + Carbon Credit Estimation
 
+import json
+import os
+
 # Weight range midpoints
 weight_range_midpoints = {
     "<10kg": 5,
@@ -16,19 +19,14 @@ attribute_profiles = {
     "crop_residues": {"%C": 45, "%N": 0.7, "cn_ratio": 64, "decomposition_speed": "medium"}
 }
 
-# GHG saving factors per (waste, method)
-ghg_saving_factors = {
-    ("cow_dung", "Biogas"): (0.36, 0.45),
-    ("cow_dung", "Composting"): (0.12, 0.18),
-    ("cow_dung", "Vermicompost"): (0.15, 0.22),
-    ("fruit_veg_peels", "Biogas"): (0.32, 0.40),
-    ("fruit_veg_peels", "Composting"): (0.14, 0.20),
-    ("fruit_veg_peels", "Vermicompost"): (0.18, 0.24),
-    ("crop_residues", "Biogas"): (0.34, 0.42),
-    ("crop_residues", "Composting"): (0.10, 0.14),
-    ("crop_residues", "Vermicompost"): (0.12, 0.16),
-    ("crop_residues", "Mulching"): (0.80, 0.80),
-}
+# GHG saving factors per (waste, method), from the backend's emission factor dataset
+EMISSION_FACTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend", "app", "data", "emission_factors.json")
+with open(EMISSION_FACTORS_PATH, encoding="utf-8") as f:
+    ghg_saving_factors = {
+        (waste, method): tuple(factors)
+        for waste, methods in json.load(f)["ghg_saving_factors"]["factors"].items()
+        for method, factors in methods.items()
+    }
 
 # Carbon credit pricing tiers (₹ per kg CO₂e)
 carbon_credit_prices = {
@@ -0,0 +1,161 @@
+# Train and evaluate the hashed n-gram text classifier served by the backend
+#
+# Usage (from the repository root):
+#     python ML_Models/train_text_classifier.py --data labelled.csv
+#     python ML_Models/train_text_classifier.py --synthetic 20000
+#
+# The CSV needs "text" and "label" columns, labels being waste types such as
+# "Rice Straw". Without real data, --synthetic bootstraps a corpus from the
+# keyword rules (typos, Hinglish and Devanagari spellings) - enough to check
+# the pipeline, not a substitute for labelled farmer messages.
+#
+# The model is written to Backend/app/models/text_model.npz; serve it with
+#     TEXT_MODEL_PATH=app/models/text_model.npz
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.ml.text_model import HashingVectorizer, LinearTextModel, csr_dot  # noqa: E402
+
+
+def load_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row["text"], row["label"]) for row in csv.DictReader(f) if row["text"] and row["label"]]
+
+
+def synthetic_data(samples, seed):
+    from benchmark_text_matching import synthetic_corpus
+    from app.services.ml.text_classifier import WasteTextClassifier
+    return synthetic_corpus(WasteTextClassifier(), samples, seed=seed)
+
+
+def split(data, test_fraction, seed):
+    data = list(data)
+    random.Random(seed).shuffle(data)
+    n_test = int(len(data) * test_fraction)
+    return data[n_test:], data[:n_test]
+
+
+def csr_rows(indptr, indices, values, rows):
+    """Sub-matrix of the given rows, as CSR arrays"""
+    lengths = indptr[rows + 1] - indptr[rows]
+    sub_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=sub_indptr[1:])
+    gather = np.repeat(indptr[rows] - sub_indptr[:-1], lengths) + np.arange(sub_indptr[-1])
+    return sub_indptr, indices[gather], values[gather]
+
+
+def train(texts, labels, vectorizer, epochs=10, batch_size=64, learning_rate=2.0, l2=1e-6, seed=0):
+    """
+    Softmax regression by minibatch SGD
+
+    Only the weight rows of features present in a batch are updated (with
+    their L2 penalty), so a step costs O(non-zeros), not O(n_features).
+    """
+    classes = sorted(set(labels))
+    y = np.array([classes.index(label) for label in labels])
+    indptr, indices, values = vectorizer.transform(texts)
+
+    weights = np.zeros((vectorizer.n_features, len(classes)))
+    bias = np.zeros(len(classes))
+    rng = np.random.default_rng(seed)
+
+    for epoch in range(epochs):
+        step_size = learning_rate / (1 + 0.5 * epoch)
+        order = rng.permutation(len(texts))
+        loss = 0.0
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            b_indptr, b_indices, b_values = csr_rows(indptr, indices, values, rows)
+
+            scores = csr_dot(b_indptr, b_indices, b_values, weights) + bias
+            scores -= scores.max(axis=1, keepdims=True)
+            probabilities = np.exp(scores)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            loss -= np.log(probabilities[np.arange(len(rows)), y[rows]] + 1e-12).sum()
+
+            error = probabilities
+            error[np.arange(len(rows)), y[rows]] -= 1
+            error /= len(rows)
+
+            row_of_value = np.repeat(np.arange(len(rows)), np.diff(b_indptr))
+            gradient = b_values[:, None] * error[row_of_value]
+            touched = np.unique(b_indices)
+            weights[touched] *= 1 - step_size * l2
+            np.subtract.at(weights, b_indices, step_size * gradient)
+            bias -= step_size * error.sum(axis=0)
+
+        print(f"   epoch {epoch + 1:2d}/{epochs}  loss {loss / len(texts):.4f}")
+
+    return LinearTextModel(classes, weights, bias, vectorizer)
+
+
+def evaluate(model, test):
+    texts = [text for text, _ in test]
+    expected = [label for _, label in test]
+
+    start = time.perf_counter()
+    predictions = model.predict_batch(texts)
+    batch_time = (time.perf_counter() - start) / max(1, len(texts))
+
+    single_times = []
+    for text in texts[:1000]:
+        start = time.perf_counter()
+        model.predict_batch([text])
+        single_times.append(time.perf_counter() - start)
+    single_times.sort()
+
+    correct = sum(1 for (predicted, _), label in zip(predictions, expected) if predicted == label)
+    print(f"\n📊 Test accuracy: {correct / max(1, len(test)) * 100:.1f}% on {len(test)} texts")
+    for label in model.labels:
+        rows = [i for i, expected_label in enumerate(expected) if expected_label == label]
+        if rows:
+            hits = sum(1 for i in rows if predictions[i][0] == label)
+            print(f"   {label:<20} {hits / len(rows) * 100:5.1f}%  ({len(rows)})")
+
+    print(f"\n⏱️ Latency: batch {batch_time * 1e6:.1f} µs/text, single text "
+          f"p50 {single_times[len(single_times) // 2] * 1e6:.0f} µs, "
+          f"p99 {single_times[int(len(single_times) * 0.99)] * 1e6:.0f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the hashed n-gram waste text classifier")
+    parser.add_argument("--data", help="CSV file with text,label columns")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate this many synthetic examples instead")
+    parser.add_argument("--output", default=os.path.join(BACKEND_DIR, "app", "models", "text_model.npz"))
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.data:
+        data = load_csv(args.data)
+    elif args.synthetic:
+        data = synthetic_data(args.synthetic, args.seed)
+    else:
+        parser.error("pass --data labelled.csv or --synthetic N")
+
+    train_set, test_set = split(data, args.test_fraction, args.seed)
+    print(f"🚀 Training on {len(train_set)} texts, testing on {len(test_set)}")
+
+    vectorizer = HashingVectorizer(n_features=args.n_features)
+    model = train([t for t, _ in train_set], [l for _, l in train_set], vectorizer, epochs=args.epochs, seed=args.seed)
+    evaluate(model, test_set)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    model.save(args.output)
+    print(f"\n✅ Saved {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()